@@ -0,0 +1,22 @@
+# Standalone Gradio demo of the cover letter generator. Not used by the API server:
+#     python -m app.AI.cover_letter_demo
+import gradio as gr
+from app.AI.cover_letter_generator import generate_cover_letter
+
+# Create Gradio interface for the cover letter generation application
+cover_letter_app = gr.Interface(
+    fn=generate_cover_letter,
+    inputs=[
+        gr.Textbox(label="Company Name", placeholder="Enter the name of the company..."),
+        gr.Textbox(label="Position Name", placeholder="Enter the name of the position..."),
+        gr.Textbox(label="Job Description Information", placeholder="Paste the job description here...", lines=10),
+        gr.Textbox(label="Resume Content", placeholder="Paste your resume content here...", lines=10),
+    ],
+    outputs=gr.Textbox(label="Customized Cover Letter"),
+    title="Customized Cover Letter Generator",
+    description="Generate a customized cover letter by entering the company name, position name, job description and your resume."
+)
+
+# Launch the application
+if __name__ == "__main__":
+    cover_letter_app.launch()
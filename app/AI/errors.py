@@ -0,0 +1,33 @@
+# Errors raised by the LLM client, each mapped to an HTTP status by the AI routes
+
+
+class LLMError(Exception):
+    """The chat completion API failed or returned an error response."""
+
+    # Status the AI routes answer with
+    http_status = 502
+
+    def __init__(self, message, status_code=None, retry_after=None):
+        super().__init__(message)
+        # Upstream HTTP status, when there was a response
+        self.status_code = status_code
+        # Seconds the client should wait before retrying, when known
+        self.retry_after = retry_after
+
+
+class LLMRateLimitError(LLMError):
+    """Upstream kept answering 429 after all retries."""
+
+    http_status = 429
+
+
+class LLMTimeoutError(LLMError):
+    """The request deadline passed before a completion arrived."""
+
+    http_status = 504
+
+
+class LLMUnavailableError(LLMError):
+    """The circuit breaker is open, so the call was not attempted."""
+
+    http_status = 503
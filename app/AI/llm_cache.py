@@ -0,0 +1,236 @@
+# Content-addressed cache of LLM completions, in memory and on disk
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from dotenv import load_dotenv
+from app.services.cache import MemoryCacheBackend
+
+load_dotenv()
+
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", "86400"))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "512"))
+
+# Set LLM_CACHE_DIR to an empty string to keep the cache in memory only
+LLM_CACHE_DIR = os.getenv("LLM_CACHE_DIR", os.path.join(tempfile.gettempdir(), "llm_cache"))
+LLM_CACHE_MAX_BYTES = int(os.getenv("LLM_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# Once the disk tier is over its size cap, evict down to this fraction of it
+_EVICT_TO = 0.9
+
+
+def normalize_prompt(prompt):
+    """Collapse whitespace so trivially reformatted prompts share a cache entry."""
+    return ' '.join((prompt or '').split())
+
+
+def cache_key(model, prompt):
+    raw = f'{model}\0{normalize_prompt(prompt)}'
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class DiskCacheTier:
+    """
+    One JSON file per key under ``directory``, fanned out by the key's first
+    two hex characters. Subclasses can store other formats by overriding
+    ``suffix``, ``_dump`` and ``_load``.
+
+    Entries expire after ``ttl`` seconds. A hit refreshes the file's mtime, so
+    when the total size passes ``max_bytes`` the least recently used files are
+    removed first. The directory may be shared by every worker process on the
+    host; writes go through a temporary file and an atomic rename.
+    """
+
+    suffix = '.json'
+
+    def __init__(self, directory, max_bytes, ttl=None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        # Size of the files on disk, computed lazily and kept up to date by this process
+        self._size = None
+
+    def _path(self, key):
+        return os.path.join(self.directory, key[:2], f'{key}{self.suffix}')
+
+    def _dump(self, value):
+        return json.dumps({'created_at': time.time(), 'value': value}).encode('utf-8')
+
+    def _load(self, raw):
+        # The stored value, or None once it has expired
+        entry = json.loads(raw)
+        if self.ttl and entry.get('created_at', 0) + self.ttl <= time.time():
+            return None
+        return entry.get('value')
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as cache_file:
+                value = self._load(cache_file.read())
+        except (OSError, ValueError):
+            return None
+        if value is None:
+            self._unlink(path)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def set(self, key, value):
+        path = self._path(key)
+        raw = self._dump(value)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+            with os.fdopen(fd, 'wb') as temp_file:
+                temp_file.write(raw)
+            previous = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(temp_path, path)
+        except OSError:
+            return
+        with self._lock:
+            if self._size is not None:
+                self._size += len(raw) - previous
+        if self.size() > self.max_bytes:
+            self.evict()
+
+    def _unlink(self, path):
+        try:
+            size = os.path.getsize(path)
+            os.unlink(path)
+        except OSError:
+            return
+        with self._lock:
+            if self._size is not None:
+                self._size -= size
+
+    def _scan(self):
+        files = []
+        for root, _, names in os.walk(self.directory):
+            for name in names:
+                if not name.endswith(self.suffix):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+        return files
+
+    def size(self):
+        with self._lock:
+            if self._size is None:
+                self._size = sum(size for _, size, _ in self._scan())
+            return self._size
+
+    def evict(self):
+        """Remove expired files, then the least recently used ones until under the size cap."""
+        with self._lock:
+            files = sorted(self._scan())
+            total = sum(size for _, size, _ in files)
+            now = time.time()
+            target = self.max_bytes * _EVICT_TO
+            for mtime, size, path in files:
+                expired = self.ttl and mtime + self.ttl <= now
+                if not expired and total <= target:
+                    continue
+                try:
+                    os.unlink(path)
+                    total -= size
+                except OSError:
+                    pass
+            self._size = total
+
+    def clear(self):
+        with self._lock:
+            for _, _, path in self._scan():
+                try:
+                    os.unlink(path)
+                except OSError:
+                    pass
+            self._size = 0
+
+    def __len__(self):
+        return len(self._scan())
+
+
+class LLMResponseCache:
+    """
+    Two-tier cache of completion texts keyed on ``sha256(model, normalized prompt)``.
+
+    Lookups try the per-process memory LRU first and fall back to the disk
+    tier, promoting disk hits into memory.
+    """
+
+    def __init__(self, max_entries=512, directory=None, max_bytes=64 * 1024 * 1024, ttl=86400):
+        self.ttl = ttl
+        self.memory = MemoryCacheBackend(max_entries=max_entries)
+        self.disk = DiskCacheTier(directory, max_bytes, ttl=ttl) if directory else None
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    def _record(self, counter):
+        with self._stats_lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def get(self, model, prompt):
+        key = cache_key(model, prompt)
+        value = self.memory.get(key)
+        if value is not None:
+            self._record('memory_hits')
+            return value
+        if self.disk is not None:
+            value = self.disk.get(key)
+            if value is not None:
+                self.memory.set(key, value, ttl=self.ttl)
+                self._record('disk_hits')
+                return value
+        self._record('misses')
+        return None
+
+    def set(self, model, prompt, value):
+        key = cache_key(model, prompt)
+        self.memory.set(key, value, ttl=self.ttl)
+        if self.disk is not None:
+            self.disk.set(key, value)
+
+    def clear(self):
+        self.memory.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+    def stats(self):
+        hits = self.memory_hits + self.disk_hits
+        total = hits + self.misses
+        stats = {
+            'ttl_seconds': self.ttl,
+            'memory_entries': len(self.memory),
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'hits': hits,
+            'misses': self.misses,
+            'hit_rate': round(hits / total, 4) if total else 0.0,
+        }
+        if self.disk is not None:
+            stats['disk_bytes'] = self.disk.size()
+            stats['disk_max_bytes'] = self.disk.max_bytes
+        return stats
+
+
+# Process-wide completion cache used by the LLM client
+llm_cache = LLMResponseCache(
+    max_entries=LLM_CACHE_MAX_ENTRIES,
+    directory=LLM_CACHE_DIR or None,
+    max_bytes=LLM_CACHE_MAX_BYTES,
+    ttl=LLM_CACHE_TTL_SECONDS
+) if LLM_CACHE_ENABLED else None
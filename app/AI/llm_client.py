@@ -0,0 +1,248 @@
+# Shared HTTP client for chat completion calls to OpenRouter
+import os
+import json
+import threading
+import time
+import requests
+from requests.adapters import HTTPAdapter
+from dotenv import load_dotenv
+from app.AI.llm_cache import llm_cache
+from app.AI.llm_metrics import llm_metrics
+from app.AI.errors import LLMError, LLMTimeoutError
+from app.AI.resilience import (
+    ResilientCaller, CircuitBreaker, DEADLINE_SECONDS, MAX_RETRIES, RETRY_BASE_SECONDS, RETRY_MAX_SECONDS,
+    HEDGE_PERCENTILE, HEDGE_MIN_SAMPLES, BREAKER_FAILURES, BREAKER_RESET_SECONDS, MAX_CONCURRENCY
+)
+
+load_dotenv()
+
+API_KEY = os.getenv("API_KEY")
+MODEL_ID = os.getenv("LLM_MODEL_ID", "deepseek/deepseek-r1-distill-llama-70b:free")
+
+# Point this at a local stub server to run without the real API
+API_URL = os.getenv("LLM_API_URL", "https://openrouter.ai/api/v1/chat/completions")
+
+# Seconds to establish the connection and to wait between bytes of the response
+CONNECT_TIMEOUT = float(os.getenv("LLM_CONNECT_TIMEOUT", "5"))
+READ_TIMEOUT = float(os.getenv("LLM_READ_TIMEOUT", "120"))
+
+# Keep-alive connections kept per host
+POOL_SIZE = int(os.getenv("LLM_POOL_SIZE", "10"))
+
+_session = None
+_session_pid = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """
+    Return this process's pooled session.
+
+    The session is created lazily and re-created after a fork, so gunicorn
+    workers never share sockets inherited from the master process.
+    """
+    global _session, _session_pid
+    if _session is None or _session_pid != os.getpid():
+        with _session_lock:
+            if _session is None or _session_pid != os.getpid():
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                session.headers.update({
+                    "Authorization": f"Bearer {API_KEY}",
+                    "Content-Type": "application/json",
+                })
+                _session, _session_pid = session, os.getpid()
+    return _session
+
+
+def build_payload(prompt, model=MODEL_ID, **extra):
+    payload = {
+        "model": model,
+        "messages": [
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ],
+    }
+    payload.update(extra)
+    return payload
+
+
+def chat_completion(prompt, model=MODEL_ID, timeout=None, stream=False, **extra):
+    """
+    POST a single-message chat completion and return the raw ``requests.Response``.
+
+    ``timeout`` is a ``(connect, read)`` tuple and defaults to the configured
+    timeouts. Network errors propagate as ``requests.exceptions.RequestException``.
+    """
+    payload = build_payload(prompt, model=model, **extra)
+    if stream:
+        payload["stream"] = True
+    return get_session().post(
+        API_URL,
+        json=payload,
+        timeout=timeout or (CONNECT_TIMEOUT, READ_TIMEOUT),
+        stream=stream,
+    )
+
+
+# Process-wide deadline/retry/hedging/circuit-breaker policy for upstream calls
+upstream = ResilientCaller(
+    CircuitBreaker(failure_threshold=BREAKER_FAILURES, reset_seconds=BREAKER_RESET_SECONDS),
+    deadline_seconds=DEADLINE_SECONDS,
+    max_retries=MAX_RETRIES,
+    retry_base=RETRY_BASE_SECONDS,
+    retry_max=RETRY_MAX_SECONDS,
+    hedge_percentile=HEDGE_PERCENTILE,
+    hedge_min_samples=HEDGE_MIN_SAMPLES,
+    connect_timeout=CONNECT_TIMEOUT,
+    read_timeout=READ_TIMEOUT,
+    max_concurrency=MAX_CONCURRENCY
+)
+
+
+def _cache_label(fresh):
+    if llm_cache is None:
+        return 'disabled'
+    return 'bypass' if fresh else 'miss'
+
+
+def complete(prompt, model=MODEL_ID, fresh=False):
+    """
+    Return the completion text for ``prompt``.
+
+    Identical prompts for the same model are served from the response cache
+    unless ``fresh`` is set; a fresh completion still replaces the cached one.
+    The upstream call runs under the ``upstream`` deadline, retry and
+    circuit-breaker policy and raises an ``LLMError`` subclass on failure.
+    Every call is recorded in ``llm_metrics``.
+    """
+    started = time.monotonic()
+    if llm_cache is not None and not fresh:
+        cached = llm_cache.get(model, prompt)
+        if cached is not None:
+            llm_metrics.record_call(model, 'hit', time.monotonic() - started)
+            return cached
+
+    response = None
+    try:
+        response = upstream.call(lambda timeout: chat_completion(prompt, model=model, timeout=timeout))
+        try:
+            result = response.json()
+            content = result['choices'][0]['message']['content']
+        except (ValueError, KeyError, IndexError, TypeError):
+            raise LLMError(f"Unexpected response from the AI service: {response.text[:200]}", response.status_code)
+    except LLMError as e:
+        ttfb = response.elapsed.total_seconds() if response is not None else None
+        llm_metrics.record_call(model, _cache_label(fresh), time.monotonic() - started, ttfb=ttfb, error=e)
+        raise
+
+    # For a non-streamed call, elapsed is the time until the response headers arrived
+    llm_metrics.record_call(
+        model, _cache_label(fresh), time.monotonic() - started,
+        ttfb=response.elapsed.total_seconds(), usage=result.get('usage')
+    )
+    if llm_cache is not None:
+        llm_cache.set(model, prompt, content)
+    return content
+
+
+def _iter_stream_deltas(response, usage=None, status=None):
+    # OpenAI-style SSE: "data: {json}" lines, ": comment" keep-alives, "data: [DONE]" at the end.
+    # The usage block, sent with the last chunk, is copied into ``usage``. ``status['finished']``
+    # is set once "[DONE]" or a finish_reason arrives; a connection that simply ends leaves it unset.
+    for line in response.iter_lines(decode_unicode=True):
+        if not line or not line.startswith('data:'):
+            continue
+        data = line[len('data:'):].strip()
+        if data == '[DONE]':
+            if status is not None:
+                status['finished'] = True
+            break
+        try:
+            chunk = json.loads(data)
+        except ValueError:
+            continue
+        if chunk.get('error'):
+            raise LLMError(chunk['error'].get('message', str(chunk['error'])))
+        if usage is not None and chunk.get('usage'):
+            usage.update(chunk['usage'])
+        choices = chunk.get('choices') or [{}]
+        if status is not None and choices[0].get('finish_reason'):
+            status['finished'] = True
+        delta = (choices[0].get('delta') or {}).get('content')
+        if delta:
+            yield delta
+
+
+def stream_complete(prompt, model=MODEL_ID, fresh=False):
+    """
+    Yield the completion for ``prompt`` in pieces as the API streams them.
+
+    A cached completion is yielded as a single piece. Otherwise the pieces
+    are assembled and cached once the stream has finished; a stream that is
+    abandoned or fails part-way is not cached. A stream whose connection ends
+    without "[DONE]" or a finish_reason was cut off, so it raises ``LLMError``
+    instead of passing the truncated text off as complete. Opening the stream is retried
+    like ``complete``; once text has been sent it is not, and the stream is
+    cut off with ``LLMTimeoutError`` when the deadline passes. The time to
+    first byte recorded for a stream is the time to its first token.
+    """
+    started = time.monotonic()
+    if llm_cache is not None and not fresh:
+        cached = llm_cache.get(model, prompt)
+        if cached is not None:
+            llm_metrics.record_call(model, 'hit', time.monotonic() - started, stream=True)
+            yield cached
+            return
+
+    cache = _cache_label(fresh)
+    deadline = upstream.new_deadline()
+    try:
+        response = upstream.call(
+            lambda timeout: chat_completion(prompt, model=model, timeout=timeout, stream=True, usage={"include": True}),
+            deadline=deadline,
+            hedge=False
+        )
+    except LLMError as e:
+        llm_metrics.record_call(model, cache, time.monotonic() - started, stream=True, error=e)
+        raise
+
+    parts = []
+    usage = {}
+    status = {}
+    ttfb = None
+    try:
+        for delta in _iter_stream_deltas(response, usage, status):
+            if ttfb is None:
+                ttfb = time.monotonic() - started
+            parts.append(delta)
+            yield delta
+            if deadline.expired:
+                raise LLMTimeoutError(f'Completion did not finish within the {deadline.seconds:g}s deadline')
+        if not status.get('finished'):
+            raise LLMError('Stream ended before the completion finished')
+    except requests.exceptions.Timeout as e:
+        error = LLMTimeoutError(f'Stream timed out: {str(e)}')
+        llm_metrics.record_call(model, cache, time.monotonic() - started, stream=True, ttfb=ttfb, usage=usage, error=error)
+        raise error
+    except requests.exceptions.RequestException as e:
+        error = LLMError(f'Stream failed: {str(e)}')
+        llm_metrics.record_call(model, cache, time.monotonic() - started, stream=True, ttfb=ttfb, usage=usage, error=error)
+        raise error
+    except LLMError as e:
+        llm_metrics.record_call(model, cache, time.monotonic() - started, stream=True, ttfb=ttfb, usage=usage, error=e)
+        raise
+    except GeneratorExit:
+        # The client went away before the stream finished
+        llm_metrics.record_call(model, cache, time.monotonic() - started, stream=True, ttfb=ttfb, usage=usage, outcome='abandoned')
+        raise
+    finally:
+        response.close()
+
+    llm_metrics.record_call(model, cache, time.monotonic() - started, stream=True, ttfb=ttfb, usage=usage)
+    if llm_cache is not None and parts:
+        llm_cache.set(model, prompt, ''.join(parts))
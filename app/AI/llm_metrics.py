@@ -0,0 +1,168 @@
+# Per-call instrumentation of LLM completions: histograms and structured log records
+import json
+import logging
+import threading
+from bisect import bisect_left
+from app.AI.errors import LLMRateLimitError, LLMTimeoutError, LLMUnavailableError
+
+logger = logging.getLogger('app.AI.llm_calls')
+
+LATENCY_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 20, 30, 60, 120)
+TOKEN_BUCKETS = (16, 64, 128, 256, 512, 1024, 2048, 4096, 8192, 16384)
+
+
+def outcome_of(error):
+    """Short label for how a call ended, used as a metric label."""
+    if error is None:
+        return 'ok'
+    if isinstance(error, LLMTimeoutError):
+        return 'timeout'
+    if isinstance(error, LLMRateLimitError):
+        return 'rate_limited'
+    if isinstance(error, LLMUnavailableError):
+        return 'unavailable'
+    return 'error'
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label set, in the Prometheus style."""
+
+    def __init__(self, name, help_text, label_names, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        key = tuple(str(labels.get(name, '')) for name in self.label_names)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = {'counts': [0] * (len(self.buckets) + 1), 'sum': 0.0, 'count': 0}
+            series['counts'][index] += 1
+            series['sum'] += value
+            series['count'] += 1
+
+    def _snapshot(self):
+        with self._lock:
+            return {key: {'counts': list(s['counts']), 'sum': s['sum'], 'count': s['count']} for key, s in self._series.items()}
+
+    def quantile(self, series, q):
+        # Upper bound of the bucket holding the q-th observation
+        rank = q * series['count']
+        seen = 0
+        for bound, count in zip(self.buckets + (float('inf'),), series['counts']):
+            seen += count
+            if seen >= rank and count:
+                return bound
+        return None
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        for key, series in sorted(self._snapshot().items()):
+            labels = ','.join(f'{name}="{value}"' for name, value in zip(self.label_names, key))
+            prefix = f'{labels},' if labels else ''
+            cumulative = 0
+            for bound, count in zip(self.buckets, series['counts']):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{prefix}le="{bound:g}"}} {cumulative}')
+            lines.append(f'{self.name}_bucket{{{prefix}le="+Inf"}} {series["count"]}')
+            lines.append(f'{self.name}_sum{{{labels}}} {series["sum"]:.6f}')
+            lines.append(f'{self.name}_count{{{labels}}} {series["count"]}')
+        return lines
+
+    def summary(self):
+        result = []
+        for key, series in sorted(self._snapshot().items()):
+            entry = dict(zip(self.label_names, key))
+            entry.update({
+                'count': series['count'],
+                'mean': round(series['sum'] / series['count'], 4) if series['count'] else None,
+                'p50': self.quantile(series, 0.5),
+                'p95': self.quantile(series, 0.95),
+                'p99': self.quantile(series, 0.99),
+            })
+            result.append(entry)
+        return result
+
+
+class LLMMetrics:
+    """
+    Latency and token histograms for every completion call.
+
+    Each call is also written as one structured log record on the
+    ``app.AI.llm_calls`` logger: the message is a JSON object and the same
+    fields are attached to the record as ``record.llm_call``.
+    """
+
+    def __init__(self):
+        self.ttfb = Histogram(
+            'llm_time_to_first_byte_seconds',
+            'Time until the upstream response headers (or, when streaming, the first token) arrived',
+            ('model', 'stream'), LATENCY_BUCKETS
+        )
+        self.latency = Histogram(
+            'llm_call_duration_seconds',
+            'Total duration of a completion call, retries and cache lookups included',
+            ('model', 'stream', 'cache', 'outcome'), LATENCY_BUCKETS
+        )
+        self.prompt_tokens = Histogram(
+            'llm_prompt_tokens', 'Prompt tokens reported by the upstream usage block',
+            ('model',), TOKEN_BUCKETS
+        )
+        self.completion_tokens = Histogram(
+            'llm_completion_tokens', 'Completion tokens reported by the upstream usage block',
+            ('model',), TOKEN_BUCKETS
+        )
+        self.histograms = (self.ttfb, self.latency, self.prompt_tokens, self.completion_tokens)
+
+    def record_call(self, model, cache, latency, stream=False, ttfb=None, usage=None, error=None, outcome=None):
+        """
+        Record one completion call.
+
+        ``cache`` is ``'hit'``, ``'miss'``, ``'bypass'`` (fresh=true) or
+        ``'disabled'``; ``usage`` is the upstream ``usage`` object when one was
+        returned. ``outcome`` defaults to one derived from ``error``.
+        """
+        outcome = outcome or outcome_of(error)
+        stream_label = 'true' if stream else 'false'
+        usage = usage or {}
+        self.latency.observe(latency, model=model, stream=stream_label, cache=cache, outcome=outcome)
+        if ttfb is not None:
+            self.ttfb.observe(ttfb, model=model, stream=stream_label)
+        if usage.get('prompt_tokens') is not None:
+            self.prompt_tokens.observe(usage['prompt_tokens'], model=model)
+        if usage.get('completion_tokens') is not None:
+            self.completion_tokens.observe(usage['completion_tokens'], model=model)
+
+        fields = {
+            'event': 'llm_call',
+            'model': model,
+            'stream': stream,
+            'cache': cache,
+            'outcome': outcome,
+            'latency_ms': round(latency * 1000, 1),
+            'ttfb_ms': round(ttfb * 1000, 1) if ttfb is not None else None,
+            'prompt_tokens': usage.get('prompt_tokens'),
+            'completion_tokens': usage.get('completion_tokens'),
+        }
+        if error is not None:
+            fields['error'] = str(error)[:200]
+        logger.log(logging.WARNING if error is not None else logging.INFO,
+                   json.dumps(fields, sort_keys=True), extra={'llm_call': fields})
+
+    def render_prometheus(self):
+        lines = []
+        for histogram in self.histograms:
+            lines.extend(histogram.render())
+        return '\n'.join(lines) + '\n'
+
+    def summary(self):
+        return {histogram.name: histogram.summary() for histogram in self.histograms}
+
+
+# Process-wide metrics recorded by the LLM client
+llm_metrics = LLMMetrics()
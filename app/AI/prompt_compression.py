@@ -0,0 +1,234 @@
+# Shrinking resume and job description text before it goes into a prompt
+import logging
+import math
+import os
+import re
+import threading
+from collections import Counter, namedtuple
+from dotenv import load_dotenv
+from app.services.job_search import tokenize
+from app.AI.resume_sections import is_section_heading, split_sections, join_sections, is_bullet
+
+load_dotenv()
+
+logger = logging.getLogger(__name__)
+
+PROMPT_COMPRESSION_ENABLED = os.getenv("PROMPT_COMPRESSION_ENABLED", "true").lower() == "true"
+
+# Estimated tokens allowed for each input of the cover letter prompt
+RESUME_TOKEN_BUDGET = int(os.getenv("PROMPT_RESUME_TOKEN_BUDGET", "1200"))
+JOB_DESCRIPTION_TOKEN_BUDGET = int(os.getenv("PROMPT_JOB_DESCRIPTION_TOKEN_BUDGET", "600"))
+
+# Leading lines of a resume (name, contact details) that are always kept
+PINNED_LINES = 3
+
+# Lines longer than this are split into sentences so they can be selected separately
+MAX_UNIT_TOKENS = 80
+
+# Lines that carry no information about the candidate or the role
+BOILERPLATE_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE) for pattern in (
+        r'references (are )?available (up)?on request',
+        r'equal (employment )?opportunity employer',
+        r'all qualified applicants will receive consideration',
+        r'without regard to (race|color|religion|sex|gender|age|national origin)',
+        r'reasonable accommodations?',
+        r'this (job )?description is not (intended to be )?(an )?exhaustive',
+        r'^(page \d+( of \d+)?|curriculum vitae|resume)$',
+    )
+]
+
+_SENTENCE_RE = re.compile(r'(?<=[.!?;])\s+')
+_NORMALIZE_RE = re.compile(r'[^a-z0-9+#]+')
+
+CompressionResult = namedtuple('CompressionResult', ['text', 'original_tokens', 'tokens'])
+
+
+def estimate_tokens(text):
+    """Rough token count (about four characters per token for English text)."""
+    return (len(text or '') + 3) // 4
+
+
+def _normalize_line(line):
+    return _NORMALIZE_RE.sub(' ', line.lower()).strip()
+
+
+def is_boilerplate(line):
+    normalized = ' '.join(line.split()).strip('-•* ')
+    return any(pattern.search(normalized) for pattern in BOILERPLATE_PATTERNS)
+
+
+def dedupe_lines(text, repeated=True):
+    """
+    Drop boilerplate lines and runs of blank lines, and with ``repeated`` also
+    lines that repeat earlier ones.
+
+    Headings are always kept. Repeats are only looked for nearby: a line is
+    compared with the earlier lines of its section, and a bullet only with the
+    bullets of its own entry, so two jobs may share a bullet.
+    """
+    seen_in_section = set()
+    seen_in_entry = set()
+    lines = []
+    for line in (text or '').split('\n'):
+        normalized = _normalize_line(line)
+        if not normalized:
+            if lines and lines[-1].strip():
+                lines.append('')
+            continue
+        if is_boilerplate(line):
+            continue
+        bullet = is_bullet(line)
+        if not bullet and is_section_heading(line):
+            seen_in_section = set()
+            seen_in_entry = set()
+        elif repeated:
+            seen = seen_in_entry if bullet else seen_in_section
+            if normalized in seen:
+                continue
+            seen.add(normalized)
+            if not bullet:
+                # A line other than a bullet starts a new entry (a job, a degree, a paragraph)
+                seen_in_entry = set()
+        lines.append(line.rstrip())
+    return '\n'.join(lines).strip('\n')
+
+
+def _split_long_line(line):
+    if estimate_tokens(line) <= MAX_UNIT_TOKENS:
+        return [line]
+    prefix = '- ' if is_bullet(line) else ''
+    sentences = [sentence for sentence in _SENTENCE_RE.split(line.strip()) if sentence]
+    return [sentences[0]] + [prefix + sentence for sentence in sentences[1:]]
+
+
+def select_relevant(text, query, budget):
+    """
+    Keep the lines of ``text`` most relevant to ``query`` within ``budget`` tokens.
+
+    Each line is scored by the IDF-weighted overlap of its terms with the
+    query's, normalized by its length, and lines are taken best first while
+    they fit. The leading lines are always kept. Kept lines stay in their
+    original order under their section heading, and sections left empty are
+    dropped along with their heading.
+    """
+    if estimate_tokens(text) <= budget:
+        return text
+
+    query_terms = set(tokenize(query))
+    units = []  # (section index, text)
+    sections = split_sections(text)
+    for section_index, (heading, body) in enumerate(sections):
+        for line in body:
+            if line.strip():
+                units.extend((section_index, part) for part in _split_long_line(line))
+
+    unit_terms = [set(tokenize(unit)) for _, unit in units]
+    document_frequency = Counter(term for terms in unit_terms for term in terms)
+    total = len(units) or 1
+
+    def score(index):
+        terms = unit_terms[index]
+        if not terms:
+            return 0.0
+        overlap = sum(math.log(1 + total / document_frequency[term]) for term in terms & query_terms)
+        return overlap / math.sqrt(len(terms))
+
+    selected = set(range(min(PINNED_LINES, len(units))))
+    used = sum(estimate_tokens(units[index][1]) for index in selected)
+    headed = {units[index][0] for index in selected}
+    for index in sorted(range(len(units)), key=lambda i: (-score(i), i)):
+        if index in selected:
+            continue
+        section_index = units[index][0]
+        heading = sections[section_index][0]
+        cost = estimate_tokens(units[index][1])
+        if section_index not in headed and heading is not None:
+            cost += estimate_tokens(heading)
+        if used + cost > budget:
+            continue
+        selected.add(index)
+        headed.add(section_index)
+        used += cost
+
+    kept = {}
+    for index in sorted(selected):
+        section_index, unit = units[index]
+        kept.setdefault(section_index, []).append(unit)
+    return join_sections((sections[section_index][0], kept[section_index]) for section_index in sorted(kept))
+
+
+class _CompressionStats:
+    def __init__(self):
+        self.calls = 0
+        self.original_tokens = 0
+        self.tokens = 0
+        self._lock = threading.Lock()
+
+    def record(self, kind, original_tokens, tokens):
+        with self._lock:
+            self.calls += 1
+            self.original_tokens += original_tokens
+            self.tokens += tokens
+        logger.info(
+            'prompt compression kind=%s original_tokens=%d tokens=%d saved=%d',
+            kind, original_tokens, tokens, original_tokens - tokens
+        )
+
+    def as_dict(self):
+        saved = self.original_tokens - self.tokens
+        return {
+            'enabled': PROMPT_COMPRESSION_ENABLED,
+            'calls': self.calls,
+            'original_tokens': self.original_tokens,
+            'tokens': self.tokens,
+            'tokens_saved': saved,
+            'saved_ratio': round(saved / self.original_tokens, 4) if self.original_tokens else 0.0,
+        }
+
+
+compression_stats = _CompressionStats()
+
+
+def compress_cover_letter_inputs(position_name, job_description, resume_content):
+    """
+    Return ``(job_description, resume_content)`` trimmed for the cover letter
+    prompt, as ``CompressionResult`` tuples.
+
+    Boilerplate and repeated lines are removed from both. The resume is then
+    cut down to the lines most relevant to the position and job description,
+    and the job description to the lines most relevant to the resume.
+    """
+    original = estimate_tokens(job_description) + estimate_tokens(resume_content)
+    if not PROMPT_COMPRESSION_ENABLED:
+        return (
+            CompressionResult(job_description, estimate_tokens(job_description), estimate_tokens(job_description)),
+            CompressionResult(resume_content, estimate_tokens(resume_content), estimate_tokens(resume_content)),
+        )
+
+    job_text = dedupe_lines(job_description)
+    resume_text = dedupe_lines(resume_content)
+    compressed_resume = select_relevant(resume_text, f'{position_name}\n{job_text}', RESUME_TOKEN_BUDGET)
+    compressed_job = select_relevant(job_text, f'{position_name}\n{resume_text}', JOB_DESCRIPTION_TOKEN_BUDGET)
+
+    job_result = CompressionResult(compressed_job, estimate_tokens(job_description), estimate_tokens(compressed_job))
+    resume_result = CompressionResult(compressed_resume, estimate_tokens(resume_content), estimate_tokens(compressed_resume))
+    compression_stats.record('cover_letter', original, job_result.tokens + resume_result.tokens)
+    return job_result, resume_result
+
+
+def compress_polish_input(resume_content):
+    """
+    Trim a resume that is about to be polished.
+
+    The polished output is meant to contain the whole resume, so only
+    boilerplate and blank runs are removed. Repeated lines are kept, since
+    the same bullet under two jobs is content, not noise.
+    """
+    original = estimate_tokens(resume_content)
+    if not PROMPT_COMPRESSION_ENABLED:
+        return CompressionResult(resume_content, original, original)
+    text = dedupe_lines(resume_content, repeated=False)
+    result = CompressionResult(text, original, estimate_tokens(text))
+    compression_stats.record('polish_resume', original, result.tokens)
+    return result
@@ -0,0 +1,353 @@
+# Deadlines, retries, hedged requests and a circuit breaker around upstream LLM calls
+import os
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from functools import partial
+import requests
+from dotenv import load_dotenv
+from app.AI.errors import LLMError, LLMRateLimitError, LLMTimeoutError, LLMUnavailableError
+
+load_dotenv()
+
+# End-to-end time allowed for one completion, retries included
+DEADLINE_SECONDS = float(os.getenv("LLM_DEADLINE_SECONDS", "90"))
+
+# Retries after the first attempt, with full-jitter exponential backoff between them
+MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "2"))
+RETRY_BASE_SECONDS = float(os.getenv("LLM_RETRY_BASE_SECONDS", "0.5"))
+RETRY_MAX_SECONDS = float(os.getenv("LLM_RETRY_MAX_SECONDS", "8"))
+
+# Send a second, hedged request when the first is slower than this percentile of
+# recent latencies (e.g. 95). 0 disables hedging.
+HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "0"))
+HEDGE_MIN_SAMPLES = int(os.getenv("LLM_HEDGE_MIN_SAMPLES", "20"))
+
+# Consecutive upstream failures that open the circuit, and how long it stays open
+BREAKER_FAILURES = int(os.getenv("LLM_BREAKER_FAILURES", "5"))
+BREAKER_RESET_SECONDS = float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30"))
+
+# Upstream requests in flight at once per process (hedges included)
+MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "32"))
+
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+
+
+class Deadline:
+    """A point in time by which a call has to finish."""
+
+    def __init__(self, seconds):
+        self.seconds = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self):
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self):
+        return self.remaining() <= 0
+
+    def timeout(self, connect, read):
+        """A ``(connect, read)`` timeout tuple that does not outlive the deadline."""
+        remaining = self.remaining()
+        return (min(connect, remaining), min(read, remaining))
+
+
+class CircuitBreaker:
+    """
+    Fails calls fast while the upstream looks down.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    every call raises ``LLMUnavailableError`` for ``reset_seconds``. Then a
+    single trial call is let through (half-open): its success closes the
+    circuit, its failure opens it again.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, failure_threshold=5, reset_seconds=30):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = None
+        self.rejected = 0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def before_call(self):
+        with self._lock:
+            if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.reset_seconds:
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == self.CLOSED:
+                return
+            if self.state == self.HALF_OPEN and not self._trial_in_flight:
+                self._trial_in_flight = True
+                return
+            self.rejected += 1
+            retry_after = self.reset_seconds
+            if self.state == self.OPEN:
+                retry_after = max(0.0, self.reset_seconds - (time.monotonic() - self.opened_at))
+            raise LLMUnavailableError('The AI service is temporarily unavailable', retry_after=retry_after)
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self._trial_in_flight = False
+
+    def record_neutral(self):
+        # Neither healthy nor failing (e.g. rate limited): release a half-open trial
+        # without closing the circuit, so the next call becomes the trial
+        with self._lock:
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self.opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+    def stats(self):
+        with self._lock:
+            return {
+                'state': self.state,
+                'consecutive_failures': self.failures,
+                'rejected': self.rejected,
+            }
+
+
+class LatencyWindow:
+    """The most recent ``size`` latencies, for percentile estimates."""
+
+    def __init__(self, size=200):
+        self._samples = deque(maxlen=size)
+        self._lock = threading.Lock()
+
+    def add(self, seconds):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def __len__(self):
+        return len(self._samples)
+
+    def percentile(self, percent):
+        with self._lock:
+            samples = sorted(self._samples)
+        if not samples:
+            return None
+        index = min(len(samples) - 1, max(0, int(round(percent / 100.0 * len(samples))) - 1))
+        return samples[index]
+
+
+def _retry_after(response):
+    value = response.headers.get('Retry-After')
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def error_from_response(response):
+    return LLMError(
+        f"{response.status_code} - {response.text}",
+        status_code=response.status_code,
+        retry_after=_retry_after(response)
+    )
+
+
+def _close_response(future, keep=None):
+    # Release the pooled connection of a response that will not be returned
+    if future.cancelled() or future.exception() is not None:
+        return
+    response = future.result()
+    if response is not keep:
+        response.close()
+
+
+def _is_retryable(error):
+    if isinstance(error, LLMUnavailableError):
+        return False
+    return error.status_code is None or error.status_code in RETRYABLE_STATUSES
+
+
+def _is_upstream_failure(error):
+    # Errors that suggest the upstream is unhealthy, as opposed to a rate limit or a bad request
+    return error.status_code is None or error.status_code >= 500
+
+
+class ResilientCaller:
+    """
+    Runs an upstream request function under a deadline, with retries,
+    optional hedging and a circuit breaker.
+
+    ``send(timeout)`` must perform one HTTP request with the given
+    ``(connect, read)`` timeout and return the ``requests.Response``.
+    """
+
+    def __init__(self, breaker, deadline_seconds=90, max_retries=2, retry_base=0.5, retry_max=8,
+                 hedge_percentile=0, hedge_min_samples=20, connect_timeout=5, read_timeout=120,
+                 max_concurrency=32):
+        self.breaker = breaker
+        self.deadline_seconds = deadline_seconds
+        self.max_retries = max_retries
+        self.retry_base = retry_base
+        self.retry_max = retry_max
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_concurrency = max_concurrency
+        self.latencies = LatencyWindow()
+        self.retries = 0
+        self.hedges = 0
+        self.timeouts = 0
+        self._executor = None
+        self._executor_pid = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        if self._executor is None or self._executor_pid != os.getpid():
+            with self._lock:
+                if self._executor is None or self._executor_pid != os.getpid():
+                    self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix='llm-call')
+                    self._executor_pid = os.getpid()
+        return self._executor
+
+    def _count(self, counter):
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+    def new_deadline(self):
+        return Deadline(self.deadline_seconds)
+
+    def _hedge_delay(self):
+        if not self.hedge_percentile or len(self.latencies) < self.hedge_min_samples:
+            return None
+        return self.latencies.percentile(self.hedge_percentile)
+
+    def _attempt(self, send, deadline, hedge):
+        # One attempt, possibly hedged. Returns the first 200 response, or the
+        # last error response when every request failed.
+        if deadline.expired:
+            raise LLMTimeoutError(f'No completion within the {deadline.seconds:g}s deadline')
+        executor = self._get_executor()
+        started = time.monotonic()
+        pending = {executor.submit(send, deadline.timeout(self.connect_timeout, self.read_timeout))}
+
+        hedge_delay = self._hedge_delay() if hedge else None
+        if hedge_delay is not None:
+            done, _ = wait(pending, timeout=min(hedge_delay, deadline.remaining()))
+            if not done and not deadline.expired:
+                self._count('hedges')
+                pending.add(executor.submit(send, deadline.timeout(self.connect_timeout, self.read_timeout)))
+
+        error = None
+        last_response = None
+        returned = None
+        futures = list(pending)
+        try:
+            while pending:
+                done, pending = wait(pending, timeout=deadline.remaining(), return_when=FIRST_COMPLETED)
+                if not done:
+                    break
+                for future in done:
+                    try:
+                        response = future.result()
+                    except requests.exceptions.Timeout as e:
+                        error = LLMTimeoutError(f'Request timed out: {str(e)}')
+                        continue
+                    except requests.exceptions.RequestException as e:
+                        error = LLMError(f'Request failed: {str(e)}')
+                        continue
+                    if response.status_code == 200:
+                        if hedge:
+                            self.latencies.add(time.monotonic() - started)
+                        returned = response
+                        return response
+                    error = error_from_response(response)
+                    last_response = response
+            if last_response is not None and not pending:
+                # Every request was answered and none succeeded: hand back the last answer
+                returned = last_response
+                return last_response
+        finally:
+            # Close every other response: hedges that lost, error answers, and requests
+            # still in flight past the deadline (once they finish)
+            for future in futures:
+                future.add_done_callback(partial(_close_response, keep=returned))
+        if error is not None:
+            raise error
+        raise LLMTimeoutError(f'No completion within the {deadline.seconds:g}s deadline')
+
+    def _backoff(self, attempt, error):
+        delay = random.uniform(0, min(self.retry_max, self.retry_base * 2 ** attempt))
+        if error.retry_after is not None:
+            delay = max(delay, error.retry_after)
+        return delay
+
+    def call(self, send, deadline=None, hedge=True):
+        """
+        Return the first successful response.
+
+        Raises ``LLMUnavailableError`` while the circuit is open,
+        ``LLMTimeoutError`` once the deadline has passed, ``LLMRateLimitError``
+        if the upstream keeps answering 429, and ``LLMError`` otherwise.
+        """
+        deadline = deadline or self.new_deadline()
+        error = None
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self._count('retries')
+            self.breaker.before_call()
+            try:
+                response = self._attempt(send, deadline, hedge)
+            except LLMError as e:
+                error = e
+            except BaseException:
+                self.breaker.record_failure()
+                raise
+            else:
+                if response.status_code == 200:
+                    self.breaker.record_success()
+                    return response
+                error = error_from_response(response)
+                response.close()
+
+            if _is_upstream_failure(error):
+                self.breaker.record_failure()
+            elif error.status_code == 429:
+                self.breaker.record_neutral()
+            else:
+                self.breaker.record_success()
+            if not _is_retryable(error) or attempt == self.max_retries:
+                break
+            delay = self._backoff(attempt, error)
+            if delay >= deadline.remaining():
+                break
+            time.sleep(delay)
+
+        if isinstance(error, LLMTimeoutError) or deadline.expired:
+            self._count('timeouts')
+            if not isinstance(error, LLMTimeoutError):
+                error = LLMTimeoutError(f'No completion within the {deadline.seconds:g}s deadline: {str(error)}')
+        elif error.status_code == 429:
+            error = LLMRateLimitError(str(error), status_code=429, retry_after=error.retry_after)
+        raise error
+
+    def stats(self):
+        hedge_delay = self._hedge_delay()
+        return {
+            'circuit': self.breaker.stats(),
+            'deadline_seconds': self.deadline_seconds,
+            'max_retries': self.max_retries,
+            'retries': self.retries,
+            'hedges': self.hedges,
+            'timeouts': self.timeouts,
+            'hedge_after_seconds': round(hedge_delay, 3) if hedge_delay is not None else None,
+        }
@@ -1,9 +1,8 @@
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib import colors
 from io import BytesIO
 
+# Bump whenever create_resume_pdf's output changes, so cached PDFs are rendered again
+TEMPLATE_VERSION = 1
+
 def create_resume_pdf(position_name, social_media1, social_media2, education, experience, certifications, projects, skills, email='', phone=''):
     """
     Creates a PDF resume using the provided details.
@@ -23,6 +22,12 @@ def create_resume_pdf(position_name, social_media1, social_media2, education, ex
     Returns:
         bytes: PDF content as bytes
     """
+    # ReportLab is slow to import, so it is only loaded once a PDF is rendered
+    from reportlab.lib.pagesizes import letter
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib import colors
+
     buffer = BytesIO()
     doc = SimpleDocTemplate(buffer, pagesize=letter)
     styles = getSampleStyleSheet()
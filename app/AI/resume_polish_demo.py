@@ -0,0 +1,21 @@
+# Standalone Gradio demo of the resume polisher. Not used by the API server:
+#     python -m app.AI.resume_polish_demo
+import gradio as gr
+from app.AI.resume_polisher import polish_resume
+
+# Create Gradio interface for the resume polish application
+resume_polish_application = gr.Interface(
+    fn=polish_resume,
+    inputs=[
+        gr.Textbox(label="Position Name", placeholder="Enter the name of the position..."),
+        gr.Textbox(label="Resume Content", placeholder="Paste your resume content here...", lines=20),
+        gr.Textbox(label="Polish Instruction (Optional)", placeholder="Enter specific instructions or areas for improvement (optional)...", lines=2),
+    ],
+    outputs=gr.Textbox(label="Polished Content"),
+    title="Resume Polish Application",
+    description="This application helps you polish your resume. Enter the position you want to apply, your resume content, and specific instructions or areas for improvement (optional), then get a polished version of your content."
+)
+
+# Launch the application
+if __name__ == "__main__":
+    resume_polish_application.launch()
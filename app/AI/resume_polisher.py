@@ -1,70 +1,98 @@
 # Import necessary packages
 import os
 from dotenv import load_dotenv
-import requests
-import json
-import gradio as gr
 from io import BytesIO
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib import colors
 
-load_dotenv()
+from app.AI.llm_client import complete, stream_complete
+from concurrent.futures import ThreadPoolExecutor
+from app.AI.resume_sections import is_section_heading, split_sections, join_sections
+from app.AI.prompt_compression import compress_polish_input
 
-API_KEY = os.getenv("API_KEY")
-MODEL_ID = "deepseek/deepseek-r1-distill-llama-70b:free"
+load_dotenv()
 
+# Sections polished at once in sectioned mode
+POLISH_SECTION_CONCURRENCY = int(os.getenv("POLISH_SECTION_CONCURRENCY", "4"))
 
-# Function to polish the resume using the model
-def polish_resume(position_name, resume_content, polish_prompt="", format="text"):
-    # Headers for authentication
-    headers={
-    "Authorization": f"Bearer {API_KEY}",
-    "Content-Type": "application/json",
-    }
 
-    # Check if polish_prompt is provided and adjust the combined_prompt accordingly
+# Build the polishing prompt, with or without the user's own instructions
+def build_polish_prompt(position_name, resume_content, polish_prompt=""):
+    resume_content = compress_polish_input(resume_content).text
     if polish_prompt and polish_prompt.strip():
-        prompt = f"Given the resume content: '{resume_content}', polish it based on the following instructions: {polish_prompt} for the {position_name} position. MAKE SURE NOT TO INCLUDE ANY EXPLANATORY TEXT BEFORE AND AFTER THE RESUME CONTENT. USE * TO INDICATE HEADINGS AND - TO INDICATE BULLET POINTS. ALWAYS START WITH THE NAME IN FIRST LINE"
-    else:
-        prompt = f"Suggest improvements for the following resume content: '{resume_content}' to better align with the requirements and expectations of a {position_name} position. Return the polished version, highlighting necessary adjustments for clarity, relevance, and impact in relation to the targeted role. MAKE SURE NOT TO INCLUDE ANY EXPLANATORY TEXT BEFORE AND AFTER THE RESUME CONTENT. USE * TO INDICATE HEADINGS AND - TO INDICATE BULLET POINTS. ALWAYS START WITH THE NAME IN FIRST LINE"
-    
-    # Request payload
-    payload = {
-    "model": "deepseek/deepseek-r1-distill-llama-70b:free",
-    "messages": [
-      {
-        "role": "user",
-        "content": prompt
-      }
-    ],
-    }
+        return f"Given the resume content: '{resume_content}', polish it based on the following instructions: {polish_prompt} for the {position_name} position. MAKE SURE NOT TO INCLUDE ANY EXPLANATORY TEXT BEFORE AND AFTER THE RESUME CONTENT. USE * TO INDICATE HEADINGS AND - TO INDICATE BULLET POINTS. ALWAYS START WITH THE NAME IN FIRST LINE"
+    return f"Suggest improvements for the following resume content: '{resume_content}' to better align with the requirements and expectations of a {position_name} position. Return the polished version, highlighting necessary adjustments for clarity, relevance, and impact in relation to the targeted role. MAKE SURE NOT TO INCLUDE ANY EXPLANATORY TEXT BEFORE AND AFTER THE RESUME CONTENT. USE * TO INDICATE HEADINGS AND - TO INDICATE BULLET POINTS. ALWAYS START WITH THE NAME IN FIRST LINE"
+
+
+# Build the prompt that polishes a single section in sectioned mode
+def build_section_polish_prompt(position_name, heading, section_content, polish_prompt=""):
+    instructions = f" Follow these instructions: {polish_prompt}." if polish_prompt and polish_prompt.strip() else ""
+    return f"The following is the '{heading.strip().strip('*:').strip()}' section of a resume: '{section_content}'. Polish it to better align with the requirements and expectations of a {position_name} position, improving clarity, relevance, and impact without inventing experience.{instructions} RETURN ONLY THE POLISHED SECTION CONTENT, WITHOUT THE SECTION HEADING AND WITHOUT ANY EXPLANATORY TEXT BEFORE OR AFTER IT. USE - TO INDICATE BULLET POINTS."
+
 
+def _strip_repeated_heading(heading, polished):
+    # Models often echo the heading despite being told not to
+    lines = polished.strip().split('\n')
+    if lines and lines[0].strip().strip('*:#').strip().lower() == heading.strip().strip('*:').strip().lower():
+        lines = lines[1:]
+    return '\n'.join(lines).strip('\n')
+
+
+# Map-reduce polishing: each section is polished by its own request, concurrently,
+# and the results are put back together in the original order. The lines before
+# the first heading (name and contact details) are kept as they are.
+# Raises on API errors.
+def polish_resume_sections(position_name, resume_content, polish_prompt="", fresh=False, concurrency=POLISH_SECTION_CONCURRENCY):
+    sections = split_sections(compress_polish_input(resume_content).text)
+    executor = ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(sections))), thread_name_prefix='polish-section')
     try:
-        # Make API request
-        response = requests.post(
-            url="https://openrouter.ai/api/v1/chat/completions",
-            headers=headers,
-            data=json.dumps(payload),
-        )
-        
-        # Handle response
-        if response.status_code == 200:
-            result = response.json()
-            content = result['choices'][0]['message']['content']
-            return content
-        else:
-            return f"Error: {response.status_code} - {response.text}"
-            
-    except requests.exceptions.RequestException as e:
-        return f"Request failed: {str(e)}"
+        futures = []
+        for heading, body in sections:
+            section_content = '\n'.join(body).strip()
+            if heading is None or not section_content:
+                futures.append(None)
+                continue
+            prompt = build_section_polish_prompt(position_name, heading, section_content, polish_prompt)
+            futures.append(executor.submit(complete, prompt, fresh=fresh))
+
+        polished = []
+        for (heading, body), future in zip(sections, futures):
+            if future is None:
+                polished.append((heading, body))
+            else:
+                # Keep the blank line that separated this section from the next
+                separator = [''] if body and not body[-1].strip() else []
+                polished.append((heading, _strip_repeated_heading(heading, future.result()).split('\n') + separator))
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+    return join_sections(polished)
+
+
+# Function to polish the resume using the model.
+# With sectioned=True every section is polished separately and in parallel, so
+# a long resume takes about as long as its largest section.
+# Failures raise LLMError (app/AI/errors.py) rather than returning error text.
+def polish_resume(position_name, resume_content, polish_prompt="", format="text", fresh=False, sectioned=False):
+    if sectioned and len(split_sections(resume_content)) > 1:
+        return polish_resume_sections(position_name, resume_content, polish_prompt, fresh=fresh)
+
+    prompt = build_polish_prompt(position_name, resume_content, polish_prompt)
+    # Served from the response cache unless a fresh completion is requested
+    return complete(prompt, fresh=fresh)
 
 
-# ...existing code...
+# Stream the polished resume in pieces as the model generates it (raises on API errors)
+def stream_polished_resume(position_name, resume_content, polish_prompt="", fresh=False):
+    prompt = build_polish_prompt(position_name, resume_content, polish_prompt)
+    return stream_complete(prompt, fresh=fresh)
+
 
 # Function to convert text to PDF
 def create_resume_pdf(resume_content, position_name):
+    # ReportLab is slow to import, so it is only loaded once a PDF is rendered
+    from reportlab.lib.pagesizes import letter
+    from reportlab.platypus import SimpleDocTemplate, Paragraph
+    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from reportlab.lib import colors
+
     # Create a BytesIO object to store the PDF
     buffer = BytesIO()
     
@@ -194,7 +222,7 @@ def create_resume_pdf(resume_content, position_name):
             continue
         
         # Section headers - all caps, ends with colon, or bold-looking
-        if line.isupper() or line.endswith(':') or line.startswith('**') and line.endswith('**') or line.startswith('*'):
+        if is_section_heading(line):
             current_section = line.strip(':').strip('*')
             clean_section = current_section.strip()
             elements.append(Paragraph(clean_section, section_style))
@@ -238,22 +266,3 @@ def create_resume_pdf(resume_content, position_name):
     buffer.close()
     
     return pdf_content
-
-# ...existing code...
-
-# Create Gradio interface for the resume polish application
-resume_polish_application = gr.Interface(
-    fn=polish_resume,
-    inputs=[
-        gr.Textbox(label="Position Name", placeholder="Enter the name of the position..."),
-        gr.Textbox(label="Resume Content", placeholder="Paste your resume content here...", lines=20),
-        gr.Textbox(label="Polish Instruction (Optional)", placeholder="Enter specific instructions or areas for improvement (optional)...", lines=2),
-    ],
-    outputs=gr.Textbox(label="Polished Content"),
-    title="Resume Polish Application",
-    description="This application helps you polish your resume. Enter the position you want to apply, your resume content, and specific instructions or areas for improvement (optional), then get a polished version of your content."
-)
-
-# Launch the application
-if __name__ == "__main__":
-    resume_polish_application.launch()
\ No newline at end of file
@@ -0,0 +1,41 @@
+# Splitting plain-text resumes into their sections
+BULLET_MARKERS = ('-', '•')
+
+
+def is_section_heading(line):
+    """Heading heuristic used for resumes: all caps, a trailing colon, or a leading '*' (incl. **bold**)."""
+    line = line.strip()
+    return bool(line) and (line.isupper() or line.endswith(':') or line.startswith('*'))
+
+
+def is_bullet(line):
+    return line.lstrip().startswith(BULLET_MARKERS)
+
+
+def split_sections(text):
+    """
+    Split resume text into ``[(heading, lines), ...]`` in document order.
+
+    The first line and the lines before the first heading after it (the name
+    and contact details) form a leading section whose heading is ``None``;
+    like ``create_resume_pdf``, the first line is taken for the name even when
+    it is written in capitals. Bullets are never taken for headings either.
+    Lines are kept verbatim, so ``join_sections(split_sections(text))`` gives
+    back ``text``.
+    """
+    sections = [(None, [])]
+    for index, line in enumerate((text or '').split('\n')):
+        if index and not is_bullet(line) and is_section_heading(line):
+            sections.append((line, []))
+        else:
+            sections[-1][1].append(line)
+    return sections
+
+
+def join_sections(sections):
+    lines = []
+    for heading, body in sections:
+        if heading is not None:
+            lines.append(heading)
+        lines.extend(body)
+    return '\n'.join(lines)
@@ -0,0 +1,42 @@
+# This file contains the model for background AI generation tasks
+from app import db
+from datetime import datetime
+
+class AITask(db.Model):
+    __tablename__ = 'ai_tasks'
+
+    id = db.Column(db.String(32), primary_key=True)  # uuid4 hex
+    kind = db.Column(db.String(50), nullable=False)  # cover_letter, polish_resume
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, running, succeeded, failed, cancelled
+    params = db.Column(db.Text, nullable=False)  # JSON object of the generation inputs
+    result = db.Column(db.Text, nullable=True)
+    error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    __table_args__ = (
+        # Listing and expiring tasks by state
+        db.Index('ix_ai_tasks_status_created', 'status', 'created_at'),
+    )
+
+    FINISHED_STATUSES = ('succeeded', 'failed', 'cancelled')
+
+    @property
+    def is_finished(self):
+        return self.status in self.FINISHED_STATUSES
+
+    def to_dict(self):
+        return {
+            'task_id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'result': self.result,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None
+        }
+
+    def __repr__(self):
+        return f'<AITask {self.id} {self.kind} {self.status}>'
@@ -1,6 +1,7 @@
 # This file contains the model for Resume
 from app import db
 from datetime import datetime
+from sqlalchemy import event, case
 
 class Job(db.Model):
     __tablename__ = 'jobs'
@@ -18,6 +19,11 @@ class Job(db.Model):
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     is_active = db.Column(db.Boolean, default=True)
     application_count = db.Column(db.Integer, default=0)  # Number of applications received
+
+    # Supports keyset pagination of active jobs on (created_at, id)
+    __table_args__ = (
+        db.Index('ix_jobs_active_created_at', 'is_active', 'created_at', 'id'),
+    )
  
 
 # Define your JobApplication model - add this to app/models/job_application.py or create the file
@@ -34,4 +40,46 @@ class JobApplication(db.Model):
     resume_file = db.Column(db.String(255)) 
     
     # Define relationship to Job for easier querying
-    job = db.relationship('Job', backref='applications')
\ No newline at end of file
+    job = db.relationship('Job', backref='applications')
+
+    # Supports the per-job applicant listing, filtered by status and ordered by applied_at
+    __table_args__ = (
+        db.Index('ix_job_applications_job_status_applied', 'job_id', 'status', 'applied_at'),
+    )
+
+
+# Keep Job.application_count in step with applications removed through the ORM.
+# The decrement runs on the flush connection, so it commits or rolls back with the delete.
+@event.listens_for(JobApplication, 'after_delete')
+def _decrement_application_count(mapper, connection, target):
+    jobs = Job.__table__
+    connection.execute(
+        jobs.update()
+        .where(jobs.c.id == target.job_id)
+        .values(
+            application_count=case((jobs.c.application_count > 0, jobs.c.application_count - 1), else_=0),
+            # A counter change is not an edit of the posting, so keep updated_at (onupdate would bump it)
+            updated_at=jobs.c.updated_at
+        )
+    )
+
+
+def repair_application_counts():
+    """
+    Recompute Job.application_count from the job_applications table.
+
+    Returns the number of jobs whose stored count was wrong.
+    """
+    counts = (
+        db.select(db.func.count(JobApplication.id))
+        .where(JobApplication.job_id == Job.id)
+        .scalar_subquery()
+    )
+    result = db.session.execute(
+        db.update(Job)
+        .where(db.func.coalesce(Job.application_count, -1) != counts)
+        .values(application_count=counts, updated_at=Job.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return result.rowcount
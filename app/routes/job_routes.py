@@ -1,7 +1,7 @@
-from flask import Blueprint, request, jsonify, current_app, send_from_directory
+from flask import Blueprint, request, jsonify, current_app, send_from_directory, Response, stream_with_context
 from app import db
 from app.models.user import User
-from app.models.job import Job, JobApplication
+from app.models.job import Job, JobApplication, repair_application_counts
 from flask_cors import CORS
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from datetime import datetime
@@ -9,59 +9,369 @@ import json
 import os
 from werkzeug.utils import secure_filename
 import uuid
+import click
+import hashlib
+from sqlalchemy import case
+from app.services.job_search import job_search_index
+from app.services import job_import
+from app.services.job_matcher import job_matcher, resume_profile
+from app.services.candidate_ranking import rank_applications
+from app.services.job_facets import job_facet_index
+from app.services.job_autocomplete import job_autocomplete_index, AUTOCOMPLETE_FIELDS
+from app.services.job_dedup import job_duplicate_index, minhash_signature, job_text
+from app.models.resume import Resume
+from app.services.cache import ReadThroughCache, create_cache_backend
+from app.services.pagination import encode_cursor, decode_cursor, parse_limit, keyset_condition
 
 # Create a model for Job
 from flask_sqlalchemy import SQLAlchemy
 from app import db
 
 
-# Create a Blueprint for the job routes
-job_bp = Blueprint('job_bp', __name__)
+# Create a Blueprint for the job routes (CLI commands run as `flask --app run jobs <command>`)
+job_bp = Blueprint('job_bp', __name__, cli_group='jobs')
 
-# Enable CORS for the job_bp Blueprint
-CORS(job_bp)
+# Enable CORS for the job_bp Blueprint (exposing the pagination and ETag headers to the frontend)
+CORS(job_bp, expose_headers=['X-Next-Cursor', 'ETag'])
+
+# Statuses an employer can set on an application
+VALID_APPLICATION_STATUSES = ['pending', 'invited', 'rejected']
+
+# Sort orders accepted by the applicant listing: name -> (column, descending)
+APPLICATION_SORTS = {
+    'id': (JobApplication.id, False),
+    'applied_at': (JobApplication.applied_at, False),
+    '-applied_at': (JobApplication.applied_at, True),
+    'status': (db.func.coalesce(JobApplication.status, ''), False),
+    # Applicants whose user row is gone have no name; sort them as '' so keyset paging keeps them
+    'name': (db.func.coalesce(User.name, ''), False),
+    '-name': (db.func.coalesce(User.name, ''), True),
+}
+
+# Convert a job to the JSON shape used by the public job endpoints
+def _serialize_job(job):
+    return {
+        'id': job.id,
+        'employer_id': job.employer_id,
+        'title': job.title,
+        'company': job.company,
+        'location': job.location,
+        'job_type': job.job_type,
+        'salary': job.salary,
+        'description': job.description,
+        'requirements': job.requirements,
+        'created_at': job.created_at.isoformat(),
+        'updated_at': job.updated_at.isoformat() if job.updated_at else None
+    }
+
+# Load every active job for a full (re)build of the search index
+def _load_searchable_jobs():
+    return Job.query.filter_by(is_active=True).yield_per(500)
+
+def _ensure_search_index():
+    job_search_index.ensure_built(_load_searchable_jobs)
+
+# Only the displayed columns and popularity are needed to (re)build autocomplete
+def _load_autocomplete_rows():
+    return (
+        db.session.query(Job.id, Job.title, Job.company, Job.location, Job.application_count)
+        .filter(Job.is_active == True)
+        .yield_per(1000)
+    )
+
+# Only the text columns are needed to (re)build the duplicate index
+def _load_dedup_rows():
+    return (
+        db.session.query(Job.id, Job.employer_id, Job.description, Job.requirements)
+        .filter(Job.is_active == True)
+        .yield_per(1000)
+    )
+
+# Only the facet columns are needed to (re)build the facet counts
+def _load_facet_rows():
+    return (
+        db.session.query(Job.id, Job.job_type, Job.location, Job.company)
+        .filter(Job.is_active == True)
+        .yield_per(1000)
+    )
+
+# Read-through cache for the public job endpoints, created on first use
+_job_cache = None
+
+def _get_job_cache():
+    global _job_cache
+    if _job_cache is None:
+        backend = create_cache_backend(
+            current_app.config.get('JOB_CACHE_URL', 'memory://'),
+            max_entries=current_app.config.get('JOB_CACHE_MAX_ENTRIES', 1024)
+        )
+        _job_cache = ReadThroughCache(backend, 'jobs', ttl=current_app.config.get('JOB_CACHE_TTL_SECONDS', 60))
+    return _job_cache
+
+def _job_cache_enabled():
+    return current_app.config.get('JOB_CACHE_ENABLED', True)
+
+# Normalize listing parameters so equivalent requests share a cache entry
+def _job_list_cache_params():
+    params = {}
+    for name in ('q', 'title', 'location'):
+        value = ' '.join(request.args.get(name, '').lower().split())
+        if value:
+            params[name] = value
+    for name in ('job_type', 'limit', 'cursor', 'facets'):
+        value = request.args.get(name, '').strip()
+        if value:
+            params[name] = value
+    return params
+
+# One-shot backfill/repair of the denormalized application counters
+@job_bp.cli.command('repair-application-counts')
+def repair_application_counts_command():
+    fixed = repair_application_counts()
+    print(f"Repaired application_count on {fixed} job(s)")
+
+# Drop all derived job state after bulk writes that bypass the ORM; indexes rebuild lazily
+def _reset_job_indexes():
+    job_search_index.clear()
+    job_matcher.clear()
+    job_facet_index.clear()
+    job_autocomplete_index.clear()
+    job_duplicate_index.clear()
+    if _job_cache_enabled():
+        _get_job_cache().bump('list')
+
+# Bulk-import jobs from a CSV or NDJSON file for the given employer
+@job_bp.cli.command('import')
+@click.argument('path', type=click.Path(exists=True, dir_okay=False))
+@click.option('--employer-id', type=int, required=True, help='Employer that will own the imported jobs')
+@click.option('--format', 'fmt', type=click.Choice(job_import.FORMATS), help='Input format (defaults to the file extension)')
+@click.option('--batch-size', type=int, default=None, help='Rows per executemany batch')
+def import_jobs_command(path, employer_id, fmt, batch_size):
+    fmt = fmt or ('csv' if path.lower().endswith('.csv') else 'ndjson')
+    with open(path, 'rb') as f:
+        report = job_import.import_jobs(
+            job_import.iter_rows(f, fmt),
+            employer_id,
+            batch_size or current_app.config.get('JOB_IMPORT_BATCH_SIZE', 500)
+        )
+    _reset_job_indexes()
+    print(json.dumps(report.to_dict(), indent=2))
+
+# Find near-duplicate active jobs across the whole table and optionally deactivate them
+@job_bp.cli.command('dedupe')
+@click.option('--deactivate', is_flag=True, help='Deactivate all but one job in each duplicate group')
+def dedupe_jobs_command(deactivate):
+    job_duplicate_index.rebuild(_load_dedup_rows())
+    groups = job_duplicate_index.clusters()
+    report = []
+    deactivated = []
+    for group in groups:
+        # Keep the posting with the most applications, then the oldest
+        jobs = Job.query.filter(Job.id.in_(group)).all()
+        keep = min(jobs, key=lambda job: (-(job.application_count or 0), job.id))
+        duplicates = [job.id for job in jobs if job.id != keep.id]
+        report.append({'keep': keep.id, 'duplicates': duplicates})
+        deactivated.extend(duplicates)
+    if deactivate and deactivated:
+        Job.query.filter(Job.id.in_(deactivated)).update(
+            {Job.is_active: False, Job.updated_at: datetime.utcnow()},
+            synchronize_session=False
+        )
+        db.session.commit()
+        _reset_job_indexes()
+    print(json.dumps({'groups': report, 'deactivated': deactivated if deactivate else []}, indent=2))
+
+# Keep the in-memory job indexes in sync after a committed write
+def _sync_job_indexes(job=None, deleted_job_id=None):
+    if deleted_job_id is not None:
+        job_search_index.remove_job(deleted_job_id)
+        job_matcher.remove_job(deleted_job_id)
+        job_facet_index.remove_job(deleted_job_id)
+        job_autocomplete_index.remove_job(deleted_job_id)
+        job_duplicate_index.remove_job(deleted_job_id)
+    if job is not None:
+        job_search_index.add_job(job)
+        job_matcher.add_job(job)
+        job_facet_index.add_job(job)
+        job_autocomplete_index.add_job(job)
+        job_duplicate_index.add_job(job)
+    if _job_cache_enabled():
+        # Any write can change listings; only the written job's detail entry is invalidated
+        job_cache = _get_job_cache()
+        job_cache.bump('list')
+        job_cache.bump(f'job:{deleted_job_id if job is None else job.id}')
+
+# Serialize jobs one per line for Accept: application/x-ndjson responses
+def _stream_jobs(jobs, scores=None):
+    try:
+        for job in jobs:
+            job_data = _serialize_job(job)
+            if scores is not None:
+                job_data['score'] = round(scores[job.id], 4)
+            yield json.dumps(job_data) + '\n'
+    except Exception as e:
+        # Headers are already sent, so the error can only be logged
+        current_app.logger.error(f"Error streaming jobs: {str(e)}")
+
+def _wants_ndjson():
+    best = request.accept_mimetypes.best_match(['application/json', 'application/x-ndjson'])
+    return best == 'application/x-ndjson'
 
 # Get all jobs with optional filters
+#
+# Results are ordered by (created_at, id) descending, or by relevance when q= is given.
+# title=, location= and q= are matched through the search index and return at most
+# SEARCH_MAX_RESULTS jobs (after job_type is applied).
+# With facets=true the body becomes {"jobs": [...], "facets": {...}}.
+# Pass limit= to page through them; the cursor for the next page is returned in the
+# X-Next-Cursor header and is passed back as cursor=. With Accept: application/x-ndjson
+# the rows are streamed one JSON object per line, read from the database in chunks.
 @job_bp.route('/api/jobs', methods=['GET'])
 def get_jobs():
     try:
         # Get query parameters for filtering
+        q = request.args.get('q', '').strip()
         title = request.args.get('title')
         location = request.args.get('location')
         job_type = request.args.get('job_type')
         
+        # Get pagination parameters
+        try:
+            limit = parse_limit(request.args.get('limit'), current_app.config.get('JOBS_PAGE_MAX_LIMIT', 100))
+            cursor = decode_cursor(request.args.get('cursor'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        stream = _wants_ndjson()
+        include_facets = not stream and request.args.get('facets', '').lower() in ('1', 'true', 'yes')
+        if stream:
+            empty_response = Response('', mimetype='application/x-ndjson')
+        elif include_facets:
+            empty_response = jsonify({'jobs': [], 'facets': job_facet_index.facets(job_ids=())})
+        else:
+            empty_response = jsonify([])
+        
+        # Serve JSON listings from the cache; streamed responses always hit the database
+        cache_key = None
+        if not stream and _job_cache_enabled():
+            job_cache = _get_job_cache()
+            cache_key = job_cache.key('list', job_cache.version('list'), _job_list_cache_params())
+            cached = job_cache.get(cache_key)
+            if cached is not None:
+                response = Response(cached['body'], mimetype='application/json')
+                if cached.get('next_cursor'):
+                    response.headers['X-Next-Cursor'] = cached['next_cursor']
+                return response
+        
         # Start with base query
         query = Job.query.filter_by(is_active=True)
         
-        # Apply filters if provided
-        if title:
-            query = query.filter(Job.title.ilike(f'%{title}%'))
-        if location:
-            query = query.filter(Job.location.ilike(f'%{location}%'))
+        # Title/location filters and q= are resolved through the in-memory search index,
+        # so the database is only asked for a bounded list of candidate IDs
+        max_results = current_app.config.get('SEARCH_MAX_RESULTS', 100)
+        candidate_ids = None
+        if q or title or location:
+            _ensure_search_index()
+        for field, value in (('title', title), ('location', location)):
+            if not value:
+                continue
+            matched = job_search_index.match_all(field, value)
+            if matched is None:
+                # Nothing indexable in the filter (e.g. only punctuation), fall back to a substring match
+                query = query.filter(getattr(Job, field).ilike(f'%{value}%'))
+                continue
+            candidate_ids = matched if candidate_ids is None else candidate_ids & matched
+        
+        scores = None
+        facet_ids = candidate_ids
+        if q:
+            ranked = job_search_index.search(q)
+            if candidate_ids is not None:
+                ranked = [(job_id, score) for job_id, score in ranked if job_id in candidate_ids]
+            facet_ids = {job_id for job_id, _ in ranked}
+            scores = dict(ranked)
+            candidate_ids = [job_id for job_id, _ in ranked]
+        elif candidate_ids is not None:
+            # Newest first; IDs are assigned in created_at order
+            candidate_ids = sorted(candidate_ids, reverse=True)
+        
+        if include_facets or (job_type and candidate_ids is not None):
+            job_facet_index.ensure_built(_load_facet_rows)
+        
+        # Facet counts cover every job matched by the text filters, before job_type and paging
+        facets = None
+        if include_facets:
+            facets = job_facet_index.facets(job_ids=facet_ids)
+        
+        if candidate_ids is not None:
+            # Apply job_type before the cap, so the cap only counts jobs that can be returned
+            if job_type:
+                type_ids = job_facet_index.job_ids('job_type', job_type)
+                candidate_ids = [job_id for job_id in candidate_ids if job_id in type_ids]
+            candidate_ids = candidate_ids[:max_results]
+            if not candidate_ids:
+                return empty_response
+            query = query.filter(Job.id.in_(candidate_ids))
         if job_type:
             query = query.filter(Job.job_type == job_type)
         
         # Execute query and get results
-        jobs = query.order_by(Job.created_at.desc()).all()
+        next_cursor = None
+        if scores is not None:
+            # Relevance order for free-text searches, keyed on (score, id)
+            if cursor:
+                try:
+                    after = (-float(cursor[0]), -int(cursor[1]))
+                except (TypeError, ValueError):
+                    return jsonify({'error': 'Invalid cursor'}), 400
+            jobs = sorted(query.all(), key=lambda job: (-scores[job.id], -job.id))
+            if cursor:
+                jobs = [job for job in jobs if (-scores[job.id], -job.id) > after]
+            if limit and len(jobs) > limit:
+                jobs = jobs[:limit]
+                next_cursor = encode_cursor(scores[jobs[-1].id], jobs[-1].id)
+        else:
+            query = query.order_by(Job.created_at.desc(), Job.id.desc())
+            if cursor:
+                try:
+                    cursor_created_at = datetime.fromisoformat(cursor[0])
+                    cursor_id = int(cursor[1])
+                except (TypeError, ValueError):
+                    return jsonify({'error': 'Invalid cursor'}), 400
+                query = query.filter(keyset_condition(Job.created_at, Job.id, cursor_created_at, cursor_id, descending=True))
+            if stream:
+                if limit:
+                    query = query.limit(limit)
+                jobs = query.yield_per(current_app.config.get('JOBS_STREAM_CHUNK_SIZE', 500))
+            else:
+                if limit:
+                    # Fetch one extra row to know whether another page exists
+                    query = query.limit(limit + 1)
+                jobs = query.all()
+                if limit and len(jobs) > limit:
+                    jobs = jobs[:limit]
+                    next_cursor = encode_cursor(jobs[-1].created_at.isoformat(), jobs[-1].id)
+        
+        if stream:
+            return Response(stream_with_context(_stream_jobs(jobs, scores)), mimetype='application/x-ndjson')
         
         # Convert to JSON
         jobs_list = []
         for job in jobs:
-            jobs_list.append({
-                'id': job.id,
-                'employer_id': job.employer_id,
-                'title': job.title,
-                'company': job.company,
-                'location': job.location,
-                'job_type': job.job_type,
-                'salary': job.salary,
-                'description': job.description,
-                'requirements': job.requirements,
-                'created_at': job.created_at.isoformat(),
-                'updated_at': job.updated_at.isoformat() if job.updated_at else None
-            })
+            job_data = _serialize_job(job)
+            if scores is not None:
+                job_data['score'] = round(scores[job.id], 4)
+            jobs_list.append(job_data)
         
-        return jsonify(jobs_list)
+        response = jsonify({'jobs': jobs_list, 'facets': facets} if include_facets else jobs_list)
+        if next_cursor:
+            response.headers['X-Next-Cursor'] = next_cursor
+        if cache_key:
+            _get_job_cache().set(cache_key, {
+                'body': response.get_data(as_text=True),
+                'next_cursor': next_cursor
+            })
+        return response
     except Exception as e:
         current_app.logger.error(f"Error getting jobs: {str(e)}")
         return jsonify({'error': f'Error getting jobs: {str(e)}'}), 500
@@ -70,29 +380,111 @@ def get_jobs():
 @job_bp.route('/api/jobs/<int:job_id>', methods=['GET'])
 def get_job(job_id):
     try:
+        cache_key = None
+        if _job_cache_enabled():
+            job_cache = _get_job_cache()
+            cache_key = job_cache.key('detail', job_cache.version(f'job:{job_id}'), {'id': job_id})
+            cached = job_cache.get(cache_key)
+            if cached is not None:
+                return jsonify(cached)
+        
         job = Job.query.get(job_id)
         if not job:
             return jsonify({'error': 'Job not found'}), 404
         
-        job_data = {
-            'id': job.id,
-            'employer_id': job.employer_id,
-            'title': job.title,
-            'company': job.company,
-            'location': job.location,
-            'job_type': job.job_type,
-            'salary': job.salary,
-            'description': job.description,
-            'requirements': job.requirements,
-            'created_at': job.created_at.isoformat(),
-            'updated_at': job.updated_at.isoformat() if job.updated_at else None
-        }
+        job_data = _serialize_job(job)
+        if cache_key:
+            _get_job_cache().set(cache_key, job_data)
         
         return jsonify(job_data)
     except Exception as e:
         current_app.logger.error(f"Error getting job: {str(e)}")
         return jsonify({'error': f'Error getting job: {str(e)}'}), 500
 
+# Rank active jobs by fit with the current employee's resume (requires employee authentication)
+@job_bp.route('/api/employee/job-matches', methods=['GET'])
+@jwt_required()
+def get_job_matches():
+    try:
+        # Get the current user's ID from JWT
+        current_user_id = get_jwt_identity()
+        if not isinstance(current_user_id, str):
+            return jsonify({"msg": "Subject must be a string"}), 422
+        
+        try:
+            k = parse_limit(request.args.get('k'), current_app.config.get('MATCH_MAX_RESULTS', 50), default=10)
+        except ValueError as e:
+            return jsonify({'error': str(e).replace('limit', 'k')}), 400
+        
+        resume = Resume.query.filter_by(employee_id=int(current_user_id)).first()
+        if not resume:
+            return jsonify({'error': 'No resume found for this user'}), 404
+        
+        # Score the resume against the whole catalog in memory, then load only the top-k jobs
+        job_matcher.ensure_built(_load_searchable_jobs)
+        skills, text = resume_profile(resume)
+        matches = job_matcher.match(skills, text, k=k)
+        if not matches:
+            return jsonify([])
+        jobs = {job.id: job for job in Job.query.filter(Job.id.in_([job_id for job_id, _, _ in matches]), Job.is_active == True).all()}
+        
+        jobs_list = []
+        for job_id, score, matched_skills in matches:
+            job = jobs.get(job_id)
+            if not job:
+                continue
+            job_data = _serialize_job(job)
+            job_data['match_score'] = round(score, 4)
+            job_data['matched_skills'] = matched_skills
+            jobs_list.append(job_data)
+        
+        return jsonify(jobs_list)
+    except Exception as e:
+        current_app.logger.error(f"Error matching jobs: {str(e)}")
+        return jsonify({'error': f'Error matching jobs: {str(e)}'}), 500
+
+# Prefix suggestions for the job search box, served from memory
+@job_bp.route('/api/jobs/autocomplete', methods=['GET'])
+def autocomplete_jobs():
+    try:
+        prefix = request.args.get('prefix', '')
+        field = request.args.get('field') or None
+        if field and field not in AUTOCOMPLETE_FIELDS:
+            return jsonify({'error': f'Invalid field. Must be one of: {", ".join(AUTOCOMPLETE_FIELDS)}'}), 400
+        try:
+            limit = parse_limit(request.args.get('limit'), current_app.config.get('AUTOCOMPLETE_MAX_LIMIT', 20), default=10)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        job_autocomplete_index.ensure_built(_load_autocomplete_rows)
+        return jsonify(job_autocomplete_index.suggest(prefix, field=field, limit=limit))
+    except Exception as e:
+        current_app.logger.error(f"Error getting autocomplete suggestions: {str(e)}")
+        return jsonify({'error': f'Error getting autocomplete suggestions: {str(e)}'}), 500
+
+# Facet counts (job_type, location, company) over all active jobs
+@job_bp.route('/api/jobs/facets', methods=['GET'])
+def get_job_facets():
+    try:
+        try:
+            limit = parse_limit(request.args.get('limit'), current_app.config.get('JOBS_PAGE_MAX_LIMIT', 100), default=20)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        job_facet_index.ensure_built(_load_facet_rows)
+        return jsonify(job_facet_index.facets(limit=limit))
+    except Exception as e:
+        current_app.logger.error(f"Error getting job facets: {str(e)}")
+        return jsonify({'error': f'Error getting job facets: {str(e)}'}), 500
+
+# Hit/miss counters of this worker's job cache, used to size it
+@job_bp.route('/api/jobs/cache-stats', methods=['GET'])
+def get_job_cache_stats():
+    if not _job_cache_enabled():
+        return jsonify({'enabled': False})
+    stats = _get_job_cache().stats()
+    stats['enabled'] = True
+    return jsonify(stats)
+
 # Create a new job (requires employer authentication)
 @job_bp.route('/api/jobs', methods=['POST'])
 @jwt_required()
@@ -116,6 +508,16 @@ def create_job():
             missing_fields = [field for field in required_fields if field not in data]
             return jsonify({'error': f'Missing required fields: {", ".join(missing_fields)}'}), 400
         
+        # Look for near-duplicates of this posting before creating it
+        job_duplicate_index.ensure_built(_load_dedup_rows)
+        signature = minhash_signature(job_text(data['description'], data.get('requirements', '')))
+        duplicates = job_duplicate_index.find_duplicates(signature, employer_id=int(current_user_id))
+        if duplicates and current_app.config.get('DUPLICATE_JOB_POLICY') == 'reject' and not data.get('allow_duplicate'):
+            return jsonify({
+                'error': 'A near-duplicate of this job already exists',
+                'duplicate_of': [job_id for job_id, _ in duplicates]
+            }), 409
+        
         # Create a new job
         job = Job(
             employer_id=int(current_user_id),
@@ -131,16 +533,69 @@ def create_job():
         # Add to database
         db.session.add(job)
         db.session.commit()
+        _sync_job_indexes(job=job)
         
-        return jsonify({
+        response = {
             'message': 'Job created successfully',
             'id': job.id
-        }), 201
+        }
+        if duplicates:
+            response['duplicate_of'] = [job_id for job_id, _ in duplicates]
+        return jsonify(response), 201
     except Exception as e:
         db.session.rollback()
         current_app.logger.error(f"Error creating job: {str(e)}")
         return jsonify({'error': f'Error creating job: {str(e)}'}), 500
 
+# Bulk-import jobs (requires employer authentication)
+#
+# The body is CSV (with a header row) or NDJSON, sent raw or as a multipart "file" upload.
+# Rows are parsed and inserted incrementally in batches, and the response lists the rows
+# that failed validation or insertion without aborting the rest of the import.
+@job_bp.route('/api/jobs/import', methods=['POST'])
+@jwt_required()
+def import_jobs():
+    try:
+        # Get the current user's ID from JWT
+        current_user_id = get_jwt_identity()
+        if not isinstance(current_user_id, str):
+            return jsonify({"msg": "Subject must be a string"}), 422
+        
+        # Check if the user is an employer
+        user = User.query.get(current_user_id)
+        if not user or user.role != 'employer':
+            return jsonify({'error': 'Only employers can import jobs'}), 403
+        
+        # Work out where the data comes from and in which format
+        fmt = request.args.get('format')
+        if 'file' in request.files:
+            upload = request.files['file']
+            stream = upload.stream
+            filename = (upload.filename or '').lower()
+            fmt = fmt or ('csv' if filename.endswith('.csv') else 'ndjson')
+        else:
+            stream = request.stream
+            fmt = fmt or ('csv' if request.mimetype in ('text/csv', 'application/csv') else 'ndjson')
+        if fmt not in job_import.FORMATS:
+            return jsonify({'error': f'Invalid format. Must be one of: {", ".join(job_import.FORMATS)}'}), 400
+        
+        try:
+            batch_size = int(request.args.get('batch_size', current_app.config.get('JOB_IMPORT_BATCH_SIZE', 500)))
+        except ValueError:
+            return jsonify({'error': 'batch_size must be an integer'}), 400
+        if batch_size < 1:
+            return jsonify({'error': 'batch_size must be a positive integer'}), 400
+        
+        report = job_import.import_jobs(job_import.iter_rows(stream, fmt), int(current_user_id), batch_size)
+        if report.inserted:
+            _reset_job_indexes()
+        
+        return jsonify(report.to_dict())
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error importing jobs: {str(e)}")
+        return jsonify({'error': f'Error importing jobs: {str(e)}'}), 500
+
 # Update an existing job (requires employer authentication)
 @job_bp.route('/api/jobs/<int:job_id>', methods=['PUT'])
 @jwt_required()
@@ -185,6 +640,7 @@ def update_job(job_id):
         
         # Commit changes
         db.session.commit()
+        _sync_job_indexes(job=job)
         
         return jsonify({
             'message': 'Job updated successfully',
@@ -217,6 +673,7 @@ def delete_job(job_id):
         # Delete job
         db.session.delete(job)
         db.session.commit()
+        _sync_job_indexes(deleted_job_id=job_id)
         
         return jsonify({'message': 'Job deleted successfully'})
     except Exception as e:
@@ -234,7 +691,7 @@ def get_employer_jobs():
         if not isinstance(current_user_id, str):
             return jsonify({"msg": "Subject must be a string"}), 422
         
-        # Get all jobs for this employer
+        # Get all jobs for this employer; application counts come from the maintained counter column
         jobs = Job.query.filter_by(employer_id=int(current_user_id)).order_by(Job.created_at.desc()).all()
         
         # Convert to JSON
@@ -252,7 +709,7 @@ def get_employer_jobs():
                 'created_at': job.created_at.isoformat(),
                 'updated_at': job.updated_at.isoformat() if job.updated_at else None,
                 'is_active': job.is_active,
-                'application_count': JobApplication.query.filter_by(job_id=job.id).count()
+                'application_count': job.application_count or 0
             })
         
         return jsonify(jobs_list)
@@ -323,8 +780,16 @@ def apply_for_job(job_id):
             resume_file=resume_file_path
         )
         
-        # Add to database
+        # Add to database and bump the job's counter atomically in the same transaction.
+        # updated_at is set to itself so the counter does not count as an edit of the posting.
         db.session.add(application)
+        Job.query.filter_by(id=job_id).update(
+            {
+                Job.application_count: db.func.coalesce(Job.application_count, 0) + 1,
+                Job.updated_at: Job.updated_at,
+            },
+            synchronize_session=False
+        )
         db.session.commit()
         
         return jsonify({
@@ -395,19 +860,63 @@ def get_job_applications(job_id):
         if int(current_user_id) != job.employer_id:
             return jsonify({'error': 'You can only view applications for your own jobs'}), 403
         
-        # Get all applications for this job
-        applications = JobApplication.query.filter_by(job_id=job_id).all()
+        # Get filter, sort and pagination parameters
+        sort = request.args.get('sort', 'id')
+        if sort not in APPLICATION_SORTS:
+            return jsonify({'error': f'Invalid sort. Must be one of: {", ".join(APPLICATION_SORTS)}'}), 400
+        sort_column, descending = APPLICATION_SORTS[sort]
+        try:
+            limit = parse_limit(request.args.get('limit'), current_app.config.get('JOBS_PAGE_MAX_LIMIT', 100))
+            cursor = decode_cursor(request.args.get('cursor'))
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # Get applications together with the applicant's name and email in one query
+        query = (
+            db.session.query(JobApplication, User.name, User.email)
+            .outerjoin(User, User.id == JobApplication.employee_id)
+            .filter(JobApplication.job_id == job_id)
+        )
+        statuses = [status.strip() for status in request.args.get('status', '').split(',') if status.strip()]
+        if statuses:
+            query = query.filter(JobApplication.status.in_(statuses))
+        if cursor:
+            try:
+                cursor_value = datetime.fromisoformat(cursor[0]) if sort.endswith('applied_at') else cursor[0]
+                cursor_id = int(cursor[1])
+            except (TypeError, ValueError):
+                return jsonify({'error': 'Invalid cursor'}), 400
+            query = query.filter(keyset_condition(sort_column, JobApplication.id, cursor_value, cursor_id, descending))
+        
+        order = sort_column.desc() if descending else sort_column.asc()
+        id_order = JobApplication.id.desc() if descending else JobApplication.id.asc()
+        query = query.order_by(order, id_order) if sort != 'id' else query.order_by(id_order)
+        if limit:
+            # Fetch one extra row to know whether another page exists
+            query = query.limit(limit + 1)
+        rows = query.all()
+        
+        next_cursor = None
+        if limit and len(rows) > limit:
+            rows = rows[:limit]
+            last_application, last_name, _ = rows[-1]
+            last_value = {
+                'id': last_application.id,
+                'applied_at': last_application.applied_at.isoformat(),
+                'status': last_application.status or '',
+                'name': last_name or '',
+            }[sort.lstrip('-')]
+            next_cursor = encode_cursor(last_value, last_application.id)
         
         # Convert to JSON with employee details
         applications_list = []
-        for application in applications:
-            employee = User.query.get(application.employee_id)
+        for application, employee_name, employee_email in rows:
             applications_list.append({
                 'id': application.id,
                 'job_id': application.job_id,
                 'employee_id': application.employee_id,
-                'employee_name': employee.name if employee else 'Unknown',
-                'employee_email': employee.email if employee else '',
+                'employee_name': employee_name if employee_name is not None else 'Unknown',
+                'employee_email': employee_email or '',
                 'status': application.status,
                 'applied_at': application.applied_at.isoformat(),
                 'updated_at': application.updated_at.isoformat() if application.updated_at else None,
@@ -415,11 +924,65 @@ def get_job_applications(job_id):
                 'has_resume_file': bool(application.resume_file)  
             })
         
-        return jsonify(applications_list)
+        response = jsonify(applications_list)
+        if next_cursor:
+            response.headers['X-Next-Cursor'] = next_cursor
+        return response
     except Exception as e:
         current_app.logger.error(f"Error getting job applications: {str(e)}")
         return jsonify({'error': f'Error getting job applications: {str(e)}'}), 500
 
+# Rank all applicants for a job by fit with the posting (requires employer authentication)
+@job_bp.route('/api/jobs/<int:job_id>/applications/ranked', methods=['GET'])
+@jwt_required()
+def get_ranked_job_applications(job_id):
+    try:
+        # Get the current user's ID from JWT
+        current_user_id = get_jwt_identity()
+        if not isinstance(current_user_id, str):
+            return jsonify({"msg": "Subject must be a string"}), 422
+        
+        # Find the job
+        job = Job.query.get(job_id)
+        if not job:
+            return jsonify({'error': 'Job not found'}), 404
+        
+        # Check if the user is the employer who created this job
+        if int(current_user_id) != job.employer_id:
+            return jsonify({'error': 'You can only view applications for your own jobs'}), 403
+        
+        # Load every application with the applicant's resume and contact details in one query
+        rows = (
+            db.session.query(JobApplication, Resume, User.name, User.email)
+            .outerjoin(Resume, Resume.employee_id == JobApplication.employee_id)
+            .outerjoin(User, User.id == JobApplication.employee_id)
+            .filter(JobApplication.job_id == job_id)
+            .all()
+        )
+        
+        job_matcher.ensure_built(_load_searchable_jobs)
+        ranked = rank_applications(job, rows, current_app.config.get('UPLOAD_FOLDER'))
+        
+        applications_list = []
+        for (application, resume, employee_name, employee_email), scores in ranked:
+            applications_list.append({
+                'id': application.id,
+                'job_id': application.job_id,
+                'employee_id': application.employee_id,
+                'employee_name': employee_name if employee_name is not None else 'Unknown',
+                'employee_email': employee_email or '',
+                'status': application.status,
+                'applied_at': application.applied_at.isoformat(),
+                'has_resume': resume is not None,
+                'has_resume_file': bool(application.resume_file),
+                **scores
+            })
+        
+        return jsonify(applications_list)
+    except Exception as e:
+        current_app.logger.error(f"Error ranking job applications: {str(e)}")
+        return jsonify({'error': f'Error ranking job applications: {str(e)}'}), 500
+
 # Get all applications by the current employee
 @job_bp.route('/api/employee/applications', methods=['GET'])
 @jwt_required()
@@ -435,25 +998,75 @@ def get_employee_applications():
         if not user or user.role != 'employee':
             return jsonify({'error': 'Only employees can view their applications'}), 403
         
-        # Get all applications for this employee
-        applications = JobApplication.query.filter_by(employee_id=int(current_user_id)).all()
+        # Get filter and pagination parameters
+        statuses = [status.strip() for status in request.args.get('status', '').split(',') if status.strip()]
+        try:
+            limit = parse_limit(request.args.get('limit'), current_app.config.get('JOBS_PAGE_MAX_LIMIT', 100))
+            cursor = decode_cursor(request.args.get('cursor'), size=1)
+            after_id = int(cursor[0]) if cursor else None
+        except (TypeError, ValueError) as e:
+            return jsonify({'error': str(e)}), 400
+        
+        # The applications together with only the job columns that are returned
+        query = (
+            db.session.query(JobApplication, Job.title, Job.company, Job.location)
+            .outerjoin(Job, Job.id == JobApplication.job_id)
+            .filter(JobApplication.employee_id == int(current_user_id))
+        )
+        if statuses:
+            query = query.filter(JobApplication.status.in_(statuses))
+        
+        # Validator from one aggregate over the same rows, checked before they are fetched.
+        # Job.updated_at is left alone by application counter updates, so other
+        # applicants applying to the same jobs keep it unchanged.
+        summary = query.with_entities(
+            db.func.count(JobApplication.id),
+            db.func.count(Job.id),
+            db.func.max(JobApplication.id),
+            db.func.max(JobApplication.applied_at),
+            db.func.max(JobApplication.updated_at),
+            db.func.max(Job.updated_at)
+        ).one()
+        etag = hashlib.sha1(
+            repr((tuple(summary), sorted(statuses), limit, after_id)).encode('utf-8')
+        ).hexdigest()
+        if request.if_none_match.contains_weak(etag):
+            response = current_app.response_class(status=304)
+            response.set_etag(etag, weak=True)
+            return response
+        
+        if after_id is not None:
+            query = query.filter(JobApplication.id > after_id)
+        query = query.order_by(JobApplication.id)
+        if limit:
+            # Fetch one extra row to know whether another page exists
+            query = query.limit(limit + 1)
+        rows = query.all()
+        
+        next_cursor = None
+        if limit and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1][0].id)
         
         applications_list = []
-        for application in applications:
-            job = Job.query.get(application.job_id)
+        for application, job_title, company, location in rows:
             applications_list.append({
                 'id': application.id,
                 'job_id': application.job_id,
-                'job_title': job.title if job else 'Unknown',
-                'company': job.company if job else '',
-                'location': job.location if job else '',
+                'job_title': job_title if job_title is not None else 'Unknown',
+                'company': company or '',
+                'location': location or '',
                 'status': application.status,
                 'applied_at': application.applied_at.isoformat(),
                 'updated_at': application.updated_at.isoformat() if application.updated_at else None,
                 'has_resume_file': bool(application.resume_file) 
             })
         
-        return jsonify(applications_list)
+        response = jsonify(applications_list)
+        response.set_etag(etag, weak=True)
+        if next_cursor:
+            response.headers['X-Next-Cursor'] = next_cursor
+        return response
     except Exception as e:
         current_app.logger.error(f"Error getting employee applications: {str(e)}")
         return jsonify({'error': f'Error getting employee applications: {str(e)}'}), 500
@@ -488,9 +1101,8 @@ def update_application_status(application_id):
         if not data or 'status' not in data:
             return jsonify({'error': 'Status is required'}), 400
         
-        valid_statuses = ['pending', 'invited', 'rejected']
-        if data['status'] not in valid_statuses:
-            return jsonify({'error': f'Invalid status. Must be one of: {", ".join(valid_statuses)}'}), 400
+        if data['status'] not in VALID_APPLICATION_STATUSES:
+            return jsonify({'error': f'Invalid status. Must be one of: {", ".join(VALID_APPLICATION_STATUSES)}'}), 400
         
         # Update status
         application.status = data['status']
@@ -507,4 +1119,87 @@ def update_application_status(application_id):
     except Exception as e:
         db.session.rollback()
         current_app.logger.error(f"Error updating application status: {str(e)}")
-        return jsonify({'error': f'Error updating application status: {str(e)}'}), 500
\ No newline at end of file
+        return jsonify({'error': f'Error updating application status: {str(e)}'}), 500
+
+# Update the status of many applications at once (requires employer authentication)
+#
+# Expects {"updates": [{"application_id": 1, "status": "invited"}, ...]} and reports a
+# result per item. Ownership is checked for the whole batch in one query and all valid
+# items are written with a single UPDATE ... WHERE id IN (...) in one transaction.
+@job_bp.route('/api/applications/status', methods=['PATCH'])
+@jwt_required()
+def bulk_update_application_status():
+    try:
+        # Get the current user's ID from JWT
+        current_user_id = get_jwt_identity()
+        if not isinstance(current_user_id, str):
+            return jsonify({"msg": "Subject must be a string"}), 422
+        
+        data = request.json
+        updates = data.get('updates') if isinstance(data, dict) else None
+        if not isinstance(updates, list) or not updates:
+            return jsonify({'error': 'updates must be a non-empty list'}), 400
+        
+        max_items = current_app.config.get('BULK_STATUS_MAX_ITEMS', 1000)
+        if len(updates) > max_items:
+            return jsonify({'error': f'At most {max_items} updates are allowed per request'}), 400
+        
+        # Validate the items before touching the database
+        results = []
+        requested = {}
+        for item in updates:
+            application_id = item.get('application_id') if isinstance(item, dict) else None
+            status = item.get('status') if isinstance(item, dict) else None
+            result = {'application_id': application_id, 'status': status, 'updated': False}
+            results.append(result)
+            if not isinstance(application_id, int) or isinstance(application_id, bool):
+                result['error'] = 'application_id must be an integer'
+            elif status not in VALID_APPLICATION_STATUSES:
+                result['error'] = f'Invalid status. Must be one of: {", ".join(VALID_APPLICATION_STATUSES)}'
+            elif application_id in requested:
+                result['error'] = 'Duplicate application_id in request'
+            else:
+                requested[application_id] = result
+        
+        # Check ownership of every requested application in one query
+        owners = {}
+        if requested:
+            rows = (
+                db.session.query(JobApplication.id, Job.employer_id)
+                .outerjoin(Job, Job.id == JobApplication.job_id)
+                .filter(JobApplication.id.in_(list(requested)))
+                .all()
+            )
+            owners = {application_id: employer_id for application_id, employer_id in rows}
+        
+        allowed = {}
+        for application_id, result in requested.items():
+            if application_id not in owners:
+                result['error'] = 'Application not found'
+            elif owners[application_id] != int(current_user_id):
+                result['error'] = 'You can only update applications for your own jobs'
+            else:
+                allowed[application_id] = result['status']
+        
+        # Apply all permitted changes with a single UPDATE
+        if allowed:
+            JobApplication.query.filter(JobApplication.id.in_(list(allowed))).update(
+                {
+                    JobApplication.status: case(allowed, value=JobApplication.id),
+                    JobApplication.updated_at: datetime.utcnow()
+                },
+                synchronize_session=False
+            )
+            db.session.commit()
+            for application_id in allowed:
+                requested[application_id]['updated'] = True
+        
+        return jsonify({
+            'updated': len(allowed),
+            'failed': len(results) - len(allowed),
+            'results': results
+        })
+    except Exception as e:
+        db.session.rollback()
+        current_app.logger.error(f"Error updating application statuses: {str(e)}")
+        return jsonify({'error': f'Error updating application statuses: {str(e)}'}), 500
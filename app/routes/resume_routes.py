@@ -3,6 +3,7 @@ from app import db
 from app.models.resume import Resume
 from app.models.user import User
 from app.AI.resume_builder import create_resume_pdf
+from app.services.resume_pdf_cache import resume_pdf_cache
 import json
 import os
 from datetime import datetime
@@ -13,8 +14,8 @@ from flask_cors import CORS
 # Create a Blueprint for the 'resume' routes
 resume_bp = Blueprint('resume_bp', __name__)
 
-# Enable CORS for the 'resume_bp' Blueprint
-CORS(resume_bp)
+# Enable CORS for the 'resume_bp' Blueprint (exposing ETag for cached PDF downloads)
+CORS(resume_bp, expose_headers=['ETag'])
 
 # Get resume by employee ID
 @resume_bp.route('/api/resumes/employee/<int:employee_id>', methods=['GET'])
@@ -128,8 +129,18 @@ def update_resume(resume_id):
         current_app.logger.error(f"Error updating resume: {str(e)}")
         return jsonify({'error': f'Error updating resume: {str(e)}'}), 500
 
-# Update only the download_resume_pdf function to match the expected parameters
+# Build the PDF download response, with an ETag when the PDF cache is enabled
+def _pdf_response(pdf_content, name, etag=None):
+    response = make_response(pdf_content)
+    response.headers.set('Content-Type', 'application/pdf')
+    response.headers.set('Content-Disposition', f'attachment; filename="{name.replace(" ", "_")}_resume.pdf"')
+    if etag:
+        # Clients may keep the PDF but must revalidate it with If-None-Match
+        response.set_etag(etag)
+        response.headers.set('Cache-Control', 'private, no-cache')
+    return response
 
+# Update only the download_resume_pdf function to match the expected parameters
 @resume_bp.route('/api/resumes/<int:resume_id>/pdf', methods=['GET'])
 def download_resume_pdf(resume_id):
     try:
@@ -143,8 +154,23 @@ def download_resume_pdf(resume_id):
         if not user:
             return jsonify({'error': 'User not found'}), 404
         
+        # The key hashes the resume contents and doubles as the ETag, so clients
+        # holding the current PDF get a 304 and cached PDFs skip rendering
+        etag = resume_pdf_cache.key_for(resume, user) if resume_pdf_cache else None
+        if etag and request.if_none_match.contains(etag):
+            response = current_app.response_class(status=304)
+            response.set_etag(etag)
+            return response
+        
         # Parse JSON data from database
         contact_data = json.loads(resume.contact) if resume.contact else {}
+        # Use name from contact data or user name as fallback
+        name = contact_data.get('name', user.name)
+        
+        pdf_content = resume_pdf_cache.get(etag) if etag else None
+        if pdf_content is not None:
+            return _pdf_response(pdf_content, name, etag)
+        
         education_data = json.loads(resume.education) if resume.education else []
         experience_data = json.loads(resume.experiences) if resume.experiences else []
         certifications_data = json.loads(resume.certifications) if resume.certifications else []
@@ -152,8 +178,6 @@ def download_resume_pdf(resume_id):
         skills_data = json.loads(resume.skills) if resume.skills else []
         
         # Extract the required fields for create_resume_pdf
-        # Use name from contact data or user name as fallback
-        name = contact_data.get('name', user.name)
         # Get social media links
         social_media1 = contact_data.get('linkedin', '')
         social_media2 = contact_data.get('github', '')
@@ -180,12 +204,10 @@ def download_resume_pdf(resume_id):
             phone=contact_data.get('phone', '')
         )
         
-        # Prepare response
-        response = make_response(pdf_content)
-        response.headers.set('Content-Type', 'application/pdf')
-        response.headers.set('Content-Disposition', f'attachment; filename="{name.replace(" ", "_")}_resume.pdf"')
+        if etag:
+            resume_pdf_cache.set(etag, pdf_content)
         
-        return response
+        return _pdf_response(pdf_content, name, etag)
     except Exception as e:
         current_app.logger.error(f"Error generating PDF: {str(e)}")
         return jsonify({'error': f'Error generating PDF: {str(e)}'}), 500
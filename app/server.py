@@ -1,9 +1,20 @@
-from flask import Flask, Blueprint, render_template, request, jsonify, Response, make_response
+from flask import Flask, Blueprint, render_template, request, jsonify, Response, make_response, stream_with_context, current_app, url_for
 import os
+import json
+import math
 from dotenv import load_dotenv
-from app.AI.cover_letter_generator import generate_cover_letter  # Use app.AI instead of AI
-from app.AI.resume_polisher import polish_resume, create_resume_pdf  # Use app.AI instead of AI
-import PyPDF2
+from app.AI.cover_letter_generator import generate_cover_letter, stream_cover_letter  # Use app.AI instead of AI
+from app.AI.resume_polisher import polish_resume, stream_polished_resume, create_resume_pdf  # Use app.AI instead of AI
+from app.AI.llm_cache import llm_cache
+from app.AI.llm_client import upstream
+from app.AI.llm_metrics import llm_metrics
+from app.AI.errors import LLMError
+from app.AI.prompt_compression import compression_stats
+from app import db
+from app.models.ai_task import AITask
+from app.models.job import Job
+from app.services.ai_tasks import ai_task_queue, QueueFullError
+from app.services.cover_letter_batch import generate_cover_letters
 from werkzeug.utils import secure_filename
 import tempfile
 from flask_cors import CORS
@@ -11,11 +22,72 @@ from flask_cors import CORS
 # Load environment variables
 load_dotenv()
 
-ai_bp = Blueprint("ai_bp", __name__)
+# Create a Blueprint for the AI routes (CLI commands run as `flask --app run ai <command>`)
+ai_bp = Blueprint("ai_bp", __name__, cli_group='ai')
 
 # Enable cross-origin requests (CORS)
 CORS(ai_bp)
 
+def _flag(data, name):
+    # Boolean option from the JSON body or the query string, e.g. fresh=true
+    value = data.get(name, request.args.get(name, ''))
+    if isinstance(value, str):
+        return value.lower() in ('1', 'true', 'yes')
+    return bool(value)
+
+def _wants_fresh(data):
+    # fresh=true bypasses the LLM response cache
+    return _flag(data, 'fresh')
+
+def _submit_task(kind, params, data):
+    # async=true queues the generation and returns a task to poll instead of the result
+    try:
+        task = ai_task_queue.submit(current_app._get_current_object(), kind, params, fresh=_wants_fresh(data))
+    except QueueFullError as e:
+        response = jsonify({'error': 'Too many pending AI tasks, try again later', 'detail': str(e)})
+        response.headers['Retry-After'] = '5'
+        return response, 503
+    response = jsonify(task.to_dict())
+    response.headers['Location'] = url_for('ai_bp.get_ai_task', task_id=task.id)
+    return response, 202
+
+def _llm_error_response(e):
+    # Upstream failures answer 429/502/503/504 (see app/AI/errors.py) instead of a generic 500
+    response = jsonify({'error': str(e), 'upstream_status': e.status_code})
+    if e.retry_after is not None:
+        response.headers['Retry-After'] = str(int(math.ceil(e.retry_after)))
+    return response, e.http_status
+
+def _sse_event(data, event=None):
+    message = f'event: {event}\n' if event else ''
+    return message + f'data: {json.dumps(data)}\n\n'
+
+def _sse_response(pieces):
+    # Pull the first piece before responding, so an upstream error that happens
+    # before any text was produced still gets a normal JSON error response
+    try:
+        first = next(pieces, None)
+    except LLMError as e:
+        return _llm_error_response(e)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+    def generate():
+        try:
+            if first is not None:
+                yield _sse_event({'delta': first})
+            for piece in pieces:
+                yield _sse_event({'delta': piece})
+            yield _sse_event({}, event='done')
+        except Exception as e:
+            yield _sse_event({'error': str(e), 'status': getattr(e, 'http_status', 500)}, event='error')
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @ai_bp.route('/api/generate-cover-letter', methods=['POST'])
 def cover_letter_api():
     data = request.json
@@ -28,17 +100,102 @@ def cover_letter_api():
     if not all([company_name, position_name, job_description, resume_content]):
         return jsonify({'error': 'Missing required fields'}), 400
     
+    if _flag(data, 'async'):
+        return _submit_task('cover_letter', {
+            'company_name': company_name,
+            'position_name': position_name,
+            'job_description': job_description,
+            'resume_content': resume_content
+        }, data)
+    
     try:
         cover_letter = generate_cover_letter(
             company_name, 
             position_name, 
             job_description, 
-            resume_content
+            resume_content,
+            fresh=_wants_fresh(data)
         )
         return jsonify({'cover_letter': cover_letter})
+    except LLMError as e:
+        return _llm_error_response(e)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+# Same as above, but the letter is streamed as Server-Sent Events while it is generated
+@ai_bp.route('/api/generate-cover-letter/stream', methods=['POST'])
+def cover_letter_stream_api():
+    data = request.json
+    
+    company_name = data.get('company_name', '')
+    position_name = data.get('position_name', '')
+    job_description = data.get('job_description', '')
+    resume_content = data.get('resume_content', '')
+    
+    if not all([company_name, position_name, job_description, resume_content]):
+        return jsonify({'error': 'Missing required fields'}), 400
+    
+    return _sse_response(stream_cover_letter(
+        company_name,
+        position_name,
+        job_description,
+        resume_content,
+        fresh=_wants_fresh(data)
+    ))
+
+# Generate cover letters for one resume and several jobs at once.
+#
+# Body: {"resume_content": "...", "job_ids": [1, 2, ...]}. The jobs are loaded in one
+# query and generated concurrently; each letter is sent as a "result" Server-Sent
+# Event as soon as it is ready (in completion order), followed by a "done" event.
+@ai_bp.route('/api/generate-cover-letters/batch', methods=['POST'])
+def cover_letter_batch_api():
+    data = request.json or {}
+    
+    resume_content = data.get('resume_content', '')
+    job_ids = data.get('job_ids')
+    
+    if not resume_content or not isinstance(job_ids, list) or not job_ids:
+        return jsonify({'error': 'resume_content and a non-empty job_ids list are required'}), 400
+    
+    try:
+        # Drop duplicates but keep the order the client asked for
+        job_ids = list(dict.fromkeys(int(job_id) for job_id in job_ids))
+    except (TypeError, ValueError):
+        return jsonify({'error': 'job_ids must be integers'}), 400
+    
+    max_jobs = current_app.config.get('COVER_LETTER_BATCH_MAX_JOBS', 20)
+    if len(job_ids) > max_jobs:
+        return jsonify({'error': f'At most {max_jobs} jobs can be requested at once'}), 400
+    
+    jobs_by_id = {job.id: job for job in Job.query.filter(Job.id.in_(job_ids)).all()}
+    jobs = [jobs_by_id[job_id] for job_id in job_ids if job_id in jobs_by_id]
+    missing = [job_id for job_id in job_ids if job_id not in jobs_by_id]
+    concurrency = current_app.config.get('COVER_LETTER_BATCH_CONCURRENCY', 4)
+    fresh = _wants_fresh(data)
+    
+    def generate():
+        succeeded = failed = 0
+        for job_id in missing:
+            failed += 1
+            yield _sse_event({'job_id': job_id, 'error': 'Job not found'}, event='result')
+        for job, cover_letter, error in generate_cover_letters(jobs, resume_content, concurrency, fresh=fresh):
+            result = {'job_id': job.id, 'company_name': job.company, 'position_name': job.title}
+            if error is None:
+                succeeded += 1
+                result['cover_letter'] = cover_letter
+            else:
+                failed += 1
+                result['error'] = error
+            yield _sse_event(result, event='result')
+        yield _sse_event({'succeeded': succeeded, 'failed': failed}, event='done')
+    
+    return Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+
 @ai_bp.route('/api/polish-resume', methods=['POST'])
 def resume_api():
     data = request.json
@@ -51,11 +208,21 @@ def resume_api():
     if not all([position_name, resume_content]):
         return jsonify({'error': 'Missing required fields'}), 400
     
+    if _flag(data, 'async'):
+        return _submit_task('polish_resume', {
+            'position_name': position_name,
+            'resume_content': resume_content,
+            'polish_prompt': polish_prompt,
+            'sectioned': _flag(data, 'sectioned')
+        }, data)
+    
     try:
         polished_resume = polish_resume(
             position_name,
             resume_content,
-            polish_prompt
+            polish_prompt,
+            fresh=_wants_fresh(data),
+            sectioned=_flag(data, 'sectioned')
         )
         
         if output_format == 'pdf':
@@ -66,9 +233,97 @@ def resume_api():
             })
         else:
             return jsonify({'polished_resume': polished_resume})
+    except LLMError as e:
+        return _llm_error_response(e)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@ai_bp.route('/api/polish-resume/stream', methods=['POST'])
+def resume_stream_api():
+    data = request.json
+    
+    position_name = data.get('position_name', '')
+    resume_content = data.get('resume_content', '')
+    polish_prompt = data.get('polish_prompt', '')
+    
+    if not all([position_name, resume_content]):
+        return jsonify({'error': 'Missing required fields'}), 400
+    
+    return _sse_response(stream_polished_resume(
+        position_name,
+        resume_content,
+        polish_prompt,
+        fresh=_wants_fresh(data)
+    ))
+
+# Poll a background task; wait=N (seconds, up to 30) holds the request until it finishes
+@ai_bp.route('/api/ai/tasks/<task_id>', methods=['GET'])
+def get_ai_task(task_id):
+    task = db.session.get(AITask, task_id)
+    if not task:
+        return jsonify({'error': 'Task not found'}), 404
+    
+    try:
+        wait = min(max(float(request.args.get('wait', 0)), 0), 30)
+    except ValueError:
+        return jsonify({'error': 'wait must be a number of seconds'}), 400
+    
+    if wait and not task.is_finished:
+        ai_task_queue.wait(task_id, wait)
+        db.session.refresh(task)
+    
+    return jsonify(task.to_dict())
+
+@ai_bp.route('/api/ai/tasks/<task_id>', methods=['DELETE'])
+def cancel_ai_task(task_id):
+    task = db.session.get(AITask, task_id)
+    if not task:
+        return jsonify({'error': 'Task not found'}), 404
+    
+    if not ai_task_queue.cancel(task):
+        return jsonify({'error': f'Task already {task.status}', 'task': task.to_dict()}), 409
+    
+    return jsonify(task.to_dict())
+
+# Fail tasks abandoned by dead workers and delete expired ones (also done on submit, at most once a minute)
+@ai_bp.cli.command('cleanup-tasks')
+def cleanup_ai_tasks_command():
+    reaped = ai_task_queue.reap_stale()
+    purged = ai_task_queue.purge_finished()
+    print(f"Failed {reaped} stale task(s), deleted {purged} expired task(s)")
+
+@ai_bp.route('/api/ai/tasks', methods=['GET'])
+def ai_task_queue_stats():
+    return jsonify({
+        'pending': ai_task_queue.depth(),
+        'max_pending': ai_task_queue.max_pending,
+        'workers': ai_task_queue.max_workers
+    })
+
+@ai_bp.route('/api/ai/cache-stats', methods=['GET'])
+def ai_cache_stats():
+    if llm_cache is None:
+        return jsonify({'enabled': False})
+    stats = llm_cache.stats()
+    stats['enabled'] = True
+    return jsonify(stats)
+
+# Per-call LLM latency and token histograms in the Prometheus text format,
+# or as a JSON summary with approximate percentiles when format=json
+@ai_bp.route('/api/ai/metrics', methods=['GET'])
+def ai_metrics():
+    if request.args.get('format') == 'json':
+        return jsonify(llm_metrics.summary())
+    return Response(llm_metrics.render_prometheus(), mimetype='text/plain; version=0.0.4')
+
+@ai_bp.route('/api/ai/upstream-stats', methods=['GET'])
+def ai_upstream_stats():
+    return jsonify(upstream.stats())
+
+@ai_bp.route('/api/ai/prompt-stats', methods=['GET'])
+def ai_prompt_stats():
+    return jsonify(compression_stats.as_dict())
+
 @ai_bp.route('/api/download-resume-pdf', methods=['POST'])
 def download_resume_pdf():
     data = request.json
@@ -110,6 +365,7 @@ def extract_pdf_text():
             temp_name = temp.name
         
         # Extract text from PDF
+        import PyPDF2  # Only needed when a PDF is uploaded
         text = ''
         with open(temp_name, 'rb') as pdf_file:
             pdf_reader = PyPDF2.PdfReader(pdf_file)
@@ -0,0 +1,238 @@
+# Background execution of AI generation tasks on a bounded worker pool
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, wait as wait_futures
+from datetime import datetime, timedelta
+from config import Config
+from app import db
+from app.models.ai_task import AITask
+from app.AI.llm_client import complete
+from app.AI.cover_letter_generator import build_cover_letter_prompt
+from app.AI.resume_polisher import build_polish_prompt, polish_resume_sections
+
+
+def _run_cover_letter(params, fresh):
+    return complete(build_cover_letter_prompt(
+        params['company_name'],
+        params['position_name'],
+        params['job_description'],
+        params['resume_content']
+    ), fresh=fresh)
+
+
+def _run_polish_resume(params, fresh):
+    if params.get('sectioned'):
+        return polish_resume_sections(
+            params['position_name'],
+            params['resume_content'],
+            params.get('polish_prompt', ''),
+            fresh=fresh
+        )
+    return complete(build_polish_prompt(
+        params['position_name'],
+        params['resume_content'],
+        params.get('polish_prompt', '')
+    ), fresh=fresh)
+
+
+# Task kind -> function computing the result text from the stored params
+TASK_RUNNERS = {
+    'cover_letter': _run_cover_letter,
+    'polish_resume': _run_polish_resume,
+}
+
+
+class QueueFullError(Exception):
+    """The worker pool already holds the maximum number of pending tasks."""
+
+
+class AITaskQueue:
+    """
+    Runs AI tasks on a per-process thread pool, with their state kept in the
+    ``ai_tasks`` table so any worker process can answer a poll.
+
+    At most ``max_pending`` tasks may be queued or running in one process;
+    further submissions raise ``QueueFullError``. Cancelling a queued task
+    stops it from starting. A running task cannot interrupt its upstream
+    call, but its result is discarded.
+
+    Status changes are conditional UPDATEs on the expected current status, so
+    a cancel racing with a worker is never overwritten. Tasks left queued or
+    running by a worker process that died are failed after ``stale_seconds``,
+    and finished tasks are deleted after ``ttl_seconds``.
+    """
+
+    ACTIVE_STATUSES = ('queued', 'running')
+
+    def __init__(self, max_workers=4, max_pending=50, stale_seconds=1800, ttl_seconds=86400, cleanup_interval=60):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.stale_seconds = stale_seconds
+        self.ttl_seconds = ttl_seconds
+        self.cleanup_interval = cleanup_interval
+        self._last_cleanup = None
+        self._executor = None
+        self._executor_pid = None
+        self._futures = {}
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        # Threads do not survive a fork, so each worker process starts its own pool
+        if self._executor is None or self._executor_pid != os.getpid():
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='ai-task')
+            self._executor_pid = os.getpid()
+            self._futures = {}
+        return self._executor
+
+    def depth(self):
+        with self._lock:
+            return len(self._futures)
+
+    def submit(self, app, kind, params, fresh=False):
+        """Record a queued task and schedule it. Returns the new ``AITask``."""
+        if kind not in TASK_RUNNERS:
+            raise ValueError(f'Unknown task kind: {kind}')
+        self._maybe_cleanup()
+        with self._lock:
+            executor = self._get_executor()
+            if len(self._futures) >= self.max_pending:
+                raise QueueFullError(f'{len(self._futures)} tasks already pending')
+
+            task = AITask(id=uuid.uuid4().hex, kind=kind, status='queued', params=json.dumps(params))
+            db.session.add(task)
+            db.session.commit()
+
+            future = executor.submit(self._run, app, task.id, kind, params, fresh)
+            self._futures[task.id] = future
+        future.add_done_callback(lambda _, task_id=task.id: self._forget(task_id))
+        return task
+
+    def _forget(self, task_id):
+        with self._lock:
+            self._futures.pop(task_id, None)
+
+    def _transition(self, task_id, from_statuses, **values):
+        """Set ``values`` on the task only if its status is one of ``from_statuses``; True if it was."""
+        result = db.session.execute(
+            db.update(AITask)
+            .where(AITask.id == task_id, AITask.status.in_(from_statuses))
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        return result.rowcount == 1
+
+    def _run(self, app, task_id, kind, params, fresh):
+        with app.app_context():
+            try:
+                # Claim the task; fails if it was cancelled (or reaped) in the meantime
+                if not self._transition(task_id, ('queued',), status='running', started_at=datetime.utcnow()):
+                    return
+
+                try:
+                    result, error = TASK_RUNNERS[kind](params, fresh), None
+                except Exception as e:
+                    result, error = None, str(e)
+
+                # A no-op if the task was cancelled while it ran
+                self._transition(
+                    task_id, ('running',),
+                    status='failed' if error is not None else 'succeeded',
+                    result=result,
+                    error=error,
+                    finished_at=datetime.utcnow()
+                )
+            except Exception:
+                db.session.rollback()
+                raise
+            finally:
+                db.session.remove()
+
+    def cancel(self, task):
+        """Cancel a task that has not finished. Returns ``False`` if it already had."""
+        if task.is_finished:
+            return False
+        cancelled = self._transition(task.id, self.ACTIVE_STATUSES, status='cancelled', finished_at=datetime.utcnow())
+        db.session.refresh(task)
+        if not cancelled:
+            return False
+        with self._lock:
+            future = self._futures.get(task.id)
+        if future is not None:
+            future.cancel()
+        return True
+
+    def wait(self, task_id, timeout):
+        """Block up to ``timeout`` seconds for a task to finish (long polling)."""
+        with self._lock:
+            future = self._futures.get(task_id)
+        if future is not None:
+            wait_futures([future], timeout=timeout)
+            return
+        # Submitted by another process: poll the table until it finishes
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            task = db.session.get(AITask, task_id)
+            if task is None or task.is_finished:
+                return
+            db.session.expire(task)
+            time.sleep(0.5)
+
+    def reap_stale(self):
+        """
+        Fail tasks queued or running for longer than ``stale_seconds``.
+
+        Tasks this process still holds are left alone; any other task that old
+        belongs to a worker that died or was restarted. Returns the number failed.
+        """
+        cutoff = datetime.utcnow() - timedelta(seconds=self.stale_seconds)
+        with self._lock:
+            own = list(self._futures) if self._executor_pid == os.getpid() else []
+        query = (
+            db.update(AITask)
+            .where(
+                AITask.status.in_(self.ACTIVE_STATUSES),
+                db.func.coalesce(AITask.started_at, AITask.created_at) < cutoff
+            )
+            .values(status='failed', error='The worker running this task stopped', finished_at=datetime.utcnow())
+            .execution_options(synchronize_session=False)
+        )
+        if own:
+            query = query.where(AITask.id.notin_(own))
+        result = db.session.execute(query)
+        db.session.commit()
+        return result.rowcount
+
+    def purge_finished(self):
+        """Delete tasks that finished more than ``ttl_seconds`` ago. Returns the number deleted."""
+        cutoff = datetime.utcnow() - timedelta(seconds=self.ttl_seconds)
+        result = db.session.execute(
+            db.delete(AITask)
+            .where(AITask.status.in_(AITask.FINISHED_STATUSES), AITask.finished_at < cutoff)
+            .execution_options(synchronize_session=False)
+        )
+        db.session.commit()
+        return result.rowcount
+
+    def _maybe_cleanup(self):
+        # Piggybacks on submissions, at most once per cleanup_interval in each process
+        now = time.monotonic()
+        with self._lock:
+            if self._last_cleanup is not None and now - self._last_cleanup < self.cleanup_interval:
+                return
+            self._last_cleanup = now
+        self.reap_stale()
+        self.purge_finished()
+
+
+# Process-wide task queue used by the AI routes
+ai_task_queue = AITaskQueue(
+    max_workers=Config.AI_TASK_WORKERS,
+    max_pending=Config.AI_TASK_MAX_PENDING,
+    stale_seconds=Config.AI_TASK_STALE_SECONDS,
+    ttl_seconds=Config.AI_TASK_TTL_SECONDS,
+    cleanup_interval=Config.AI_TASK_CLEANUP_INTERVAL_SECONDS
+)
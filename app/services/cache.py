@@ -0,0 +1,201 @@
+# Read-through cache with pluggable storage backends
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+class MemoryCacheBackend:
+    """
+    In-process LRU cache with per-entry TTL.
+
+    Each gunicorn worker gets its own copy, so invalidations made by one worker
+    are only seen by the others once their entries expire.
+    """
+
+    name = 'memory'
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        # Counters are kept apart from the entries, in their own LRU of the same size.
+        # An evicted counter must never go back to a value it had before (entries
+        # stored under that version could be served again), so unknown counters
+        # start from the highest value evicted so far.
+        self._counters = OrderedDict()
+        self._counter_floor = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + ttl if ttl else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def get_counter(self, key):
+        with self._lock:
+            value = self._counters.get(key)
+            if value is None:
+                return self._counter_floor
+            self._counters.move_to_end(key)
+            return value
+
+    def incr(self, key):
+        with self._lock:
+            value = self._counters.get(key, self._counter_floor) + 1
+            self._counters[key] = value
+            self._counters.move_to_end(key)
+            while len(self._counters) > self.max_entries:
+                _, evicted = self._counters.popitem(last=False)
+                self._counter_floor = max(self._counter_floor, evicted)
+            return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def count(self, prefix, exclude=None):
+        """Number of entries whose key starts with ``prefix`` (minus those starting with ``exclude``)."""
+        with self._lock:
+            return sum(
+                1 for key in self._entries
+                if key.startswith(prefix) and not (exclude and key.startswith(exclude))
+            )
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class RedisCacheBackend:
+    """
+    Redis-backed cache shared by every worker process.
+
+    Redis enforces the TTL itself; size-based LRU eviction is left to the
+    server's ``maxmemory-policy allkeys-lru`` setting. Counters expire
+    ``counter_ttl`` seconds after their last increment; that must be well above
+    the entry TTL, so every entry stored under an expired counter's old values
+    is gone before the counter starts again from zero.
+    """
+
+    name = 'redis'
+
+    def __init__(self, url, counter_ttl=86400):
+        import redis  # Optional dependency, only needed for the shared backend
+        self._client = redis.Redis.from_url(url)
+        self.counter_ttl = counter_ttl
+
+    def get(self, key):
+        raw = self._client.get(key)
+        return json.loads(raw) if raw is not None else None
+
+    def set(self, key, value, ttl=None):
+        self._client.set(key, json.dumps(value), ex=ttl or None)
+
+    def delete(self, key):
+        self._client.delete(key)
+
+    def get_counter(self, key):
+        raw = self._client.get(key)
+        return int(raw) if raw is not None else 0
+
+    def incr(self, key):
+        pipeline = self._client.pipeline()
+        pipeline.incr(key)
+        pipeline.expire(key, self.counter_ttl)
+        return pipeline.execute()[0]
+
+    def count(self, prefix, exclude=None):
+        """Number of keys starting with ``prefix`` (minus those starting with ``exclude``). Scans the keyspace."""
+        total = 0
+        for key in self._client.scan_iter(match=f'{prefix}*', count=1000):
+            if exclude is None or not key.decode('utf-8').startswith(exclude):
+                total += 1
+        return total
+
+
+def create_cache_backend(url, max_entries=1024, counter_ttl=86400):
+    """Create a backend from a URL such as ``memory://`` or ``redis://localhost:6379/0``."""
+    if not url or url.startswith('memory://'):
+        return MemoryCacheBackend(max_entries=max_entries)
+    if url.startswith(('redis://', 'rediss://', 'unix://')):
+        return RedisCacheBackend(url, counter_ttl=counter_ttl)
+    raise ValueError(f'Unsupported cache URL: {url}')
+
+
+class ReadThroughCache:
+    """
+    Namespaced cache in front of a backend, with hit/miss accounting.
+
+    Invalidation is done by bumping version counters that are part of the
+    keys, so a reader that started before a write can never store its stale
+    result under the key that readers after the write will look up.
+    """
+
+    def __init__(self, backend, namespace, ttl=60):
+        self.backend = backend
+        self.namespace = namespace
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()
+
+    def _counter_key(self, name):
+        return f'{self.namespace}:v:{name}'
+
+    def version(self, name):
+        return self.backend.get_counter(self._counter_key(name))
+
+    def bump(self, name):
+        """Invalidate every key built with ``version(name)``."""
+        return self.backend.incr(self._counter_key(name))
+
+    def key(self, kind, version, params=None):
+        digest = ''
+        if params:
+            raw = json.dumps(params, sort_keys=True, separators=(',', ':'))
+            digest = ':' + hashlib.sha1(raw.encode('utf-8')).hexdigest()
+        return f'{self.namespace}:{kind}:{version}{digest}'
+
+    def get(self, key):
+        value = self.backend.get(key)
+        with self._stats_lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key, value):
+        self.backend.set(key, value, ttl=self.ttl)
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            'backend': self.backend.name,
+            'namespace': self.namespace,
+            'ttl_seconds': self.ttl,
+            # Keys in this namespace, leaving out the version counters
+            'entries': self.backend.count(f'{self.namespace}:', exclude=self._counter_key('')),
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / total, 4) if total else 0.0,
+        }
@@ -0,0 +1,96 @@
+# Ranking of a job's applicants against the job posting
+import hashlib
+import os
+from config import Config
+from app.services.cache import MemoryCacheBackend
+from app.services.job_matcher import job_matcher, resume_profile, SKILL_WEIGHT, JOB_FIELD_WEIGHTS
+
+# Scores per (matcher generation, job version, application, resume version), and text extracted from uploaded PDFs
+_score_cache = MemoryCacheBackend(max_entries=Config.CANDIDATE_SCORE_CACHE_SIZE)
+_pdf_text_cache = MemoryCacheBackend(max_entries=Config.CANDIDATE_SCORE_CACHE_SIZE)
+
+
+def extract_pdf_text(path):
+    """Extract the text of an uploaded resume PDF, cached by path and modification time."""
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return ''
+    key = f'{path}:{mtime}'
+    text = _pdf_text_cache.get(key)
+    if text is not None:
+        return text
+
+    import PyPDF2  # Only needed when an applicant uploaded a file
+    try:
+        with open(path, 'rb') as pdf_file:
+            reader = PyPDF2.PdfReader(pdf_file)
+            text = '\n'.join(page.extract_text() or '' for page in reader.pages)
+    except Exception:
+        text = ''
+    _pdf_text_cache.set(key, text)
+    return text
+
+
+def _job_version(job):
+    # Hash of the fields that feed the score, so changes such as a new application
+    # (or any other update that leaves them alone) keep the cached scores valid
+    raw = '\0'.join(getattr(job, field, None) or '' for field in JOB_FIELD_WEIGHTS)
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()
+
+
+def _score_key(generation, job, application, resume):
+    # The matcher generation pins the IDF weights the score was computed with
+    job_version = _job_version(job)
+    resume_version = ''
+    if resume is not None:
+        resume_version = f'{resume.id}:{resume.last_updated.isoformat() if resume.last_updated else ""}'
+    return f'{generation}:{job.id}:{job_version}:{application.id}:{application.resume_file or ""}:{resume_version}'
+
+
+def _candidate_text(application, resume, upload_folder):
+    parts = []
+    if resume is not None:
+        _, text = resume_profile(resume)
+        parts.append(text)
+    if application.resume_file and upload_folder:
+        parts.append(extract_pdf_text(os.path.join(upload_folder, application.resume_file)))
+    return '\n'.join(parts)
+
+
+def rank_applications(job, rows, upload_folder=None):
+    """
+    Rank applicants for ``job``.
+
+    ``rows`` is a list of ``(application, resume, *extra)`` tuples. Cached
+    scores are reused; the remaining candidates are scored together in one
+    vectorized pass. Every score comes from the same matcher snapshot, so
+    the list is never ranked on mixed IDF weights. Returns ``(row, scores)`` pairs sorted best first, where
+    ``scores`` holds the overall score and its components.
+    """
+    snapshot = job_matcher.snapshot()
+    results = []
+    pending = []
+    for row in rows:
+        application, resume = row[0], row[1]
+        key = _score_key(snapshot.generation, job, application, resume)
+        scores = _score_cache.get(key)
+        if scores is None:
+            pending.append((row, key))
+        else:
+            results.append((row, scores))
+
+    if pending:
+        texts = [_candidate_text(row[0], row[1], upload_folder) for row, _ in pending]
+        similarity, coverage = job_matcher.score_candidates(job, texts, snapshot)
+        for (row, key), sim, cov in zip(pending, similarity, coverage):
+            scores = {
+                'score': round(float((1 - SKILL_WEIGHT) * sim + SKILL_WEIGHT * cov), 4),
+                'similarity': round(float(sim), 4),
+                'requirement_coverage': round(float(cov), 4)
+            }
+            _score_cache.set(key, scores)
+            results.append((row, scores))
+
+    results.sort(key=lambda item: (-item[1]['score'], item[0][0].id))
+    return results
@@ -0,0 +1,39 @@
+# Concurrent cover letter generation for one resume across several jobs
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from app.AI.llm_client import complete
+from app.AI.cover_letter_generator import build_cover_letter_prompt
+
+
+def job_description_text(job):
+    """The posting text given to the model: description followed by requirements."""
+    if job.requirements:
+        return f"{job.description}\n\nRequirements:\n{job.requirements}"
+    return job.description
+
+
+def generate_cover_letters(jobs, resume_content, concurrency=4, fresh=False):
+    """
+    Generate a cover letter for each job, at most ``concurrency`` at a time.
+
+    Yields ``(job, cover_letter, error)`` in completion order, so the caller
+    can forward each result as soon as it is ready. Closing the generator
+    early cancels the generations that have not started yet.
+    """
+    if not jobs:
+        return
+    # Job attributes are read here, in the request thread, not in the workers
+    prompts = [
+        (job, build_cover_letter_prompt(job.company, job.title, job_description_text(job), resume_content))
+        for job in jobs
+    ]
+    executor = ThreadPoolExecutor(max_workers=max(1, min(concurrency, len(prompts))), thread_name_prefix='cover-letter')
+    try:
+        futures = {executor.submit(complete, prompt, fresh=fresh): job for job, prompt in prompts}
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                yield job, future.result(), None
+            except Exception as e:
+                yield job, None, str(e)
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
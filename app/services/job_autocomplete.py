@@ -0,0 +1,256 @@
+# Prefix autocomplete over job titles, companies and locations
+import bisect
+import heapq
+import threading
+import time
+from collections import OrderedDict
+from config import Config
+from app.services.job_facets import normalize_facet_value
+
+AUTOCOMPLETE_FIELDS = ('title', 'company', 'location')
+
+# Prefixes up to this length keep a popularity-sorted list of their values,
+# since the keys under them can cover a large part of the index
+SHORT_PREFIX = 2
+
+# Fields may grow this far past their cap before the least popular values are pruned
+PRUNE_SLACK = 1.1
+
+
+class _FieldIndex:
+    # Sorted array of (key, normalized value) pairs, one per word start in each value,
+    # so "dev" finds "Senior Python Developer" through its "developer" suffix key.
+    # One- and two-letter prefixes are answered from per-prefix value sets instead,
+    # ranked by weight on first use and re-ranked after a change to one of their values.
+
+    def __init__(self):
+        self.keys = []
+        self.weights = {}
+        self.labels = {}
+        self.short = {}
+        self._ranked = {}
+
+    @staticmethod
+    def suffix_keys(value):
+        keys = [value]
+        for i, char in enumerate(value):
+            if char == ' ' and i + 1 < len(value):
+                keys.append(value[i + 1:])
+        return keys
+
+    @classmethod
+    def short_prefixes(cls, value):
+        return {key[:n] for key in cls.suffix_keys(value) for n in range(1, SHORT_PREFIX + 1) if len(key) >= n}
+
+    def _changed(self, value):
+        # The value's weight or presence changed, so the ranking of its short prefixes is stale
+        for prefix in self.short_prefixes(value):
+            self._ranked.pop(prefix, None)
+
+    def add(self, value, label, weight):
+        self._changed(value)
+        if value in self.weights:
+            self.weights[value] += weight
+            return
+        self.weights[value] = weight
+        self.labels[value] = label
+        for key in self.suffix_keys(value):
+            bisect.insort(self.keys, (key, value))
+        for prefix in self.short_prefixes(value):
+            self.short.setdefault(prefix, set()).add(value)
+
+    def subtract(self, value, weight):
+        if value not in self.weights:
+            return
+        self._changed(value)
+        self.weights[value] -= weight
+        if self.weights[value] <= 0:
+            self.drop(value)
+
+    def load(self, weights, labels, max_values):
+        # Bulk (re)build: keep the most popular values and sort all keys once
+        if len(weights) > max_values:
+            keep = sorted(weights, key=weights.get, reverse=True)[:max_values]
+            weights = {value: weights[value] for value in keep}
+        self.weights = weights
+        self.labels = {value: labels[value] for value in weights}
+        self.keys = sorted((key, value) for value in weights for key in self.suffix_keys(value))
+        self.short = {}
+        self._ranked = {}
+        for value in weights:
+            for prefix in self.short_prefixes(value):
+                self.short.setdefault(prefix, set()).add(value)
+
+    def prune(self, max_values):
+        self.load(self.weights, self.labels, max_values)
+
+    def drop(self, value):
+        self._changed(value)
+        self.weights.pop(value, None)
+        self.labels.pop(value, None)
+        for key in self.suffix_keys(value):
+            index = bisect.bisect_left(self.keys, (key, value))
+            if index < len(self.keys) and self.keys[index] == (key, value):
+                del self.keys[index]
+        for prefix in self.short_prefixes(value):
+            values = self.short.get(prefix)
+            if values is not None:
+                values.discard(value)
+                if not values:
+                    del self.short[prefix]
+
+    def lookup(self, prefix, limit):
+        """Up to ``limit`` values with a word starting with ``prefix``, most popular first."""
+        if len(prefix) <= SHORT_PREFIX:
+            ranked = self._ranked.get(prefix)
+            if ranked is None:
+                ranked = self._ranked[prefix] = sorted(
+                    self.short.get(prefix, ()), key=lambda value: (-self.weights[value], value)
+                )
+            return ranked[:limit]
+        matches = set()
+        for index in range(bisect.bisect_left(self.keys, (prefix,)), len(self.keys)):
+            key, value = self.keys[index]
+            if not key.startswith(prefix):
+                break
+            matches.add(value)
+        return heapq.nsmallest(limit, matches, key=lambda value: (-self.weights[value], value))
+
+
+class JobAutocompleteIndex:
+    """
+    Popularity-weighted prefix index over distinct job field values.
+
+    A value's weight is the number of active jobs carrying it plus the
+    applications those jobs had when indexed. Each field keeps at most
+    ``max_values`` distinct values; the least popular ones are pruned in a
+    batch once the cap is exceeded by ``PRUNE_SLACK``. Results for recently
+    used prefixes are memoized until the next write.
+    """
+
+    def __init__(self, refresh_seconds=300, max_values=50000, cache_size=1024):
+        self.refresh_seconds = refresh_seconds
+        self.max_values = max_values
+        self.cache_size = cache_size
+        self._lock = threading.RLock()
+        self._built_at = None
+        self._reset()
+
+    def _reset(self):
+        self._fields = {field: _FieldIndex() for field in AUTOCOMPLETE_FIELDS}
+        self._doc_values = {}
+        self._results = OrderedDict()
+
+    def __len__(self):
+        return len(self._doc_values)
+
+    def is_stale(self):
+        if self._built_at is None:
+            return True
+        if not self.refresh_seconds:
+            return False
+        return time.monotonic() - self._built_at > self.refresh_seconds
+
+    def ensure_built(self, loader):
+        if not self.is_stale():
+            return
+        with self._lock:
+            if self.is_stale():
+                self.rebuild(loader())
+
+    def rebuild(self, jobs):
+        with self._lock:
+            self._reset()
+            weights = {field: {} for field in AUTOCOMPLETE_FIELDS}
+            labels = {field: {} for field in AUTOCOMPLETE_FIELDS}
+            for job in jobs:
+                weight = 1 + (getattr(job, 'application_count', None) or 0)
+                values = []
+                for field in AUTOCOMPLETE_FIELDS:
+                    raw = getattr(job, field, None)
+                    value = normalize_facet_value(raw)
+                    values.append(value)
+                    if value is not None:
+                        weights[field][value] = weights[field].get(value, 0) + weight
+                        labels[field].setdefault(value, ' '.join(raw.split()))
+                self._doc_values[job.id] = (tuple(values), weight)
+            for field in AUTOCOMPLETE_FIELDS:
+                self._fields[field].load(weights[field], labels[field], self.max_values)
+            self._built_at = time.monotonic()
+
+    def clear(self):
+        with self._lock:
+            self._reset()
+            self._built_at = None
+
+    def add_job(self, job):
+        with self._lock:
+            self._remove(job.id)
+            if job.is_active:
+                self._add(job)
+
+    def remove_job(self, job_id):
+        with self._lock:
+            self._remove(job_id)
+
+    def _add(self, job):
+        self._results.clear()
+        weight = 1 + (getattr(job, 'application_count', None) or 0)
+        values = []
+        for field in AUTOCOMPLETE_FIELDS:
+            raw = getattr(job, field, None)
+            value = normalize_facet_value(raw)
+            values.append(value)
+            if value is None:
+                continue
+            index = self._fields[field]
+            index.add(value, ' '.join(raw.split()), weight)
+            if len(index.weights) > self.max_values * PRUNE_SLACK:
+                index.prune(self.max_values)
+        self._doc_values[job.id] = (tuple(values), weight)
+
+    def _remove(self, job_id):
+        entry = self._doc_values.pop(job_id, None)
+        if entry is None:
+            return
+        self._results.clear()
+        values, weight = entry
+        for field, value in zip(AUTOCOMPLETE_FIELDS, values):
+            if value is not None:
+                self._fields[field].subtract(value, weight)
+
+    def suggest(self, prefix, field=None, limit=10):
+        """Return up to ``limit`` ``{'value', 'field', 'weight'}`` suggestions, most popular first."""
+        prefix = normalize_facet_value(prefix)
+        if not prefix:
+            return []
+        fields = (field,) if field else AUTOCOMPLETE_FIELDS
+        cache_key = (prefix, field, limit)
+        with self._lock:
+            cached = self._results.get(cache_key)
+            if cached is not None:
+                self._results.move_to_end(cache_key)
+                return cached
+
+            candidates = []
+            for name in fields:
+                index = self._fields[name]
+                for value in index.lookup(prefix, limit):
+                    candidates.append((index.weights[value], name, value))
+            candidates.sort(key=lambda item: (-item[0], item[2]))
+            suggestions = [
+                {'value': self._fields[name].labels[value], 'field': name, 'weight': weight}
+                for weight, name, value in candidates[:limit]
+            ]
+
+            self._results[cache_key] = suggestions
+            if len(self._results) > self.cache_size:
+                self._results.popitem(last=False)
+            return suggestions
+
+
+# Process-wide autocomplete index shared by the job routes
+job_autocomplete_index = JobAutocompleteIndex(
+    refresh_seconds=Config.SEARCH_INDEX_REFRESH_SECONDS,
+    max_values=Config.AUTOCOMPLETE_MAX_VALUES
+)
@@ -0,0 +1,193 @@
+# Near-duplicate job detection with MinHash signatures and an LSH index
+import re
+import threading
+import time
+import zlib
+import numpy as np
+from config import Config
+
+NUM_PERMUTATIONS = 128
+
+# 16 bands of 8 rows put the LSH S-curve midpoint at a Jaccard similarity of ~0.7
+NUM_BANDS = 16
+ROWS_PER_BAND = NUM_PERMUTATIONS // NUM_BANDS
+
+SHINGLE_SIZE = 3
+
+# Universal hashing (a * x + b) mod p with a prime just above 2**32, so every
+# intermediate value fits in uint64. The seed is fixed so that all worker
+# processes compute identical signatures.
+_PRIME = np.uint64(4294967311)
+_rng = np.random.RandomState(20240229)
+_A = _rng.randint(1, 2 ** 32 - 1, size=NUM_PERMUTATIONS, dtype=np.uint64)
+_B = _rng.randint(0, 2 ** 32 - 1, size=NUM_PERMUTATIONS, dtype=np.uint64)
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def job_text(description, requirements):
+    return f"{description or ''}\n{requirements or ''}"
+
+
+def shingles(text):
+    """Hashes of the overlapping word n-grams of ``text``."""
+    words = _WORD_RE.findall((text or '').lower())
+    if len(words) < SHINGLE_SIZE:
+        grams = [' '.join(words)] if words else []
+    else:
+        grams = [' '.join(words[i:i + SHINGLE_SIZE]) for i in range(len(words) - SHINGLE_SIZE + 1)]
+    return np.unique(np.fromiter((zlib.crc32(gram.encode('utf-8')) for gram in grams), dtype=np.uint64, count=len(grams)))
+
+
+def minhash_signature(text):
+    """MinHash signature of ``text`` as a uint32 array, or ``None`` if it has no words."""
+    hashes = shingles(text)
+    if not len(hashes):
+        return None
+    # (shingles x permutations) in one broadcast, then the minimum per permutation
+    permuted = (hashes[:, None] * _A[None, :] + _B[None, :]) % _PRIME
+    return permuted.min(axis=0).astype(np.uint32)
+
+
+def estimated_similarity(signature, other):
+    return float(np.count_nonzero(signature == other)) / NUM_PERMUTATIONS
+
+
+class JobDuplicateIndex:
+    """
+    LSH index over MinHash signatures of active jobs' description + requirements.
+
+    A lookup only hashes the signature's bands and compares against the jobs
+    sharing a bucket, so checking a new posting costs O(1) expected time
+    regardless of how many jobs exist.
+    """
+
+    def __init__(self, threshold=0.8, same_employer_only=True, refresh_seconds=300):
+        self.threshold = threshold
+        self.same_employer_only = same_employer_only
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.RLock()
+        self._built_at = None
+        self._reset()
+
+    def _reset(self):
+        self._buckets = [{} for _ in range(NUM_BANDS)]
+        self._signatures = {}
+        self._employers = {}
+
+    def __len__(self):
+        return len(self._signatures)
+
+    def is_stale(self):
+        if self._built_at is None:
+            return True
+        if not self.refresh_seconds:
+            return False
+        return time.monotonic() - self._built_at > self.refresh_seconds
+
+    def ensure_built(self, loader):
+        if not self.is_stale():
+            return
+        with self._lock:
+            if self.is_stale():
+                self.rebuild(loader())
+
+    def rebuild(self, jobs):
+        with self._lock:
+            self._reset()
+            for job in jobs:
+                self._add(job)
+            self._built_at = time.monotonic()
+
+    def clear(self):
+        with self._lock:
+            self._reset()
+            self._built_at = None
+
+    def add_job(self, job):
+        with self._lock:
+            self._remove(job.id)
+            if job.is_active:
+                self._add(job)
+
+    def remove_job(self, job_id):
+        with self._lock:
+            self._remove(job_id)
+
+    @staticmethod
+    def _band_keys(signature):
+        return [signature[i * ROWS_PER_BAND:(i + 1) * ROWS_PER_BAND].tobytes() for i in range(NUM_BANDS)]
+
+    def _add(self, job):
+        signature = minhash_signature(job_text(job.description, job.requirements))
+        if signature is None:
+            return
+        for band, key in enumerate(self._band_keys(signature)):
+            self._buckets[band].setdefault(key, set()).add(job.id)
+        self._signatures[job.id] = signature
+        self._employers[job.id] = job.employer_id
+
+    def _remove(self, job_id):
+        signature = self._signatures.pop(job_id, None)
+        self._employers.pop(job_id, None)
+        if signature is None:
+            return
+        for band, key in enumerate(self._band_keys(signature)):
+            bucket = self._buckets[band].get(key)
+            if bucket is None:
+                continue
+            bucket.discard(job_id)
+            if not bucket:
+                del self._buckets[band][key]
+
+    def find_duplicates(self, signature, employer_id=None, exclude_id=None):
+        """
+        Return ``[(job_id, similarity), ...]`` for indexed jobs whose estimated
+        Jaccard similarity to ``signature`` reaches the threshold, best first.
+        """
+        if signature is None:
+            return []
+        with self._lock:
+            candidates = set()
+            for band, key in enumerate(self._band_keys(signature)):
+                candidates.update(self._buckets[band].get(key, ()))
+            candidates.discard(exclude_id)
+            matches = []
+            for job_id in candidates:
+                if self.same_employer_only and employer_id is not None and self._employers.get(job_id) != employer_id:
+                    continue
+                similarity = estimated_similarity(signature, self._signatures[job_id])
+                if similarity >= self.threshold:
+                    matches.append((job_id, similarity))
+        matches.sort(key=lambda item: (-item[1], item[0]))
+        return matches
+
+    def clusters(self):
+        """Group every indexed job with its near-duplicates (batch mode). Returns lists of job IDs."""
+        with self._lock:
+            parent = {}
+
+            def find(job_id):
+                while parent.get(job_id, job_id) != job_id:
+                    parent[job_id] = parent.get(parent[job_id], parent[job_id])
+                    job_id = parent[job_id]
+                return job_id
+
+            for job_id, signature in self._signatures.items():
+                for other_id, _ in self.find_duplicates(signature, self._employers.get(job_id), exclude_id=job_id):
+                    root, other_root = find(job_id), find(other_id)
+                    if root != other_root:
+                        parent[max(root, other_root)] = min(root, other_root)
+
+            groups = {}
+            for job_id in self._signatures:
+                groups.setdefault(find(job_id), []).append(job_id)
+        return [sorted(group) for group in groups.values() if len(group) > 1]
+
+
+# Process-wide duplicate index shared by the job routes
+job_duplicate_index = JobDuplicateIndex(
+    threshold=Config.DUPLICATE_JOB_THRESHOLD,
+    same_employer_only=Config.DUPLICATE_JOB_SAME_EMPLOYER_ONLY,
+    refresh_seconds=Config.SEARCH_INDEX_REFRESH_SECONDS
+)
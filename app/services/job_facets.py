@@ -0,0 +1,147 @@
+# Incrementally maintained facet counts over active jobs
+import threading
+import time
+from collections import Counter
+from config import Config
+
+FACET_FIELDS = ('job_type', 'location', 'company')
+
+
+def normalize_facet_value(value):
+    """Case- and whitespace-insensitive key used to group facet values."""
+    if not value:
+        return None
+    normalized = ' '.join(value.split()).lower()
+    return normalized or None
+
+
+class JobFacetIndex:
+    """
+    Per-facet counters of active jobs, keyed on the normalized value.
+
+    Each job's facet values are remembered so an update or delete can
+    decrement exactly what it previously added. Counts for a subset of jobs
+    (e.g. the hits of a text search) are computed from that in-memory map
+    without touching the database.
+    """
+
+    def __init__(self, refresh_seconds=300):
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.RLock()
+        self._built_at = None
+        self._reset()
+
+    def _reset(self):
+        self._counts = {field: Counter() for field in FACET_FIELDS}
+        # Display label for each normalized value (the first spelling seen)
+        self._labels = {field: {} for field in FACET_FIELDS}
+        # Job IDs per normalized value, for filtering a candidate set without the database
+        self._docs = {field: {} for field in FACET_FIELDS}
+        self._doc_values = {}
+
+    def __len__(self):
+        return len(self._doc_values)
+
+    def is_stale(self):
+        if self._built_at is None:
+            return True
+        if not self.refresh_seconds:
+            return False
+        return time.monotonic() - self._built_at > self.refresh_seconds
+
+    def ensure_built(self, loader):
+        if not self.is_stale():
+            return
+        with self._lock:
+            if self.is_stale():
+                self.rebuild(loader())
+
+    def rebuild(self, jobs):
+        with self._lock:
+            self._reset()
+            for job in jobs:
+                self._add(job)
+            self._built_at = time.monotonic()
+
+    def clear(self):
+        with self._lock:
+            self._reset()
+            self._built_at = None
+
+    def add_job(self, job):
+        with self._lock:
+            self._remove(job.id)
+            if job.is_active:
+                self._add(job)
+
+    def remove_job(self, job_id):
+        with self._lock:
+            self._remove(job_id)
+
+    def _add(self, job):
+        values = []
+        for field in FACET_FIELDS:
+            raw = getattr(job, field, None)
+            key = normalize_facet_value(raw)
+            values.append(key)
+            if key is None:
+                continue
+            self._counts[field][key] += 1
+            self._labels[field].setdefault(key, ' '.join(raw.split()))
+            self._docs[field].setdefault(key, set()).add(job.id)
+        self._doc_values[job.id] = tuple(values)
+
+    def _remove(self, job_id):
+        values = self._doc_values.pop(job_id, None)
+        if values is None:
+            return
+        for field, key in zip(FACET_FIELDS, values):
+            if key is None:
+                continue
+            docs = self._docs[field].get(key)
+            if docs is not None:
+                docs.discard(job_id)
+                if not docs:
+                    del self._docs[field][key]
+            counts = self._counts[field]
+            counts[key] -= 1
+            if counts[key] <= 0:
+                del counts[key]
+                self._labels[field].pop(key, None)
+
+    def job_ids(self, field, value):
+        """Set of the IDs of active jobs whose ``field`` equals ``value`` once both are normalized."""
+        key = normalize_facet_value(value)
+        with self._lock:
+            return set(self._docs[field].get(key, ()))
+
+    def facets(self, job_ids=None, limit=20):
+        """
+        Return ``{field: [{'value': label, 'count': n}, ...]}`` sorted by count.
+
+        With ``job_ids`` the counts are restricted to those jobs, otherwise
+        the maintained totals for the whole catalog are used.
+        """
+        with self._lock:
+            if job_ids is None:
+                counts = {field: self._counts[field] for field in FACET_FIELDS}
+            else:
+                counts = {field: Counter() for field in FACET_FIELDS}
+                for job_id in job_ids:
+                    values = self._doc_values.get(job_id)
+                    if values is None:
+                        continue
+                    for field, key in zip(FACET_FIELDS, values):
+                        if key is not None:
+                            counts[field][key] += 1
+            return {
+                field: [
+                    {'value': self._labels[field].get(key, key), 'count': count}
+                    for key, count in counts[field].most_common(limit)
+                ]
+                for field in FACET_FIELDS
+            }
+
+
+# Process-wide facet counts shared by the job routes
+job_facet_index = JobFacetIndex(refresh_seconds=Config.SEARCH_INDEX_REFRESH_SECONDS)
@@ -0,0 +1,211 @@
+# Streaming bulk import of job postings from CSV or NDJSON
+import csv
+import io
+import json
+from datetime import datetime
+from sqlalchemy.exc import SQLAlchemyError
+from app import db
+from app.models.job import Job
+
+# Values allowed by the job_type CHECK constraint on the jobs table (see create_tables.py)
+JOB_TYPES = ('Full-time', 'Part-time', 'Contract', 'Remote')
+
+REQUIRED_FIELDS = ('title', 'company', 'description')
+OPTIONAL_FIELDS = ('location', 'job_type', 'salary', 'requirements')
+
+FORMATS = ('csv', 'ndjson')
+
+
+def _lines(stream):
+    # Line iterator over a text or binary stream (request bodies, uploads, files opened
+    # in 'rb'). Raw streams such as the WSGI input are buffered, since reading lines
+    # from them directly goes one byte at a time
+    if isinstance(stream, io.RawIOBase):
+        stream = io.BufferedReader(stream)
+    return iter(stream)
+
+
+def _text_lines(stream):
+    # Binary lines are decoded one at a time, so a bad byte fails on its own line
+    # instead of somewhere in an 8 KiB decoding chunk
+    for line in _lines(stream):
+        yield line.decode('utf-8') if isinstance(line, bytes) else line
+
+
+def _read_error(e):
+    return ValueError(f'Could not read the input: {e}')
+
+
+def iter_csv_rows(stream):
+    """
+    Yield ``(line_number, row)`` pairs from a CSV stream with a header row.
+
+    Input that is not UTF-8 or not valid CSV ends the stream with an error
+    row (a ``ValueError`` in place of the row); the rows before it are kept.
+    """
+    reader = csv.DictReader(_text_lines(stream))
+    while True:
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except UnicodeDecodeError as e:
+            # The line that failed to decode was never handed to the reader
+            yield reader.line_num + 1, _read_error(e)
+            return
+        except csv.Error as e:
+            yield reader.line_num, _read_error(e)
+            return
+        yield reader.line_num, row
+
+
+def iter_ndjson_rows(stream):
+    """
+    Yield ``(line_number, row)`` pairs from a newline-delimited JSON stream.
+
+    Lines that are not valid JSON, or not UTF-8 in a binary stream, are
+    yielded as ``ValueError`` rows and the stream goes on with the next line.
+    """
+    lines = _lines(stream)
+    line_number = 0
+    while True:
+        line_number += 1
+        try:
+            line = next(lines)
+        except StopIteration:
+            return
+        except UnicodeDecodeError as e:
+            # A text stream cannot resume after a decoding error
+            yield line_number, _read_error(e)
+            return
+        if isinstance(line, bytes):
+            try:
+                line = line.decode('utf-8')
+            except UnicodeDecodeError as e:
+                yield line_number, _read_error(e)
+                continue
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield line_number, ValueError(f'Invalid JSON: {e}')
+            continue
+        yield line_number, row
+
+
+def iter_rows(stream, fmt):
+    if fmt == 'csv':
+        return iter_csv_rows(stream)
+    if fmt == 'ndjson':
+        return iter_ndjson_rows(stream)
+    raise ValueError(f'Unsupported format: {fmt}. Must be one of: {", ".join(FORMATS)}')
+
+
+def validate_row(row):
+    """
+    Check a raw row against the Job model constraints.
+
+    Returns ``(values, errors)`` where ``values`` holds the cleaned column
+    values and ``errors`` is a list of messages (empty when the row is valid).
+    """
+    if isinstance(row, Exception):
+        return None, [str(row)]
+    if not isinstance(row, dict):
+        return None, ['Row must be an object']
+
+    values = {}
+    errors = []
+    for field in REQUIRED_FIELDS + OPTIONAL_FIELDS:
+        value = row.get(field)
+        if value is not None and not isinstance(value, str):
+            value = str(value)
+        value = value.strip() if value else None
+        if field in REQUIRED_FIELDS and not value:
+            errors.append(f'{field} is required')
+            continue
+        max_length = getattr(Job.__table__.c[field].type, 'length', None)
+        if value and max_length and len(value) > max_length:
+            errors.append(f'{field} must be at most {max_length} characters')
+            continue
+        values[field] = value
+
+    if values.get('job_type') and values['job_type'] not in JOB_TYPES:
+        errors.append(f'job_type must be one of: {", ".join(JOB_TYPES)}')
+    return values, errors
+
+
+class ImportReport:
+    def __init__(self):
+        self.rows = 0
+        self.inserted = 0
+        self.errors = []
+
+    def add_error(self, line_number, messages):
+        self.errors.append({'row': line_number, 'errors': messages})
+
+    def to_dict(self):
+        return {
+            'rows': self.rows,
+            'inserted': self.inserted,
+            'failed': len(self.errors),
+            'errors': self.errors
+        }
+
+
+def _flush(batch, report):
+    # Insert a batch with one executemany; if the database rejects it, fall back
+    # to row-by-row inserts so only the offending rows are reported
+    if not batch:
+        return
+    table = Job.__table__
+    try:
+        db.session.execute(table.insert(), [values for _, values in batch])
+        db.session.commit()
+        report.inserted += len(batch)
+        return
+    except SQLAlchemyError:
+        db.session.rollback()
+
+    for line_number, values in batch:
+        try:
+            db.session.execute(table.insert(), [values])
+            db.session.commit()
+            report.inserted += 1
+        except SQLAlchemyError as e:
+            db.session.rollback()
+            report.add_error(line_number, [str(getattr(e, 'orig', e))])
+
+
+def import_jobs(rows, employer_id, batch_size=500):
+    """
+    Validate and insert rows produced by ``iter_rows``.
+
+    Rows are consumed incrementally and written in batches of ``batch_size``,
+    so memory use is bounded by the batch size rather than the input size.
+    """
+    report = ImportReport()
+    batch = []
+    for line_number, row in rows:
+        report.rows += 1
+        values, errors = validate_row(row)
+        if errors:
+            report.add_error(line_number, errors)
+            continue
+        now = datetime.utcnow()
+        values.update(
+            employer_id=employer_id,
+            created_at=now,
+            updated_at=now,
+            is_active=True,
+            application_count=0
+        )
+        for field in OPTIONAL_FIELDS:
+            values.setdefault(field, None)
+        batch.append((line_number, values))
+        if len(batch) >= batch_size:
+            _flush(batch, report)
+            batch = []
+    _flush(batch, report)
+    return report
@@ -0,0 +1,314 @@
+# Offline resume-to-job matching over a sparse TF-IDF matrix of active jobs
+import json
+import threading
+import time
+from collections import namedtuple
+import numpy as np
+from scipy import sparse
+from config import Config
+from app.services.job_search import tokenize
+
+# Relative weight of each job field in the job's term vector
+JOB_FIELD_WEIGHTS = {
+    'title': 3.0,
+    'requirements': 2.0,
+    'description': 1.0,
+}
+
+# Share of the final score that comes from skill coverage when the resume lists skills
+SKILL_WEIGHT = 0.4
+
+# Materialized state of the matcher; ``generation`` changes whenever the IDF weights can
+MatcherSnapshot = namedtuple('MatcherSnapshot', ['generation', 'vocabulary', 'job_ids', 'tfidf', 'presence', 'idf'])
+
+
+def _loads(value, default):
+    if not value:
+        return default
+    try:
+        return json.loads(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def resume_profile(resume):
+    """
+    Flatten a Resume row into ``(skills, text)``.
+
+    ``skills`` is the list of skill strings and ``text`` concatenates the
+    free-text parts (skills, experience, projects, certifications, education)
+    used for the TF-IDF comparison.
+    """
+    skills = [skill for skill in _loads(resume.skills, []) if isinstance(skill, str) and skill.strip()]
+    parts = list(skills)
+    for experience in _loads(resume.experiences, []):
+        if isinstance(experience, dict):
+            parts.append(experience.get('position', ''))
+            parts.extend(experience.get('description', []) or [])
+    for project in _loads(resume.projects, []):
+        if isinstance(project, dict):
+            parts.append(project.get('name', ''))
+            parts.extend(project.get('description', []) or [])
+    parts.extend(cert for cert in _loads(resume.certifications, []) if isinstance(cert, str))
+    for education in _loads(resume.education, []):
+        if isinstance(education, dict):
+            parts.append(education.get('degree', ''))
+    return skills, '\n'.join(part for part in parts if isinstance(part, str))
+
+
+class JobMatcher:
+    """
+    Sparse TF-IDF model of every active job.
+
+    Each job's weighted term frequencies are kept per row, so adding,
+    updating or removing a job only touches that row and the document
+    frequencies. The CSR matrix itself is re-materialized with vectorized
+    NumPy operations on the first query after a change, because a new
+    document shifts the IDF of every column anyway.
+    """
+
+    def __init__(self, refresh_seconds=300):
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.RLock()
+        self._built_at = None
+        self._generation = 0
+        self._reset()
+
+    def _reset(self):
+        self._vocabulary = {}
+        self._df = np.zeros(0, dtype=np.int64)
+        self._rows = {}
+        self._snapshot = None
+
+    def __len__(self):
+        return len(self._rows)
+
+    def is_stale(self):
+        if self._built_at is None:
+            return True
+        if not self.refresh_seconds:
+            return False
+        return time.monotonic() - self._built_at > self.refresh_seconds
+
+    def ensure_built(self, loader):
+        if not self.is_stale():
+            return
+        with self._lock:
+            if self.is_stale():
+                self.rebuild(loader())
+
+    def rebuild(self, jobs):
+        with self._lock:
+            self._reset()
+            for job in jobs:
+                self._add(job)
+            self._built_at = time.monotonic()
+
+    def clear(self):
+        with self._lock:
+            self._reset()
+            self._built_at = None
+
+    def add_job(self, job):
+        with self._lock:
+            self._remove(job.id)
+            if job.is_active:
+                self._add(job)
+
+    def remove_job(self, job_id):
+        with self._lock:
+            self._remove(job_id)
+
+    def _column(self, term):
+        col = self._vocabulary.get(term)
+        if col is None:
+            col = self._vocabulary[term] = len(self._vocabulary)
+            if col >= len(self._df):
+                self._df = np.concatenate([self._df, np.zeros(max(1024, len(self._df)), dtype=np.int64)])
+        return col
+
+    def _add(self, job):
+        weights = {}
+        for field, weight in JOB_FIELD_WEIGHTS.items():
+            for term in tokenize(getattr(job, field, None)):
+                col = self._column(term)
+                weights[col] = weights.get(col, 0.0) + weight
+        if not weights:
+            return
+        cols = np.fromiter(weights.keys(), dtype=np.int32, count=len(weights))
+        vals = np.fromiter(weights.values(), dtype=np.float32, count=len(weights))
+        self._df[cols] += 1
+        self._rows[job.id] = (cols, vals)
+        self._snapshot = None
+
+    def _remove(self, job_id):
+        row = self._rows.pop(job_id, None)
+        if row is None:
+            return
+        self._df[row[0]] -= 1
+        self._snapshot = None
+
+    def snapshot(self):
+        """
+        The current ``MatcherSnapshot``: vocabulary, job ids, normalized TF-IDF CSR,
+        presence CSC and IDF of the indexed jobs.
+
+        The vocabulary dict is only ever appended to until the next rebuild, so
+        holding a snapshot keeps its column numbers consistent.
+        """
+        with self._lock:
+            if self._snapshot is not None:
+                return self._snapshot
+            self._generation += 1
+            job_ids = np.fromiter(self._rows.keys(), dtype=np.int64, count=len(self._rows))
+            n_cols = len(self._vocabulary)
+            if not len(job_ids):
+                self._snapshot = MatcherSnapshot(self._generation, self._vocabulary, job_ids, None, None, None)
+                return self._snapshot
+            rows = list(self._rows.values())
+            lengths = np.fromiter((len(cols) for cols, _ in rows), dtype=np.int64, count=len(rows))
+            indptr = np.concatenate([[0], np.cumsum(lengths)])
+            indices = np.concatenate([cols for cols, _ in rows])
+            data = np.concatenate([vals for _, vals in rows])
+            tf = sparse.csr_matrix((data, indices, indptr), shape=(len(job_ids), n_cols))
+
+            df = self._df[:n_cols]
+            idf = (np.log((1 + len(job_ids)) / (1 + df)) + 1).astype(np.float32)
+            tfidf = tf.multiply(idf).tocsr()
+            norms = np.sqrt(np.asarray(tfidf.multiply(tfidf).sum(axis=1)).ravel())
+            norms[norms == 0] = 1
+            tfidf = sparse.diags(1 / norms).dot(tfidf).tocsr()
+            presence = tf.tocsc()
+            presence.data[:] = 1
+            self._snapshot = MatcherSnapshot(self._generation, self._vocabulary, job_ids, tfidf, presence, idf)
+            return self._snapshot
+
+    def match(self, skills, text, k=10):
+        """
+        Score a resume against every indexed job in one sparse mat-vec product.
+
+        Returns up to ``k`` ``(job_id, score, matched_skills)`` tuples, best first.
+        """
+        _, vocabulary, job_ids, tfidf, presence, idf = self.snapshot()
+        if tfidf is None:
+            return []
+
+        # Resume vector in the job vocabulary; unknown terms cannot match any job
+        query = np.zeros(tfidf.shape[1], dtype=np.float32)
+        for term in tokenize(text):
+            col = vocabulary.get(term)
+            if col is not None and col < len(query):
+                query[col] += 1
+        query *= idf
+        norm = np.linalg.norm(query)
+        scores = tfidf.dot(query / norm) if norm else np.zeros(len(job_ids), dtype=np.float32)
+
+        # Fraction of the resume's skills whose every token appears in the job
+        skill_columns = []
+        for skill in skills:
+            cols = [vocabulary.get(term) for term in tokenize(skill)]
+            if cols and all(col is not None and col < presence.shape[1] for col in cols):
+                skill_columns.append((skill, cols))
+        if skills:
+            coverage = np.zeros(len(job_ids), dtype=np.float32)
+            for _, cols in skill_columns:
+                coverage += np.asarray(presence[:, cols].sum(axis=1)).ravel() == len(cols)
+            scores = (1 - SKILL_WEIGHT) * scores + SKILL_WEIGHT * coverage / len(skills)
+
+        k = min(k, len(job_ids))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+
+        results = []
+        for index in top:
+            score = float(scores[index])
+            if score <= 0:
+                break
+            matched = []
+            if skill_columns:
+                present = set(tfidf.indices[tfidf.indptr[index]:tfidf.indptr[index + 1]])
+                matched = [skill for skill, cols in skill_columns if present.issuperset(cols)]
+            results.append((int(job_ids[index]), score, matched))
+        return results
+
+    def score_candidates(self, job, texts, snapshot=None):
+        """
+        Score many candidate documents against one job in a single sparse product.
+
+        Vectors are built over the job's and the documents' own terms, weighted
+        with the IDF of ``snapshot`` (the current one by default). Terms the
+        catalog has not seen get the IDF of a term in no indexed job, so the job
+        does not need to be active or indexed. A candidate's score does not
+        depend on who else applied and can be cached per pair and snapshot
+        generation. Returns ``(similarity, coverage)`` arrays: the cosine
+        similarity to the job, and the share of the job's requirement terms
+        found in each document.
+        """
+        snapshot = snapshot or self.snapshot()
+        vocabulary, catalog_idf = snapshot.vocabulary, snapshot.idf
+        similarity = np.zeros(len(texts), dtype=np.float32)
+        coverage = np.zeros(len(texts), dtype=np.float32)
+        if not texts:
+            return similarity, coverage
+        default_idf = np.log(1 + len(snapshot.job_ids)) + 1
+
+        # Local columns for the terms of this job and its candidates, with their IDF
+        columns = {}
+        idf = []
+
+        def column(term):
+            col = columns.get(term)
+            if col is None:
+                col = columns[term] = len(columns)
+                catalog_col = vocabulary.get(term)
+                if catalog_idf is not None and catalog_col is not None and catalog_col < len(catalog_idf):
+                    idf.append(catalog_idf[catalog_col])
+                else:
+                    idf.append(default_idf)
+            return col
+
+        # Job vector and its requirement terms
+        job_weights = {}
+        for field, weight in JOB_FIELD_WEIGHTS.items():
+            for term in tokenize(getattr(job, field, None)):
+                col = column(term)
+                job_weights[col] = job_weights.get(col, 0.0) + weight
+        requirement_cols = np.array(
+            sorted({column(term) for term in tokenize(job.requirements or job.description)}), dtype=np.int64
+        )
+
+        # Candidate term-frequency matrix, one row per document
+        indptr = [0]
+        indices = []
+        data = []
+        for text in texts:
+            counts = {}
+            for term in tokenize(text):
+                col = column(term)
+                counts[col] = counts.get(col, 0) + 1
+            indices.extend(counts.keys())
+            data.extend(counts.values())
+            indptr.append(len(indices))
+        idf = np.array(idf, dtype=np.float32)
+        tf = sparse.csr_matrix(
+            (np.array(data, dtype=np.float32), np.array(indices, dtype=np.int64), np.array(indptr, dtype=np.int64)),
+            shape=(len(texts), len(idf))
+        )
+
+        job_vector = np.zeros(len(idf), dtype=np.float32)
+        job_vector[list(job_weights.keys())] = list(job_weights.values())
+        job_vector *= idf
+        job_norm = np.linalg.norm(job_vector)
+        if job_norm:
+            weighted = tf.multiply(idf).tocsr()
+            norms = np.sqrt(np.asarray(weighted.multiply(weighted).sum(axis=1)).ravel())
+            norms[norms == 0] = 1
+            similarity = weighted.dot(job_vector / job_norm) / norms
+        if len(requirement_cols):
+            present = tf[:, requirement_cols]
+            present.data[:] = 1
+            coverage = np.asarray(present.sum(axis=1)).ravel() / len(requirement_cols)
+        return similarity.astype(np.float32), coverage.astype(np.float32)
+
+# Process-wide matcher shared by the job routes
+job_matcher = JobMatcher(refresh_seconds=Config.SEARCH_INDEX_REFRESH_SECONDS)
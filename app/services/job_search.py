@@ -0,0 +1,252 @@
+# In-memory inverted index used to search job postings
+import math
+import re
+import threading
+import time
+from collections import Counter
+from config import Config
+
+# Fields indexed for free-text search and their relevance weights
+FIELD_WEIGHTS = {
+    'title': 3.0,
+    'company': 2.0,
+    'requirements': 1.0,
+    'description': 1.0,
+}
+
+# Location is indexed separately so it can be used as a token filter,
+# but it does not contribute to free-text relevance
+FILTER_FIELDS = ('title', 'location')
+
+STOP_WORDS = {
+    'a', 'an', 'and', 'are', 'as', 'at', 'be', 'by', 'for', 'from', 'in',
+    'is', 'it', 'of', 'on', 'or', 'that', 'the', 'to', 'was', 'will', 'with',
+}
+
+# BM25 tuning constants
+K1 = 1.2
+B = 0.75
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+# Ordered suffix rules for the light stemmer: (suffix, replacement, min stem length)
+_SUFFIX_RULES = (
+    ('ational', 'ate', 3),
+    ('ization', 'ize', 3),
+    ('iveness', 'ive', 3),
+    ('fulness', 'ful', 3),
+    ('ousness', 'ous', 3),
+    ('ments', '', 4),
+    ('ment', '', 4),
+    ('ings', '', 3),
+    ('ing', '', 3),
+    ('ies', 'y', 2),
+    ('ied', 'y', 2),
+    ('ers', '', 3),
+    ('er', '', 3),
+    ('ed', '', 3),
+    ('ly', '', 3),
+    ('es', '', 3),
+    ('s', '', 3),
+)
+
+
+def stem(token):
+    """Reduce a token to a crude stem so that e.g. 'developers' matches 'developer'."""
+    if len(token) <= 3 or not token.isalpha():
+        return token
+    for suffix, replacement, min_len in _SUFFIX_RULES:
+        if token.endswith(suffix) and len(token) - len(suffix) >= min_len:
+            if suffix == 's' and token.endswith('ss'):
+                return token
+            return token[:-len(suffix)] + replacement
+    return token
+
+
+def tokenize(text):
+    """Lowercase, split and stem a piece of text, dropping stop words."""
+    if not text:
+        return []
+    tokens = []
+    for raw in _TOKEN_RE.findall(text.lower()):
+        raw = raw.rstrip('.')
+        if not raw or raw in STOP_WORDS:
+            continue
+        tokens.append(stem(raw))
+    return tokens
+
+
+class JobSearchIndex:
+    """
+    Field-aware inverted index over active job postings.
+
+    Postings are kept per field as ``term -> {job_id: term frequency}`` so that
+    free-text queries can be ranked with a BM25F-style score while title and
+    location filters can be answered by intersecting posting lists.
+    """
+
+    def __init__(self, refresh_seconds=300):
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.RLock()
+        self._built_at = None
+        self._reset()
+
+    def _reset(self):
+        fields = set(FIELD_WEIGHTS) | set(FILTER_FIELDS)
+        self._postings = {field: {} for field in fields}
+        self._lengths = {field: {} for field in fields}
+        self._total_lengths = {field: 0 for field in fields}
+        self._doc_terms = {}
+
+    def __len__(self):
+        return len(self._doc_terms)
+
+    def __contains__(self, job_id):
+        return job_id in self._doc_terms
+
+    def is_stale(self):
+        if self._built_at is None:
+            return True
+        if not self.refresh_seconds:
+            return False
+        return time.monotonic() - self._built_at > self.refresh_seconds
+
+    def ensure_built(self, loader):
+        """
+        Build the index from ``loader()`` if it has never been built or the
+        refresh interval has elapsed. The periodic rebuild picks up writes
+        made by other worker processes.
+        """
+        if not self.is_stale():
+            return
+        with self._lock:
+            if self.is_stale():
+                self.rebuild(loader())
+
+    def rebuild(self, jobs):
+        with self._lock:
+            self._reset()
+            for job in jobs:
+                self._add(job)
+            self._built_at = time.monotonic()
+
+    def clear(self):
+        with self._lock:
+            self._reset()
+            self._built_at = None
+
+    def add_job(self, job):
+        """Index or re-index a job. Inactive jobs are removed instead."""
+        with self._lock:
+            self._remove(job.id)
+            if job.is_active:
+                self._add(job)
+
+    def remove_job(self, job_id):
+        with self._lock:
+            self._remove(job_id)
+
+    def _add(self, job):
+        doc_fields = {}
+        for field in self._postings:
+            counts = Counter(tokenize(getattr(job, field, None)))
+            if not counts:
+                continue
+            doc_fields[field] = counts
+            postings = self._postings[field]
+            for term, tf in counts.items():
+                postings.setdefault(term, {})[job.id] = tf
+            length = sum(counts.values())
+            self._lengths[field][job.id] = length
+            self._total_lengths[field] += length
+        self._doc_terms[job.id] = doc_fields
+
+    def _remove(self, job_id):
+        doc_fields = self._doc_terms.pop(job_id, None)
+        if doc_fields is None:
+            return
+        for field, counts in doc_fields.items():
+            postings = self._postings[field]
+            for term in counts:
+                docs = postings.get(term)
+                if docs is None:
+                    continue
+                docs.pop(job_id, None)
+                if not docs:
+                    del postings[term]
+            self._total_lengths[field] -= self._lengths[field].pop(job_id, 0)
+
+    def search(self, query, limit=None):
+        """
+        Rank jobs against a free-text query.
+
+        Returns a list of ``(job_id, score)`` tuples, best match first.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+
+        with self._lock:
+            n_docs = len(self._doc_terms)
+            if not n_docs:
+                return []
+            avg_lengths = {
+                field: (self._total_lengths[field] / len(self._lengths[field])) if self._lengths[field] else 1.0
+                for field in FIELD_WEIGHTS
+            }
+            scores = {}
+            for term in set(terms):
+                matching = set()
+                for field in FIELD_WEIGHTS:
+                    matching.update(self._postings[field].get(term, ()))
+                if not matching:
+                    continue
+                df = len(matching)
+                idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                for field, weight in FIELD_WEIGHTS.items():
+                    docs = self._postings[field].get(term)
+                    if not docs:
+                        continue
+                    lengths = self._lengths[field]
+                    avg_length = avg_lengths[field]
+                    for job_id, tf in docs.items():
+                        norm = K1 * (1 - B + B * lengths[job_id] / avg_length)
+                        scores[job_id] = scores.get(job_id, 0.0) + idf * weight * tf * (K1 + 1) / (tf + norm)
+
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], -item[0]))
+        if limit is not None:
+            ranked = ranked[:limit]
+        return ranked
+
+    def match_all(self, field, text):
+        """
+        Return the set of job IDs whose ``field`` contains every token in ``text``,
+        or ``None`` if ``text`` has no searchable tokens.
+
+        Tokens are matched anywhere inside the indexed terms, like a substring
+        filter, so partially typed filters such as ``"dev"`` still find
+        ``"Developer"`` and ``"script"`` finds ``"JavaScript"``. Only the
+        field's vocabulary is scanned, never the jobs themselves.
+        """
+        terms = tokenize(text)
+        if not terms:
+            return None
+        with self._lock:
+            doc_sets = sorted((self._infix_docs(field, term) for term in set(terms)), key=len)
+            result = doc_sets[0]
+            for docs in doc_sets[1:]:
+                if not result:
+                    break
+                result = result & docs
+            return result
+
+    def _infix_docs(self, field, fragment):
+        postings = self._postings[field]
+        docs = set()
+        for term, term_docs in postings.items():
+            if fragment in term:
+                docs.update(term_docs)
+        return docs
+
+# Process-wide index shared by the job routes
+job_search_index = JobSearchIndex(refresh_seconds=Config.SEARCH_INDEX_REFRESH_SECONDS)
@@ -0,0 +1,49 @@
+# Helpers for cursor (keyset) pagination shared by the list endpoints
+import base64
+import json
+from sqlalchemy import and_, or_
+
+
+def encode_cursor(*values):
+    """Pack the sort key of the last returned row into an opaque, URL-safe token."""
+    raw = json.dumps(list(values), separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(token, size=2):
+    """
+    Unpack a token produced by ``encode_cursor``.
+
+    Returns ``None`` when no cursor was supplied and raises ``ValueError``
+    when the token is malformed.
+    """
+    if not token:
+        return None
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode('ascii')))
+    except (ValueError, UnicodeError):
+        raise ValueError('Invalid cursor')
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError('Invalid cursor')
+    return values
+
+
+def parse_limit(value, maximum, default=None):
+    """Validate a ``limit`` query parameter, clamping it to ``maximum``."""
+    if value is None or value == '':
+        return default
+    try:
+        limit = int(value)
+    except (TypeError, ValueError):
+        raise ValueError('limit must be an integer')
+    if limit < 1:
+        raise ValueError('limit must be a positive integer')
+    return min(limit, maximum)
+
+
+def keyset_condition(column, id_column, value, last_id, descending=False):
+    """Filter for rows that come strictly after ``(value, last_id)`` in ``(column, id)`` order."""
+    if descending:
+        return or_(column < value, and_(column == value, id_column < last_id))
+    return or_(column > value, and_(column == value, id_column > last_id))
@@ -0,0 +1,61 @@
+# Rendered resume PDFs cached on disk, keyed on a hash of the resume contents
+import hashlib
+import json
+from config import Config
+from app.AI.llm_cache import DiskCacheTier
+from app.AI.resume_builder import TEMPLATE_VERSION
+
+# Resume fields that go into the PDF, as stored (JSON strings)
+RESUME_PDF_FIELDS = ('contact', 'education', 'experiences', 'certifications', 'projects', 'skills')
+
+
+def resume_pdf_key(resume, user):
+    """Hash of everything the rendered PDF depends on, including the template version."""
+    raw = json.dumps([
+        TEMPLATE_VERSION,
+        [getattr(resume, field) for field in RESUME_PDF_FIELDS],
+        user.name,
+        user.email,
+    ])
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class PDFDiskTier(DiskCacheTier):
+    """Raw PDF bytes, one file per key, evicted by size in LRU order."""
+
+    suffix = '.pdf'
+
+    def _dump(self, value):
+        return value
+
+    def _load(self, raw):
+        return raw
+
+
+class ResumePDFCache:
+    """
+    Rendered PDFs keyed on ``resume_pdf_key``, which also serves as the ETag.
+
+    The key is computed from the resume contents on every request, so an edit
+    always yields a new key. PDFs for old contents are left to the LRU eviction
+    of the disk tier.
+    """
+
+    def __init__(self, directory, max_bytes):
+        self.disk = PDFDiskTier(directory, max_bytes)
+
+    def key_for(self, resume, user):
+        return resume_pdf_key(resume, user)
+
+    def get(self, key):
+        return self.disk.get(key)
+
+    def set(self, key, pdf_content):
+        self.disk.set(key, pdf_content)
+
+
+# Process-wide cache used by GET /api/resumes/<id>/pdf
+resume_pdf_cache = ResumePDFCache(
+    Config.RESUME_PDF_CACHE_DIR,
+    Config.RESUME_PDF_CACHE_MAX_BYTES
+) if Config.RESUME_PDF_CACHE_DIR else None
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
@@ -26,3 +27,64 @@ class Config:
     
     # Define the header type for the JWT token (default is 'Bearer')
     JWT_HEADER_TYPE = 'Bearer'  # You can change this if needed
+
+    # Seconds before the in-memory job search index is rebuilt from the database
+    # so that writes made by other worker processes are picked up (0 disables)
+    SEARCH_INDEX_REFRESH_SECONDS = int(os.getenv("SEARCH_INDEX_REFRESH_SECONDS", "300"))
+
+    # Maximum number of ranked results returned for a free-text job search
+    SEARCH_MAX_RESULTS = int(os.getenv("SEARCH_MAX_RESULTS", "100"))
+
+    # Upper bound for the limit= parameter of paginated list endpoints
+    JOBS_PAGE_MAX_LIMIT = int(os.getenv("JOBS_PAGE_MAX_LIMIT", "100"))
+
+    # Rows fetched per round-trip when streaming job listings as NDJSON
+    JOBS_STREAM_CHUNK_SIZE = int(os.getenv("JOBS_STREAM_CHUNK_SIZE", "500"))
+
+    # Read-through cache for /api/jobs and /api/jobs/<id>. Use memory:// for a
+    # per-worker cache or redis://host:port/db to share it across workers
+    JOB_CACHE_ENABLED = os.getenv("JOB_CACHE_ENABLED", "true").lower() == "true"
+    JOB_CACHE_URL = os.getenv("JOB_CACHE_URL", "memory://")
+    JOB_CACHE_TTL_SECONDS = int(os.getenv("JOB_CACHE_TTL_SECONDS", "60"))
+    JOB_CACHE_MAX_ENTRIES = int(os.getenv("JOB_CACHE_MAX_ENTRIES", "1024"))
+
+    # Maximum number of items accepted by PATCH /api/applications/status
+    BULK_STATUS_MAX_ITEMS = int(os.getenv("BULK_STATUS_MAX_ITEMS", "1000"))
+
+    # Rows inserted per executemany batch by the bulk job import
+    JOB_IMPORT_BATCH_SIZE = int(os.getenv("JOB_IMPORT_BATCH_SIZE", "500"))
+
+    # Upper bound for k= on GET /api/employee/job-matches
+    MATCH_MAX_RESULTS = int(os.getenv("MATCH_MAX_RESULTS", "50"))
+
+    # Cached applicant scores (and extracted resume PDF texts) kept per worker
+    CANDIDATE_SCORE_CACHE_SIZE = int(os.getenv("CANDIDATE_SCORE_CACHE_SIZE", "10000"))
+
+    # Autocomplete: distinct values kept per field, and the largest limit= accepted
+    AUTOCOMPLETE_MAX_VALUES = int(os.getenv("AUTOCOMPLETE_MAX_VALUES", "50000"))
+    AUTOCOMPLETE_MAX_LIMIT = int(os.getenv("AUTOCOMPLETE_MAX_LIMIT", "20"))
+
+    # Near-duplicate job detection: minimum estimated Jaccard similarity of
+    # description + requirements, whether only the same employer's jobs are
+    # compared, and what create_job does on a match ("flag" or "reject")
+    DUPLICATE_JOB_THRESHOLD = float(os.getenv("DUPLICATE_JOB_THRESHOLD", "0.8"))
+    DUPLICATE_JOB_SAME_EMPLOYER_ONLY = os.getenv("DUPLICATE_JOB_SAME_EMPLOYER_ONLY", "true").lower() == "true"
+    DUPLICATE_JOB_POLICY = os.getenv("DUPLICATE_JOB_POLICY", "flag")
+
+    # Background AI tasks: worker threads per process, and tasks each process will hold before refusing more
+    AI_TASK_WORKERS = int(os.getenv("AI_TASK_WORKERS", "4"))
+    AI_TASK_MAX_PENDING = int(os.getenv("AI_TASK_MAX_PENDING", "50"))
+    # Tasks still queued or running after AI_TASK_STALE_SECONDS are marked failed (their worker is
+    # assumed dead), finished tasks are deleted after AI_TASK_TTL_SECONDS, and each process checks
+    # for both at most every AI_TASK_CLEANUP_INTERVAL_SECONDS
+    AI_TASK_STALE_SECONDS = int(os.getenv("AI_TASK_STALE_SECONDS", "1800"))
+    AI_TASK_TTL_SECONDS = int(os.getenv("AI_TASK_TTL_SECONDS", "86400"))
+    AI_TASK_CLEANUP_INTERVAL_SECONDS = int(os.getenv("AI_TASK_CLEANUP_INTERVAL_SECONDS", "60"))
+
+    # Batch cover letters: most jobs per request, and generations run at once for one request
+    COVER_LETTER_BATCH_MAX_JOBS = int(os.getenv("COVER_LETTER_BATCH_MAX_JOBS", "20"))
+    COVER_LETTER_BATCH_CONCURRENCY = int(os.getenv("COVER_LETTER_BATCH_CONCURRENCY", "4"))
+
+    # Rendered resume PDFs cached on disk (an empty directory disables the cache), and their size cap
+    RESUME_PDF_CACHE_DIR = os.getenv("RESUME_PDF_CACHE_DIR", os.path.join(tempfile.gettempdir(), "resume_pdf_cache"))
+    RESUME_PDF_CACHE_MAX_BYTES = int(os.getenv("RESUME_PDF_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
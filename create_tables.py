@@ -1,4 +1,4 @@
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, ForeignKey, Boolean, CheckConstraint, UniqueConstraint
+from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, ForeignKey, Boolean, CheckConstraint, UniqueConstraint, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
@@ -66,6 +66,7 @@ class Job(Base):
     __table_args__ = (
         CheckConstraint("job_type IN ('Full-time', 'Part-time', 'Contract', 'Remote')"),
         CheckConstraint("status IN ('Open', 'Closed', 'Expired')"),
+        Index('ix_jobs_active_created_at', 'is_active', 'created_at', 'id'),
     )
 
 
@@ -88,6 +89,7 @@ class JobApplication(Base):
     # Constraints
     __table_args__ = (
         UniqueConstraint('employee_id', 'job_id', name='employee_id'),
+        Index('ix_job_applications_job_status_applied', 'job_id', 'status', 'applied_at'),
     )
 
 
@@ -109,6 +111,25 @@ class Resume(Base):
     employee = relationship('User', back_populates='resume')
 
 
+class AITask(Base):
+    __tablename__ = 'ai_tasks'
+
+    id = Column(String(32), primary_key=True)
+    kind = Column(String(50), nullable=False)
+    status = Column(String(20), nullable=False, default='queued')
+    params = Column(Text, nullable=False)
+    result = Column(Text)
+    error = Column(Text)
+    created_at = Column(DateTime, server_default=func.current_timestamp())
+    started_at = Column(DateTime)
+    finished_at = Column(DateTime)
+
+    # Constraints
+    __table_args__ = (
+        Index('ix_ai_tasks_status_created', 'status', 'created_at'),
+    )
+
+
 def create_tables():
     Base.metadata.create_all(engine)
 
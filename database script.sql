@@ -1,3 +1,17 @@
+CREATE TABLE `ai_tasks` (
+  `id` varchar(32) NOT NULL,
+  `kind` varchar(50) NOT NULL,
+  `status` varchar(20) NOT NULL DEFAULT 'queued',
+  `params` text NOT NULL,
+  `result` text,
+  `error` text,
+  `created_at` timestamp NULL DEFAULT CURRENT_TIMESTAMP,
+  `started_at` timestamp NULL DEFAULT NULL,
+  `finished_at` timestamp NULL DEFAULT NULL,
+  PRIMARY KEY (`id`),
+  KEY `ix_ai_tasks_status_created` (`status`,`created_at`)
+) 
+
 CREATE TABLE `job_applications` (
   `id` int NOT NULL AUTO_INCREMENT,
   `job_id` int DEFAULT NULL,
@@ -10,6 +24,7 @@ CREATE TABLE `job_applications` (
   PRIMARY KEY (`id`),
   UNIQUE KEY `employee_id` (`employee_id`,`job_id`),
   KEY `job_id` (`job_id`),
+  KEY `ix_job_applications_job_status_applied` (`job_id`,`status`,`applied_at`),
   CONSTRAINT `job_applications_ibfk_1` FOREIGN KEY (`job_id`) REFERENCES `jobs` (`id`) ON DELETE CASCADE,
   CONSTRAINT `job_applications_ibfk_2` FOREIGN KEY (`employee_id`) REFERENCES `users` (`id`)
 ) 
@@ -31,6 +46,7 @@ CREATE TABLE `jobs` (
   `application_count` int DEFAULT NULL,
   PRIMARY KEY (`id`),
   KEY `employer_id` (`employer_id`),
+  KEY `ix_jobs_active_created_at` (`is_active`,`created_at`,`id`),
   CONSTRAINT `jobs_ibfk_1` FOREIGN KEY (`employer_id`) REFERENCES `users` (`id`) ON DELETE CASCADE,
   CONSTRAINT `jobs_chk_1` CHECK ((`job_type` in (_utf8mb4'Full-time',_utf8mb4'Part-time',_utf8mb4'Contract',_utf8mb4'Remote'))),
   CONSTRAINT `jobs_chk_2` CHECK ((`status` in (_utf8mb4'Open',_utf8mb4'Closed',_utf8mb4'Expired')))
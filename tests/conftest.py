@@ -0,0 +1,71 @@
+# Shared fixtures: the Flask app on an in-memory SQLite database, with helpers to create rows
+import os
+import sys
+
+import pytest
+from flask import Flask
+from flask_jwt_extended import JWTManager, create_access_token
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import Config  # noqa: E402
+from app import db  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.models.job import Job  # noqa: E402
+
+
+@pytest.fixture
+def app():
+    from app.routes.job_routes import job_bp
+    from app.services.job_search import job_search_index
+    from app.services.job_facets import job_facet_index
+    from app.services.job_autocomplete import job_autocomplete_index
+    from app.services.job_dedup import job_duplicate_index
+
+    # The indexes are process-wide, so drop whatever an earlier test's database left in them
+    for index in (job_search_index, job_facet_index, job_autocomplete_index, job_duplicate_index):
+        index.clear()
+
+    app = Flask(__name__)
+    app.config.from_object(Config)
+    app.config.update(TESTING=True, SQLALCHEMY_DATABASE_URI='sqlite://', JOB_CACHE_ENABLED=False)
+    db.init_app(app)
+    JWTManager(app)
+    app.register_blueprint(job_bp)
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def make_user(app):
+    def make_user(name, role='employee'):
+        user = User(name=name, email=f'{name.lower().replace(" ", ".")}@example.com', role=role)
+        user.set_password('secret')
+        db.session.add(user)
+        db.session.commit()
+        return user
+    return make_user
+
+
+@pytest.fixture
+def make_job(app):
+    def make_job(employer, **fields):
+        values = {'title': 'Backend Engineer', 'company': 'Acme', 'description': 'Build APIs'}
+        values.update(fields)
+        job = Job(employer_id=employer.id, **values)
+        db.session.add(job)
+        db.session.commit()
+        return job
+    return make_job
+
+
+def auth_header(user):
+    return {'Authorization': f'Bearer {create_access_token(identity=str(user.id))}'}
@@ -0,0 +1,67 @@
+import json
+from datetime import datetime, timedelta
+
+from app import db
+from app.models.ai_task import AITask
+from app.services import ai_tasks
+from app.services.ai_tasks import AITaskQueue
+
+
+def _task(status='queued', **fields):
+    task = AITask(id=fields.pop('id', None) or f'{status}{len(AITask.query.all())}', kind='cover_letter',
+                  status=status, params=json.dumps({}), **fields)
+    db.session.add(task)
+    db.session.commit()
+    return task
+
+
+def test_cancelled_task_is_not_started(app, monkeypatch):
+    calls = []
+    monkeypatch.setitem(ai_tasks.TASK_RUNNERS, 'cover_letter', lambda params, fresh: calls.append(params) or 'letter')
+    queue = AITaskQueue()
+    task = _task()
+
+    assert queue.cancel(task)
+    queue._run(app, task.id, 'cover_letter', {}, False)
+
+    assert calls == []
+    db.session.expire_all()
+    assert db.session.get(AITask, task.id).status == 'cancelled'
+
+
+def test_cancel_while_running_keeps_cancelled(app, monkeypatch):
+    queue = AITaskQueue()
+    task = _task()
+    task_id = task.id
+
+    def run_and_get_cancelled(params, fresh):
+        # The cancel request arrives from another session while the upstream call is in flight
+        with app.app_context():
+            assert queue.cancel(db.session.get(AITask, task_id))
+        return 'letter'
+
+    monkeypatch.setitem(ai_tasks.TASK_RUNNERS, 'cover_letter', run_and_get_cancelled)
+    queue._run(app, task_id, 'cover_letter', {}, False)
+
+    db.session.expire_all()
+    task = db.session.get(AITask, task_id)
+    assert task.status == 'cancelled'
+    assert task.result is None
+
+
+def test_cleanup_fails_stale_tasks_and_deletes_expired_ones(app):
+    queue = AITaskQueue(stale_seconds=60, ttl_seconds=3600)
+    old = datetime.utcnow() - timedelta(hours=2)
+    stale = _task('running', created_at=old, started_at=old).id
+    fresh = _task('queued').id
+    expired = _task('succeeded', created_at=old, finished_at=old).id
+    recent = _task('failed', finished_at=datetime.utcnow()).id
+
+    assert queue.reap_stale() == 1
+    assert queue.purge_finished() == 1
+    db.session.expire_all()
+
+    assert db.session.get(AITask, stale).status == 'failed'
+    assert db.session.get(AITask, fresh).status == 'queued'
+    assert db.session.get(AITask, expired) is None
+    assert db.session.get(AITask, recent) is not None
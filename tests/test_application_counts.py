@@ -0,0 +1,47 @@
+from datetime import datetime
+
+from app import db
+from app.models.job import Job, JobApplication, repair_application_counts
+from tests.conftest import auth_header
+
+
+def _set_updated_at(job, value):
+    db.session.execute(db.update(Job).where(Job.id == job.id).values(updated_at=value))
+    db.session.commit()
+    db.session.expire_all()
+
+
+def test_apply_keeps_job_updated_at(client, make_user, make_job):
+    employer = make_user('Employer', role='employer')
+    employee = make_user('Employee')
+    job = make_job(employer)
+    edited = datetime(2024, 1, 2, 3, 4, 5)
+    _set_updated_at(job, edited)
+
+    response = client.post(f'/api/jobs/{job.id}/apply', json={'cover_letter': 'Hi'}, headers=auth_header(employee))
+
+    assert response.status_code == 201
+    job = db.session.get(Job, job.id)
+    assert job.application_count == 1
+    assert job.updated_at == edited
+
+
+def test_withdraw_and_repair_keep_job_updated_at(app, make_user, make_job):
+    employer = make_user('Employer', role='employer')
+    employee = make_user('Employee')
+    job = make_job(employer, application_count=5)
+    db.session.add(JobApplication(job_id=job.id, employee_id=employee.id))
+    db.session.commit()
+    edited = datetime(2024, 1, 2, 3, 4, 5)
+    _set_updated_at(job, edited)
+
+    assert repair_application_counts() == 1
+    db.session.expire_all()
+    assert db.session.get(Job, job.id).application_count == 1
+
+    db.session.delete(JobApplication.query.filter_by(job_id=job.id).one())
+    db.session.commit()
+    db.session.expire_all()
+    job = db.session.get(Job, job.id)
+    assert job.application_count == 0
+    assert job.updated_at == edited
@@ -0,0 +1,31 @@
+from types import SimpleNamespace
+
+from app.services.job_autocomplete import JobAutocompleteIndex
+
+
+def _job(job_id, title, application_count=0):
+    return SimpleNamespace(
+        id=job_id, title=title, company=None, location=None, application_count=application_count, is_active=True
+    )
+
+
+def test_short_prefixes_rank_every_value_by_popularity():
+    jobs = [_job(index, f'a{index:05d} engineer') for index in range(3000)]
+    # Alphabetically last, so far past the first few thousand keys under "a"
+    jobs.append(_job(3000, 'azure architect', application_count=50))
+    index = JobAutocompleteIndex(refresh_seconds=0)
+    index.rebuild(jobs)
+
+    assert index.suggest('a', field='title', limit=1)[0]['value'] == 'azure architect'
+    assert index.suggest('az', field='title', limit=1)[0]['value'] == 'azure architect'
+
+
+def test_short_prefix_ranking_follows_writes():
+    index = JobAutocompleteIndex(refresh_seconds=0)
+    index.rebuild([_job(1, 'Data Engineer', application_count=5), _job(2, 'Data Analyst')])
+    assert index.suggest('d', field='title', limit=1)[0]['value'] == 'Data Engineer'
+
+    index.remove_job(1)
+    index.add_job(_job(3, 'Designer', application_count=2))
+    assert [s['value'] for s in index.suggest('d', field='title')] == ['Designer', 'Data Analyst']
+    assert [s['value'] for s in index.suggest('an', field='title')] == ['Data Analyst']
@@ -0,0 +1,27 @@
+from app.services.cache import MemoryCacheBackend, ReadThroughCache
+
+
+def test_version_counters_are_bounded_and_never_go_back():
+    backend = MemoryCacheBackend(max_entries=2)
+    cache = ReadThroughCache(backend, 'jobs')
+    seen = {}
+    for job_id in list(range(10)) * 2:
+        before = cache.version(f'job:{job_id}')
+        after = cache.bump(f'job:{job_id}')
+        # An evicted counter resumes above every value it was evicted with
+        assert after > before
+        assert after > seen.get(job_id, 0)
+        seen[job_id] = after
+
+    assert len(backend._counters) == 2
+
+
+def test_stats_count_only_this_namespace():
+    backend = MemoryCacheBackend()
+    jobs = ReadThroughCache(backend, 'jobs')
+    other = ReadThroughCache(backend, 'other')
+    jobs.set(jobs.key('list', jobs.version('list')), {'body': '[]'})
+    other.set(other.key('list', 0), {'body': '[]'})
+    jobs.bump('list')
+
+    assert jobs.stats()['entries'] == 1
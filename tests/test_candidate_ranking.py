@@ -0,0 +1,46 @@
+import json
+from types import SimpleNamespace
+
+from app.services.candidate_ranking import rank_applications
+from app.services.job_matcher import JobMatcher, job_matcher
+
+
+def _job(job_id, title, requirements, is_active=True):
+    return SimpleNamespace(id=job_id, title=title, description='', requirements=requirements, is_active=is_active)
+
+
+def _row(application_id, skills):
+    application = SimpleNamespace(id=application_id, resume_file=None)
+    resume = SimpleNamespace(
+        id=application_id, last_updated=None, skills=json.dumps(skills),
+        experiences='[]', projects='[]', certifications='[]', education='[]'
+    )
+    return application, resume
+
+
+def test_applicants_of_an_unindexed_job_are_scored():
+    matcher = JobMatcher(refresh_seconds=0)
+    matcher.rebuild([_job(1, 'Chef', 'cooking knives')])
+    job = _job(2, 'Kotlin Developer', 'kotlin android gradle', is_active=False)
+
+    similarity, coverage = matcher.score_candidates(job, ['kotlin android developer', 'cooking'])
+
+    assert similarity[0] > 0 and coverage[0] > 0
+    assert similarity[1] == 0 and coverage[1] == 0
+
+
+def test_cached_scores_follow_the_catalog_generation():
+    job_matcher.rebuild([_job(1, 'Chef', 'cooking knives')])
+    job = _job(2, 'Kotlin Developer', 'kotlin android gradle', is_active=False)
+    rows = [_row(1, ['Kotlin', 'Android']), _row(2, ['Cooking'])]
+
+    first = rank_applications(job, rows)
+    assert [row[0].id for row, _ in first] == [1, 2]
+    assert first[0][1]['score'] > 0
+
+    # Kotlin is now common in the catalog, so its IDF (and the score) drops
+    job_matcher.add_job(_job(3, 'Kotlin Engineer', 'kotlin'))
+    job_matcher.add_job(_job(4, 'Kotlin Lead', 'kotlin'))
+    second = rank_applications(job, rows)
+    assert second[0][1]['similarity'] != first[0][1]['similarity']
+    job_matcher.clear()
@@ -0,0 +1,50 @@
+import io
+
+from app.models.job import Job
+from app.services.job_import import import_jobs, iter_rows
+
+
+def test_csv_with_bad_bytes_keeps_the_rows_before_them(app, make_user):
+    employer = make_user('Employer', role='employer')
+    data = (
+        b'title,company,description\n'
+        b'Backend Engineer,Acme,Build APIs\n'
+        b'Data Engineer,Acme,Build pipelines\n'
+        b'Caf\xe9 Manager,Acme,Run the caf\xe9\n'
+        b'Designer,Acme,Design things\n'
+    )
+
+    report = import_jobs(iter_rows(io.BytesIO(data), 'csv'), employer.id).to_dict()
+
+    assert report['inserted'] == 2
+    assert [error['row'] for error in report['errors']] == [4]
+    assert 'Could not read the input' in report['errors'][0]['errors'][0]
+    assert sorted(job.title for job in Job.query) == ['Backend Engineer', 'Data Engineer']
+
+
+def test_ndjson_skips_a_line_that_is_not_utf8(app, make_user):
+    employer = make_user('Employer', role='employer')
+    data = (
+        b'{"title": "Backend Engineer", "company": "Acme", "description": "Build APIs"}\n'
+        b'{"title": "Caf\xe9 Manager", "company": "Acme", "description": "Coffee"}\n'
+        b'{"title": "Designer", "company": "Acme", "description": "Design things"}\n'
+    )
+
+    report = import_jobs(iter_rows(io.BytesIO(data), 'ndjson'), employer.id).to_dict()
+
+    assert (report['rows'], report['inserted'], report['failed']) == (3, 2, 1)
+    assert report['errors'][0]['row'] == 2
+
+
+def test_import_endpoint_reports_a_broken_csv(client, make_user):
+    from tests.conftest import auth_header
+
+    employer = make_user('Employer', role='employer')
+    # A field over csv.field_size_limit() makes the reader raise csv.Error
+    data = b'title,company,description\nBackend Engineer,Acme,Build APIs\nHuge,Acme,' + b'x' * 200000 + b'\n'
+
+    response = client.post('/api/jobs/import?format=csv', data=data, headers=auth_header(employer))
+
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['inserted'] == 1 and body['failed'] == 1
@@ -0,0 +1,120 @@
+from app.services.pagination import encode_cursor
+
+
+def test_relevance_cursor_from_another_listing_is_rejected(client, make_user, make_job):
+    employer = make_user('Employer', role='employer')
+    make_job(employer, title='Python Developer')
+
+    cursor = encode_cursor('2024-01-02T03:04:05', 1)
+    response = client.get('/api/jobs', query_string={'q': 'python', 'cursor': cursor})
+
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'Invalid cursor'}
+
+
+def test_applicants_without_a_user_are_kept_when_paging_by_name(client, make_user, make_job):
+    from app import db
+    from app.models.job import JobApplication
+    from tests.conftest import auth_header
+
+    employer = make_user('Employer', role='employer')
+    job = make_job(employer)
+    for name in ('Bob', 'Alice'):
+        db.session.add(JobApplication(job_id=job.id, employee_id=make_user(name).id))
+    # An application whose applicant row no longer exists has a NULL name in the outer join
+    db.session.add(JobApplication(job_id=job.id, employee_id=9999))
+    db.session.commit()
+
+    names = []
+    cursor = None
+    while True:
+        query = {'sort': 'name', 'limit': 1}
+        if cursor:
+            query['cursor'] = cursor
+        response = client.get(f'/api/jobs/{job.id}/applications', query_string=query, headers=auth_header(employer))
+        assert response.status_code == 200
+        names.extend(application['employee_name'] for application in response.get_json())
+        cursor = response.headers.get('X-Next-Cursor')
+        if not cursor:
+            break
+
+    assert names == ['Unknown', 'Alice', 'Bob']
+
+
+def test_employee_applications_etag_ignores_other_applicants(client, make_user, make_job):
+    from tests.conftest import auth_header
+
+    employer = make_user('Employer', role='employer')
+    employee = make_user('Employee')
+    job = make_job(employer)
+    client.post(f'/api/jobs/{job.id}/apply', json={}, headers=auth_header(employee))
+
+    first = client.get('/api/employee/applications', headers=auth_header(employee))
+    assert first.status_code == 200
+    client.post(f'/api/jobs/{job.id}/apply', json={}, headers=auth_header(make_user('Someone Else')))
+
+    again = client.get('/api/employee/applications', headers={
+        **auth_header(employee), 'If-None-Match': first.headers['ETag']
+    })
+    assert again.status_code == 304
+
+
+def test_title_filter_matches_part_of_a_word(client, make_user, make_job):
+    employer = make_user('Employer', role='employer')
+    make_job(employer, title='Senior JavaScript Developer', location='Berlin')
+    make_job(employer, title='Python Developer', location='Paris')
+
+    response = client.get('/api/jobs', query_string={'title': 'script'})
+    assert [job['title'] for job in response.get_json()] == ['Senior JavaScript Developer']
+
+    response = client.get('/api/jobs', query_string={'title': 'developer', 'q': 'python', 'facets': 'true'})
+    body = response.get_json()
+    assert [job['title'] for job in body['jobs']] == ['Python Developer']
+
+
+def test_title_filter_is_capped_after_job_type(app, client, make_user, make_job):
+    app.config['SEARCH_MAX_RESULTS'] = 2
+    employer = make_user('Employer', role='employer')
+    for index in range(3):
+        make_job(employer, title=f'Developer {index}', job_type='Full-time')
+    for index in range(3):
+        make_job(employer, title=f'Developer part {index}', job_type='Part-time')
+
+    response = client.get('/api/jobs', query_string={'title': 'develop', 'job_type': 'Full-time'})
+    assert [job['title'] for job in response.get_json()] == ['Developer 2', 'Developer 1']
+
+    response = client.get('/api/jobs', query_string={'q': 'developer', 'job_type': 'Full-time'})
+    assert len(response.get_json()) == 2
+
+
+def test_employee_applications_etag_skips_the_row_query_and_follows_status(client, make_user, make_job):
+    from sqlalchemy import event
+    from app import db
+    from app.models.job import JobApplication
+    from tests.conftest import auth_header
+
+    employer = make_user('Employer', role='employer')
+    employee = make_user('Employee')
+    job = make_job(employer)
+    client.post(f'/api/jobs/{job.id}/apply', json={}, headers=auth_header(employee))
+    first = client.get('/api/employee/applications', headers=auth_header(employee))
+
+    statements = []
+    listener = lambda conn, cursor, statement, *args: statements.append(statement)
+    event.listen(db.engine, 'before_cursor_execute', listener)
+    try:
+        again = client.get('/api/employee/applications', headers={
+            **auth_header(employee), 'If-None-Match': first.headers['ETag']
+        })
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', listener)
+    assert again.status_code == 304
+    assert not any('ORDER BY' in statement for statement in statements)
+
+    application = JobApplication.query.filter_by(employee_id=employee.id).one()
+    client.patch(f'/api/applications/{application.id}/status', json={'status': 'invited'}, headers=auth_header(employer))
+    changed = client.get('/api/employee/applications', headers={
+        **auth_header(employee), 'If-None-Match': first.headers['ETag']
+    })
+    assert changed.status_code == 200
+    assert changed.get_json()[0]['status'] == 'invited'
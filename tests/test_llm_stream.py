@@ -0,0 +1,66 @@
+import json
+
+import pytest
+
+from app.AI import llm_client
+from app.AI.errors import LLMError
+
+
+class FakeStream:
+    def __init__(self, lines):
+        self.lines = lines
+        self.closed = False
+
+    def iter_lines(self, decode_unicode=False):
+        return iter(self.lines)
+
+    def close(self):
+        self.closed = True
+
+
+class FakeCache:
+    def __init__(self):
+        self.entries = {}
+
+    def get(self, model, prompt):
+        return self.entries.get((model, prompt))
+
+    def set(self, model, prompt, value):
+        self.entries[(model, prompt)] = value
+
+
+def _chunk(content, finish_reason=None):
+    return 'data: ' + json.dumps({'choices': [{'delta': {'content': content}, 'finish_reason': finish_reason}]})
+
+
+@pytest.fixture
+def fake_cache(monkeypatch):
+    cache = FakeCache()
+    monkeypatch.setattr(llm_client, 'llm_cache', cache)
+    return cache
+
+
+def _serve(monkeypatch, lines):
+    response = FakeStream(lines)
+    monkeypatch.setattr(llm_client.upstream, 'call', lambda *args, **kwargs: response)
+    return response
+
+
+def test_stream_cut_off_without_done_is_an_error_and_not_cached(monkeypatch, fake_cache):
+    response = _serve(monkeypatch, [_chunk('Dear'), _chunk(' hiring')])
+
+    received = []
+    with pytest.raises(LLMError):
+        for delta in llm_client.stream_complete('prompt'):
+            received.append(delta)
+
+    assert received == ['Dear', ' hiring']
+    assert fake_cache.entries == {}
+    assert response.closed
+
+
+def test_finished_stream_is_cached(monkeypatch, fake_cache):
+    _serve(monkeypatch, [_chunk('Dear'), _chunk(' manager', finish_reason='stop'), 'data: [DONE]'])
+
+    assert ''.join(llm_client.stream_complete('prompt')) == 'Dear manager'
+    assert list(fake_cache.entries.values()) == ['Dear manager']
@@ -0,0 +1,31 @@
+from app.AI.prompt_compression import compress_polish_input, dedupe_lines
+
+RESUME = """Jane Doe
+jane.doe@example.com
+
+*EXPERIENCE
+Senior Engineer - Acme Corp - 2020 - Present
+Responsibilities:
+- Mentored junior engineers
+- Built the billing service
+Engineer - Initech - 2017 - 2020
+Responsibilities:
+- Mentored junior engineers
+- Mentored junior engineers
+- Built data pipelines
+
+References available upon request"""
+
+
+def test_dedupe_keeps_headings_and_bullets_shared_by_two_jobs():
+    lines = dedupe_lines(RESUME).split('\n')
+
+    assert lines.count('Responsibilities:') == 2
+    assert lines.count('- Mentored junior engineers') == 2
+    assert 'References available upon request' not in lines
+
+
+def test_polish_input_keeps_every_line_but_boilerplate():
+    text = compress_polish_input(RESUME).text
+
+    assert text == RESUME.replace('\n\nReferences available upon request', '')
@@ -0,0 +1,70 @@
+import threading
+import time
+
+import pytest
+
+from app.AI.errors import LLMRateLimitError
+from app.AI.resilience import CircuitBreaker, ResilientCaller
+
+
+class FakeResponse:
+    def __init__(self, status_code, text='', headers=None):
+        self.status_code = status_code
+        self.text = text
+        self.headers = headers or {}
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+def test_losing_hedge_and_error_responses_are_closed():
+    caller = ResilientCaller(CircuitBreaker(), hedge_percentile=50, hedge_min_samples=1, max_retries=0)
+    caller.latencies.add(0.01)
+    responses = []
+    release_slow = threading.Event()
+
+    def send(timeout):
+        first = not responses
+        response = FakeResponse(200, 'ok')
+        responses.append(response)
+        if first:
+            # The original request stalls past the hedge delay, then finishes after the hedge won
+            release_slow.wait(2)
+        return response
+
+    winner = caller.call(send)
+    release_slow.set()
+    time.sleep(0.1)
+
+    assert caller.hedges == 1
+    assert winner is responses[1] and not winner.closed
+    assert responses[0].closed
+
+
+def test_error_responses_are_closed():
+    caller = ResilientCaller(CircuitBreaker(), max_retries=1, retry_base=0)
+    responses = []
+
+    def send(timeout):
+        responses.append(FakeResponse(500, 'boom'))
+        return responses[-1]
+
+    with pytest.raises(Exception):
+        caller.call(send)
+    assert len(responses) == 2
+    assert all(response.closed for response in responses)
+
+
+def test_rate_limited_trial_does_not_close_the_circuit():
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0)
+    breaker.record_failure()
+    caller = ResilientCaller(breaker, max_retries=0)
+
+    with pytest.raises(LLMRateLimitError):
+        caller.call(lambda timeout: FakeResponse(429, 'slow down'))
+
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    # The trial slot was released, so the next call is let through as a new trial
+    assert caller.call(lambda timeout: FakeResponse(200, 'ok')).status_code == 200
+    assert breaker.state == CircuitBreaker.CLOSED
@@ -0,0 +1,17 @@
+from app.AI.resume_sections import join_sections, split_sections
+
+RESUME = """JOHN DOE
+john@x.com | 555-1234
+
+*EXPERIENCE*
+- Built the billing service
+SKILLS:
+Python, SQL"""
+
+
+def test_capitalized_name_stays_in_the_leading_section():
+    sections = split_sections(RESUME)
+
+    assert sections[0] == (None, ['JOHN DOE', 'john@x.com | 555-1234', ''])
+    assert [heading for heading, _ in sections[1:]] == ['*EXPERIENCE*', 'SKILLS:']
+    assert join_sections(sections) == RESUME
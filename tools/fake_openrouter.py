@@ -0,0 +1,217 @@
+"""
+Local stand-in for the OpenRouter chat completions API, for load tests and
+offline development.
+
+    python tools/fake_openrouter.py --port 8765 --latency-mean 1.5 --tokens-per-second 40
+
+then start the backend with ``LLM_API_URL=http://127.0.0.1:8765/api/v1/chat/completions``.
+
+Every request waits for a time-to-first-byte drawn from the configured
+latency distribution, then produces ``--completion-tokens`` tokens at
+``--tokens-per-second``, either as one JSON body or as an SSE stream when the
+request sets ``"stream": true``. A fraction of requests can be answered with
+an error status or left hanging to exercise client timeouts.
+"""
+import argparse
+import json
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+WORDS = (
+    'experienced', 'engineer', 'delivered', 'scalable', 'services', 'team', 'impact', 'python',
+    'customers', 'improved', 'latency', 'designed', 'systems', 'collaborated', 'results', 'role',
+)
+
+
+class FakeOpenRouterConfig:
+    def __init__(self, latency_dist='lognormal', latency_mean=1.0, latency_stddev=0.5,
+                 tokens_per_second=50.0, completion_tokens=200, error_rate=0.0,
+                 error_statuses=(503,), hang_rate=0.0, hang_seconds=300.0, seed=None):
+        self.latency_dist = latency_dist
+        self.latency_mean = latency_mean
+        self.latency_stddev = latency_stddev
+        self.tokens_per_second = tokens_per_second
+        self.completion_tokens = completion_tokens
+        self.error_rate = error_rate
+        self.error_statuses = tuple(error_statuses)
+        self.hang_rate = hang_rate
+        self.hang_seconds = hang_seconds
+        self.random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {'requests': 0, 'streamed': 0, 'errors': 0, 'hangs': 0}
+
+    def count(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def draw(self):
+        """Return ``(ttfb seconds, error status or None, hang)`` for one request."""
+        with self._lock:
+            rng = self.random
+            if self.latency_dist == 'fixed':
+                ttfb = self.latency_mean
+            elif self.latency_dist == 'uniform':
+                ttfb = rng.uniform(max(0.0, self.latency_mean - self.latency_stddev), self.latency_mean + self.latency_stddev)
+            elif self.latency_dist == 'normal':
+                ttfb = rng.gauss(self.latency_mean, self.latency_stddev)
+            else:
+                # Lognormal with the requested mean and standard deviation: a long right tail, like real APIs
+                mean = max(self.latency_mean, 1e-6)
+                sigma2 = math.log(1 + (self.latency_stddev / mean) ** 2)
+                mu = math.log(mean) - sigma2 / 2
+                ttfb = rng.lognormvariate(mu, sigma2 ** 0.5)
+            roll = rng.random()
+            error = rng.choice(self.error_statuses) if roll < self.error_rate else None
+            hang = error is None and roll < self.error_rate + self.hang_rate
+        return max(0.0, ttfb), error, hang
+
+    def words(self, count):
+        with self._lock:
+            return [self.random.choice(WORDS) for _ in range(count)]
+
+
+def make_handler(config):
+    class FakeOpenRouterHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send_json(self, status, body, headers=None):
+            raw = json.dumps(body).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(raw)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(raw)
+
+        def _write_chunk(self, data):
+            self.wfile.write(b'%x\r\n%s\r\n' % (len(data), data))
+            self.wfile.flush()
+
+        def do_GET(self):
+            if self.path.rstrip('/') == '/stats':
+                return self._send_json(200, config.stats)
+            self._send_json(404, {'error': {'message': 'Not found'}})
+
+        def do_POST(self):
+            if not self.path.rstrip('/').endswith('/chat/completions'):
+                return self._send_json(404, {'error': {'message': 'Not found'}})
+            try:
+                payload = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+            except ValueError:
+                return self._send_json(400, {'error': {'message': 'Invalid JSON'}})
+
+            config.count('requests')
+            ttfb, error, hang = config.draw()
+            time.sleep(ttfb)
+            if hang:
+                config.count('hangs')
+                time.sleep(config.hang_seconds)
+                self.close_connection = True
+                return
+            if error is not None:
+                config.count('errors')
+                headers = {'Retry-After': '1'} if error == 429 else None
+                return self._send_json(error, {'error': {'code': error, 'message': 'Injected error'}}, headers)
+
+            prompt = ''.join(message.get('content', '') for message in payload.get('messages', []))
+            usage = {
+                'prompt_tokens': max(1, len(prompt) // 4),
+                'completion_tokens': config.completion_tokens,
+                'total_tokens': max(1, len(prompt) // 4) + config.completion_tokens,
+            }
+            delay = 1.0 / config.tokens_per_second if config.tokens_per_second > 0 else 0.0
+            words = config.words(config.completion_tokens)
+            model = payload.get('model', 'fake/model')
+
+            if not payload.get('stream'):
+                time.sleep(delay * len(words))
+                return self._send_json(200, {
+                    'id': 'fake-completion',
+                    'model': model,
+                    'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': ' '.join(words)}, 'finish_reason': 'stop'}],
+                    'usage': usage,
+                })
+
+            config.count('streamed')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            try:
+                self._write_chunk(b': OPENROUTER PROCESSING\n\n')
+                for index, word in enumerate(words):
+                    time.sleep(delay)
+                    chunk = {'model': model, 'choices': [{'index': 0, 'delta': {'content': word if index == 0 else ' ' + word}}]}
+                    self._write_chunk(f'data: {json.dumps(chunk)}\n\n'.encode('utf-8'))
+                final = {'model': model, 'choices': [{'index': 0, 'delta': {}, 'finish_reason': 'stop'}]}
+                if (payload.get('usage') or {}).get('include'):
+                    final['usage'] = usage
+                self._write_chunk(f'data: {json.dumps(final)}\n\n'.encode('utf-8'))
+                self._write_chunk(b'data: [DONE]\n\n')
+                self.wfile.write(b'0\r\n\r\n')
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+
+    return FakeOpenRouterHandler
+
+
+def start_server(config, host='127.0.0.1', port=8765):
+    """Serve ``config`` from a background thread. Returns the server (call ``shutdown()`` to stop)."""
+    server = ThreadingHTTPServer((host, port), make_handler(config))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name='fake-openrouter', daemon=True).start()
+    return server
+
+
+def add_arguments(parser):
+    parser.add_argument('--latency-dist', choices=('fixed', 'uniform', 'normal', 'lognormal'), default='lognormal',
+                        help='distribution of the time to first byte')
+    parser.add_argument('--latency-mean', type=float, default=1.0, help='mean time to first byte, in seconds')
+    parser.add_argument('--latency-stddev', type=float, default=0.5, help='spread of the time to first byte, in seconds')
+    parser.add_argument('--tokens-per-second', type=float, default=50.0, help='generation speed after the first byte')
+    parser.add_argument('--completion-tokens', type=int, default=200, help='tokens in every completion')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of requests answered with an error')
+    parser.add_argument('--error-statuses', default='503', help='comma-separated statuses to inject, e.g. 429,500,503')
+    parser.add_argument('--hang-rate', type=float, default=0.0, help='fraction of requests that never answer')
+    parser.add_argument('--seed', type=int, default=None, help='random seed for reproducible runs')
+
+
+def config_from_args(args):
+    return FakeOpenRouterConfig(
+        latency_dist=args.latency_dist,
+        latency_mean=args.latency_mean,
+        latency_stddev=args.latency_stddev,
+        tokens_per_second=args.tokens_per_second,
+        completion_tokens=args.completion_tokens,
+        error_rate=args.error_rate,
+        error_statuses=[int(status) for status in args.error_statuses.split(',') if status.strip()],
+        hang_rate=args.hang_rate,
+        seed=args.seed
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Fake OpenRouter chat completions server')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(config_from_args(args)))
+    server.daemon_threads = True
+    print(f'Fake OpenRouter listening on http://{args.host}:{args.port}/api/v1/chat/completions')
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
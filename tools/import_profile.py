@@ -0,0 +1,131 @@
+"""
+Startup diagnostics: where the time goes when a worker imports the backend.
+
+Imports the given modules in a fresh interpreter under ``python -X importtime``
+and reports the total import time, the slowest imports and the time per
+top-level package.
+
+    python tools/import_profile.py                          # what gunicorn loads (run:app)
+    python tools/import_profile.py --module app.server --top 15
+    python tools/import_profile.py --check                  # exit 1 if a heavy module is loaded
+
+Heavy, optional modules (the Gradio demos, ReportLab, PyPDF2) are meant to be
+imported lazily on first use; ``--check`` fails when one of them is pulled in
+at startup, and the report lists which import chain brought it in.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules the API server must not import at startup
+HEAVY_MODULES = ('gradio', 'reportlab', 'PyPDF2', 'pandas', 'matplotlib', 'torch')
+
+
+def profile_imports(modules):
+    """Import ``modules`` in a child interpreter; return ``(entries, total seconds)``.
+
+    Each entry is ``(module, self seconds, cumulative seconds, parents)`` where
+    ``parents`` is the chain of imports that led to it, outermost first.
+    """
+    code = '; '.join(f'import {module}' for module in modules)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f'Importing {", ".join(modules)} failed:\n{result.stderr[-2000:]}')
+
+    # -X importtime prints children before their parent, indented two spaces per level
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        depth = (len(name) - len(name.lstrip(' ')) - 1) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+
+    entries = []
+    stack = []  # (depth, module) of the parents still open, reading bottom-up
+    for name, self_us, cumulative_us, depth in reversed(rows):
+        while stack and stack[-1][0] >= depth:
+            stack.pop()
+        entries.append((name, self_us / 1e6, cumulative_us / 1e6, [module for _, module in stack]))
+        stack.append((depth, name))
+    total = sum(cumulative for _, _, cumulative, parents in entries if not parents)
+    return entries, total
+
+
+def build_report(modules, top=20):
+    entries, total = profile_imports(modules)
+    packages = {}
+    for name, self_seconds, _, _ in entries:
+        package = name.split('.')[0]
+        packages[package] = packages.get(package, 0.0) + self_seconds
+
+    heavy = {}
+    for name, _, cumulative, parents in entries:
+        package = name.split('.')[0]
+        if package in HEAVY_MODULES and package not in heavy:
+            # Report the outermost module of the package and the project module that imported it
+            chain = [parent for parent in parents if parent.split('.')[0] not in HEAVY_MODULES] + [name]
+            heavy[package] = {'seconds': round(cumulative, 4), 'chain': chain}
+        elif package in HEAVY_MODULES and heavy[package]['seconds'] < cumulative:
+            heavy[package]['seconds'] = round(cumulative, 4)
+
+    return {
+        'modules': list(modules),
+        'total_seconds': round(total, 4),
+        'module_count': len(entries),
+        'slowest': [
+            {'module': name, 'cumulative_seconds': round(cumulative, 4), 'self_seconds': round(self_seconds, 4)}
+            for name, self_seconds, cumulative, _ in sorted(entries, key=lambda e: e[2], reverse=True)[:top]
+        ],
+        'packages': [
+            {'package': package, 'self_seconds': round(seconds, 4)}
+            for package, seconds in sorted(packages.items(), key=lambda item: item[1], reverse=True)[:top]
+        ],
+        'heavy_modules': heavy,
+    }
+
+
+def print_report(report):
+    print(f"Importing {', '.join(report['modules'])}: {report['total_seconds'] * 1000:.0f}ms, "
+          f"{report['module_count']} modules")
+    print('\nSlowest imports (cumulative / self):')
+    for entry in report['slowest']:
+        print(f"  {entry['cumulative_seconds'] * 1000:8.1f}ms {entry['self_seconds'] * 1000:8.1f}ms  {entry['module']}")
+    print('\nTime per top-level package (self):')
+    for entry in report['packages']:
+        print(f"  {entry['self_seconds'] * 1000:8.1f}ms  {entry['package']}")
+    if report['heavy_modules']:
+        print('\nHeavy modules imported at startup:')
+        for package, info in sorted(report['heavy_modules'].items()):
+            print(f"  {package} ({info['seconds'] * 1000:.0f}ms) via {' -> '.join(info['chain'])}")
+    else:
+        print('\nNo heavy modules imported at startup.')
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Profile the import time of the backend')
+    parser.add_argument('--module', action='append', dest='modules',
+                        help='module to import (repeatable, default: run)')
+    parser.add_argument('--top', type=int, default=20, help='rows in each table')
+    parser.add_argument('--json', action='store_true', help='print the report as JSON')
+    parser.add_argument('--check', action='store_true', help='exit with status 1 if a heavy module is imported')
+    args = parser.parse_args()
+
+    report = build_report(args.modules or ['run'], top=args.top)
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report)
+    if args.check and report['heavy_modules']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()